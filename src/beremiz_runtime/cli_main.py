@@ -25,12 +25,17 @@ import locale
 import logging
 import os
 import shlex
+import signal
 import sys
 import threading
 
 from beremiz_runtime import __version__
 from beremiz_runtime.beremiz_service import BeremizService
-from beremiz_runtime.runtime import LogMessageAndException, PlcStatus
+from beremiz_runtime.runtime import (
+    GetPLCObjectSingleton,
+    LogMessageAndException,
+    PlcStatus,
+)
 from beremiz_runtime.runtime.monotonic_time import monotonic
 
 try:
@@ -223,6 +228,19 @@ def status_change_call_factory(wanted, args):
     return status_change_call
 
 
+def dump_worker_metrics():
+    try:
+        plcobj = GetPLCObjectSingleton()
+    except AssertionError:
+        return
+    plcobj.DumpWorkerMetrics()
+
+
+def dump_worker_metrics_handler(signum, frame):
+    # main thread may be interrupted while holding metrics lock
+    threading.Thread(target=dump_worker_metrics, daemon=True).start()
+
+
 def main(args):
     """Wrapper allowing :func:`fib` to be called with string arguments in a CLI fashion
 
@@ -264,6 +282,10 @@ def main(args):
 
     srv.init()
 
+    # kill -USR1 dumps MainWorker calls metrics in PLC log
+    if hasattr(signal, "SIGUSR1"):
+        signal.signal(signal.SIGUSR1, dump_worker_metrics_handler)
+
     srv.run()
 
     _logger.info("Beremiz runtime stopped.")
@@ -349,3 +349,716 @@ class BeremizPLCObjectServiceClient(interface.IBeremizPLCObjectService):
         success.value = codec.read_bool()
         _result = codec.read_uint32()
         return _result
+
+
+    def SetTypedTraceVariablesList(self, orders, iectypes, debugtoken):
+        assert (
+            type(debugtoken) is erpc.Reference
+        ), "out parameter must be a Reference object"
+
+        # Build remote function invocation message.
+        request = self._clientManager.create_request()
+        codec = request.codec
+        codec.start_write_message(
+            erpc.codec.MessageInfo(
+                type=erpc.codec.MessageType.kInvocationMessage,
+                service=self.SERVICE_ID,
+                request=self.SETTYPEDTRACEVARIABLESLIST_ID,
+                sequence=request.sequence,
+            )
+        )
+        if orders is None:
+            raise ValueError("orders is None")
+        codec.start_write_list(len(orders))
+        for _i0 in orders:
+            _i0._write(codec)
+
+        if iectypes is None:
+            raise ValueError("iectypes is None")
+        codec.start_write_list(len(iectypes))
+        for _i0 in iectypes:
+            codec.write_string(_i0)
+
+        # Send request and process reply.
+        self._clientManager.perform_request(request)
+        debugtoken.value = codec.read_int32()
+        _result = codec.read_uint32()
+        return _result
+    def StreamTraceVariables(self, debugToken, minSamples, maxDelayMs, traces):
+        assert (
+            type(traces) is erpc.Reference
+        ), "out parameter must be a Reference object"
+
+        # Build remote function invocation message.
+        request = self._clientManager.create_request()
+        codec = request.codec
+        codec.start_write_message(
+            erpc.codec.MessageInfo(
+                type=erpc.codec.MessageType.kInvocationMessage,
+                service=self.SERVICE_ID,
+                request=self.STREAMTRACEVARIABLES_ID,
+                sequence=request.sequence,
+            )
+        )
+        if debugToken is None:
+            raise ValueError("debugToken is None")
+        codec.write_uint32(debugToken)
+        if minSamples is None:
+            raise ValueError("minSamples is None")
+        codec.write_uint32(minSamples)
+        if maxDelayMs is None:
+            raise ValueError("maxDelayMs is None")
+        codec.write_uint32(maxDelayMs)
+
+        # Send request and process reply.
+        self._clientManager.perform_request(request)
+        traces.value = common.TraceVariables()._read(codec)
+        _result = codec.read_uint32()
+        return _result
+
+    def SetTraceDecimation(self, debugToken, iectypes, window, unit, result):
+        assert (
+            type(result) is erpc.Reference
+        ), "out parameter must be a Reference object"
+
+        # Build remote function invocation message.
+        request = self._clientManager.create_request()
+        codec = request.codec
+        codec.start_write_message(
+            erpc.codec.MessageInfo(
+                type=erpc.codec.MessageType.kInvocationMessage,
+                service=self.SERVICE_ID,
+                request=self.SETTRACEDECIMATION_ID,
+                sequence=request.sequence,
+            )
+        )
+        if debugToken is None:
+            raise ValueError("debugToken is None")
+        codec.write_uint32(debugToken)
+        if iectypes is None:
+            raise ValueError("iectypes is None")
+        codec.start_write_list(len(iectypes))
+        for _i0 in iectypes:
+            codec.write_string(_i0)
+
+        if window is None:
+            raise ValueError("window is None")
+        codec.write_uint32(window)
+        if unit is None:
+            raise ValueError("unit is None")
+        codec.write_uint8(unit)
+
+        # Send request and process reply.
+        self._clientManager.perform_request(request)
+        result.value = codec.read_int32()
+        _result = codec.read_uint32()
+        return _result
+
+    def SetTraceRecording(self, enable, result):
+        assert (
+            type(result) is erpc.Reference
+        ), "out parameter must be a Reference object"
+
+        # Build remote function invocation message.
+        request = self._clientManager.create_request()
+        codec = request.codec
+        codec.start_write_message(
+            erpc.codec.MessageInfo(
+                type=erpc.codec.MessageType.kInvocationMessage,
+                service=self.SERVICE_ID,
+                request=self.SETTRACERECORDING_ID,
+                sequence=request.sequence,
+            )
+        )
+        if enable is None:
+            raise ValueError("enable is None")
+        codec.write_bool(enable)
+
+        # Send request and process reply.
+        self._clientManager.perform_request(request)
+        result.value = codec.read_int32()
+        _result = codec.read_uint32()
+        return _result
+
+    def GetRecordedTraces(self, fromTick, toTick, maxSamples, traces):
+        assert (
+            type(traces) is erpc.Reference
+        ), "out parameter must be a Reference object"
+
+        # Build remote function invocation message.
+        request = self._clientManager.create_request()
+        codec = request.codec
+        codec.start_write_message(
+            erpc.codec.MessageInfo(
+                type=erpc.codec.MessageType.kInvocationMessage,
+                service=self.SERVICE_ID,
+                request=self.GETRECORDEDTRACES_ID,
+                sequence=request.sequence,
+            )
+        )
+        if fromTick is None:
+            raise ValueError("fromTick is None")
+        codec.write_uint32(fromTick)
+        if toTick is None:
+            raise ValueError("toTick is None")
+        codec.write_uint32(toTick)
+        if maxSamples is None:
+            raise ValueError("maxSamples is None")
+        codec.write_uint32(maxSamples)
+
+        # Send request and process reply.
+        self._clientManager.perform_request(request)
+        traces.value = common.TraceVariables()._read(codec)
+        _result = codec.read_uint32()
+        return _result
+
+    def OpenTraceSession(self, session):
+        assert (
+            type(session) is erpc.Reference
+        ), "out parameter must be a Reference object"
+
+        # Build remote function invocation message.
+        request = self._clientManager.create_request()
+        codec = request.codec
+        codec.start_write_message(
+            erpc.codec.MessageInfo(
+                type=erpc.codec.MessageType.kInvocationMessage,
+                service=self.SERVICE_ID,
+                request=self.OPENTRACESESSION_ID,
+                sequence=request.sequence,
+            )
+        )
+
+        # Send request and process reply.
+        self._clientManager.perform_request(request)
+        session.value = codec.read_uint32()
+        _result = codec.read_uint32()
+        return _result
+
+    def CloseTraceSession(self, session, result):
+        assert (
+            type(result) is erpc.Reference
+        ), "out parameter must be a Reference object"
+
+        # Build remote function invocation message.
+        request = self._clientManager.create_request()
+        codec = request.codec
+        codec.start_write_message(
+            erpc.codec.MessageInfo(
+                type=erpc.codec.MessageType.kInvocationMessage,
+                service=self.SERVICE_ID,
+                request=self.CLOSETRACESESSION_ID,
+                sequence=request.sequence,
+            )
+        )
+        if session is None:
+            raise ValueError("session is None")
+        codec.write_uint32(session)
+
+        # Send request and process reply.
+        self._clientManager.perform_request(request)
+        result.value = codec.read_int32()
+        _result = codec.read_uint32()
+        return _result
+
+    def SetTraceSessionVariables(self, session, orders, iectypes, token):
+        assert type(token) is erpc.Reference, "out parameter must be a Reference object"
+
+        # Build remote function invocation message.
+        request = self._clientManager.create_request()
+        codec = request.codec
+        codec.start_write_message(
+            erpc.codec.MessageInfo(
+                type=erpc.codec.MessageType.kInvocationMessage,
+                service=self.SERVICE_ID,
+                request=self.SETTRACESESSIONVARIABLES_ID,
+                sequence=request.sequence,
+            )
+        )
+        if session is None:
+            raise ValueError("session is None")
+        codec.write_uint32(session)
+        if orders is None:
+            raise ValueError("orders is None")
+        codec.start_write_list(len(orders))
+        for _i0 in orders:
+            _i0._write(codec)
+
+        if iectypes is None:
+            raise ValueError("iectypes is None")
+        codec.start_write_list(len(iectypes))
+        for _i0 in iectypes:
+            codec.write_string(_i0)
+
+        # Send request and process reply.
+        self._clientManager.perform_request(request)
+        token.value = codec.read_int32()
+        _result = codec.read_uint32()
+        return _result
+
+    def GetTraceSessionVariables(self, session, token, traces):
+        assert (
+            type(traces) is erpc.Reference
+        ), "out parameter must be a Reference object"
+
+        # Build remote function invocation message.
+        request = self._clientManager.create_request()
+        codec = request.codec
+        codec.start_write_message(
+            erpc.codec.MessageInfo(
+                type=erpc.codec.MessageType.kInvocationMessage,
+                service=self.SERVICE_ID,
+                request=self.GETTRACESESSIONVARIABLES_ID,
+                sequence=request.sequence,
+            )
+        )
+        if session is None:
+            raise ValueError("session is None")
+        codec.write_uint32(session)
+        if token is None:
+            raise ValueError("token is None")
+        codec.write_uint32(token)
+
+        # Send request and process reply.
+        self._clientManager.perform_request(request)
+        traces.value = common.TraceVariables()._read(codec)
+        _result = codec.read_uint32()
+        return _result
+
+    def UpdateTraceVariablesList(self, debugToken, adds, removes, iectypes, update):
+        assert (
+            type(update) is erpc.Reference
+        ), "out parameter must be a Reference object"
+
+        # Build remote function invocation message.
+        request = self._clientManager.create_request()
+        codec = request.codec
+        codec.start_write_message(
+            erpc.codec.MessageInfo(
+                type=erpc.codec.MessageType.kInvocationMessage,
+                service=self.SERVICE_ID,
+                request=self.UPDATETRACEVARIABLESLIST_ID,
+                sequence=request.sequence,
+            )
+        )
+        if debugToken is None:
+            raise ValueError("debugToken is None")
+        codec.write_uint32(debugToken)
+        if adds is None:
+            raise ValueError("adds is None")
+        codec.start_write_list(len(adds))
+        for _i0 in adds:
+            _i0._write(codec)
+
+        if removes is None:
+            raise ValueError("removes is None")
+        codec.start_write_list(len(removes))
+        for _i0 in removes:
+            codec.write_uint32(_i0)
+
+        if iectypes is None:
+            raise ValueError("iectypes is None")
+        codec.start_write_list(len(iectypes))
+        for _i0 in iectypes:
+            codec.write_string(_i0)
+
+        # Send request and process reply.
+        self._clientManager.perform_request(request)
+        update.value = common.trace_update()._read(codec)
+        _result = codec.read_uint32()
+        return _result
+
+    def GetTraceClock(self, clock):
+        assert type(clock) is erpc.Reference, "out parameter must be a Reference object"
+
+        # Build remote function invocation message.
+        request = self._clientManager.create_request()
+        codec = request.codec
+        codec.start_write_message(
+            erpc.codec.MessageInfo(
+                type=erpc.codec.MessageType.kInvocationMessage,
+                service=self.SERVICE_ID,
+                request=self.GETTRACECLOCK_ID,
+                sequence=request.sequence,
+            )
+        )
+
+        # Send request and process reply.
+        self._clientManager.perform_request(request)
+        clock.value = common.trace_clock()._read(codec)
+        _result = codec.read_uint32()
+        return _result
+
+    def GetTimedTraceVariables(self, debugToken, traces):
+        assert (
+            type(traces) is erpc.Reference
+        ), "out parameter must be a Reference object"
+
+        # Build remote function invocation message.
+        request = self._clientManager.create_request()
+        codec = request.codec
+        codec.start_write_message(
+            erpc.codec.MessageInfo(
+                type=erpc.codec.MessageType.kInvocationMessage,
+                service=self.SERVICE_ID,
+                request=self.GETTIMEDTRACEVARIABLES_ID,
+                sequence=request.sequence,
+            )
+        )
+        if debugToken is None:
+            raise ValueError("debugToken is None")
+        codec.write_uint32(debugToken)
+
+        # Send request and process reply.
+        self._clientManager.perform_request(request)
+        traces.value = common.TimedTraceVariables()._read(codec)
+        _result = codec.read_uint32()
+        return _result
+
+    def ForceVariables(self, debugToken, forces, debugtoken):
+        assert (
+            type(debugtoken) is erpc.Reference
+        ), "out parameter must be a Reference object"
+
+        # Build remote function invocation message.
+        request = self._clientManager.create_request()
+        codec = request.codec
+        codec.start_write_message(
+            erpc.codec.MessageInfo(
+                type=erpc.codec.MessageType.kInvocationMessage,
+                service=self.SERVICE_ID,
+                request=self.FORCEVARIABLES_ID,
+                sequence=request.sequence,
+            )
+        )
+        if debugToken is None:
+            raise ValueError("debugToken is None")
+        codec.write_uint32(debugToken)
+        if forces is None:
+            raise ValueError("forces is None")
+        codec.start_write_list(len(forces))
+        for _i0 in forces:
+            _i0._write(codec)
+
+        # Send request and process reply.
+        self._clientManager.perform_request(request)
+        debugtoken.value = codec.read_int32()
+        _result = codec.read_uint32()
+        return _result
+
+    def GetWorkerMetrics(self, metrics):
+        assert (
+            type(metrics) is erpc.Reference
+        ), "out parameter must be a Reference object"
+
+        # Build remote function invocation message.
+        request = self._clientManager.create_request()
+        codec = request.codec
+        codec.start_write_message(
+            erpc.codec.MessageInfo(
+                type=erpc.codec.MessageType.kInvocationMessage,
+                service=self.SERVICE_ID,
+                request=self.GETWORKERMETRICS_ID,
+                sequence=request.sequence,
+            )
+        )
+
+        # Send request and process reply.
+        self._clientManager.perform_request(request)
+        metrics.value = codec.read_string()
+        _result = codec.read_uint32()
+        return _result
+
+    def HaveBlobs(self, digests, missing):
+        assert (
+            type(missing) is erpc.Reference
+        ), "out parameter must be a Reference object"
+
+        # Build remote function invocation message.
+        request = self._clientManager.create_request()
+        codec = request.codec
+        codec.start_write_message(
+            erpc.codec.MessageInfo(
+                type=erpc.codec.MessageType.kInvocationMessage,
+                service=self.SERVICE_ID,
+                request=self.HAVEBLOBS_ID,
+                sequence=request.sequence,
+            )
+        )
+        if digests is None:
+            raise ValueError("digests is None")
+        codec.start_write_list(len(digests))
+        for _i0 in digests:
+            codec.write_binary(_i0)
+
+        # Send request and process reply.
+        self._clientManager.perform_request(request)
+        _n0 = codec.start_read_list()
+        missing.value = []
+        for _i0 in range(_n0):
+            _v0 = codec.read_binary()
+            missing.value.append(_v0)
+
+        _result = codec.read_uint32()
+        return _result
+
+    def OpenBlobUpload(self, digest, size, missing):
+        assert (
+            type(missing) is erpc.Reference
+        ), "out parameter must be a Reference object"
+
+        # Build remote function invocation message.
+        request = self._clientManager.create_request()
+        codec = request.codec
+        codec.start_write_message(
+            erpc.codec.MessageInfo(
+                type=erpc.codec.MessageType.kInvocationMessage,
+                service=self.SERVICE_ID,
+                request=self.OPENBLOBUPLOAD_ID,
+                sequence=request.sequence,
+            )
+        )
+        if digest is None:
+            raise ValueError("digest is None")
+        codec.write_binary(digest)
+        if size is None:
+            raise ValueError("size is None")
+        codec.write_uint64(size)
+
+        # Send request and process reply.
+        self._clientManager.perform_request(request)
+        _n0 = codec.start_read_list()
+        missing.value = []
+        for _i0 in range(_n0):
+            _v0 = common.blob_range()._read(codec)
+            missing.value.append(_v0)
+
+        _result = codec.read_uint32()
+        return _result
+
+    def WriteBlobChunk(self, digest, offset, data, status):
+        assert (
+            type(status) is erpc.Reference
+        ), "out parameter must be a Reference object"
+
+        # Build remote function invocation message.
+        request = self._clientManager.create_request()
+        codec = request.codec
+        codec.start_write_message(
+            erpc.codec.MessageInfo(
+                type=erpc.codec.MessageType.kInvocationMessage,
+                service=self.SERVICE_ID,
+                request=self.WRITEBLOBCHUNK_ID,
+                sequence=request.sequence,
+            )
+        )
+        if digest is None:
+            raise ValueError("digest is None")
+        codec.write_binary(digest)
+        if offset is None:
+            raise ValueError("offset is None")
+        codec.write_uint64(offset)
+        if data is None:
+            raise ValueError("data is None")
+        codec.write_binary(data)
+
+        # Send request and process reply.
+        self._clientManager.perform_request(request)
+        status.value = codec.read_int32()
+        _result = codec.read_uint32()
+        return _result
+
+    def FinishBlobUpload(self, digest, success):
+        assert (
+            type(success) is erpc.Reference
+        ), "out parameter must be a Reference object"
+
+        # Build remote function invocation message.
+        request = self._clientManager.create_request()
+        codec = request.codec
+        codec.start_write_message(
+            erpc.codec.MessageInfo(
+                type=erpc.codec.MessageType.kInvocationMessage,
+                service=self.SERVICE_ID,
+                request=self.FINISHBLOBUPLOAD_ID,
+                sequence=request.sequence,
+            )
+        )
+        if digest is None:
+            raise ValueError("digest is None")
+        codec.write_binary(digest)
+
+        # Send request and process reply.
+        self._clientManager.perform_request(request)
+        success.value = codec.read_bool()
+        _result = codec.read_uint32()
+        return _result
+
+    def CancelBlobUpload(self, digest):
+        # Build remote function invocation message.
+        request = self._clientManager.create_request()
+        codec = request.codec
+        codec.start_write_message(
+            erpc.codec.MessageInfo(
+                type=erpc.codec.MessageType.kInvocationMessage,
+                service=self.SERVICE_ID,
+                request=self.CANCELBLOBUPLOAD_ID,
+                sequence=request.sequence,
+            )
+        )
+        if digest is None:
+            raise ValueError("digest is None")
+        codec.write_binary(digest)
+
+        # Send request and process reply.
+        self._clientManager.perform_request(request)
+        _result = codec.read_uint32()
+        return _result
+
+    def SeedCompressedBlob(self, seed, compression, blobID):
+        assert (
+            type(blobID) is erpc.Reference
+        ), "out parameter must be a Reference object"
+
+        # Build remote function invocation message.
+        request = self._clientManager.create_request()
+        codec = request.codec
+        codec.start_write_message(
+            erpc.codec.MessageInfo(
+                type=erpc.codec.MessageType.kInvocationMessage,
+                service=self.SERVICE_ID,
+                request=self.SEEDCOMPRESSEDBLOB_ID,
+                sequence=request.sequence,
+            )
+        )
+        if seed is None:
+            raise ValueError("seed is None")
+        codec.write_binary(seed)
+        if compression is None:
+            raise ValueError("compression is None")
+        codec.write_string(compression)
+
+        # Send request and process reply.
+        self._clientManager.perform_request(request)
+        blobID.value = codec.read_binary()
+        _result = codec.read_uint32()
+        return _result
+
+    def SeedDeltaBlob(self, seed, baseMD5, compression, digest, blobID):
+        assert (
+            type(blobID) is erpc.Reference
+        ), "out parameter must be a Reference object"
+
+        # Build remote function invocation message.
+        request = self._clientManager.create_request()
+        codec = request.codec
+        codec.start_write_message(
+            erpc.codec.MessageInfo(
+                type=erpc.codec.MessageType.kInvocationMessage,
+                service=self.SERVICE_ID,
+                request=self.SEEDDELTABLOB_ID,
+                sequence=request.sequence,
+            )
+        )
+        if seed is None:
+            raise ValueError("seed is None")
+        codec.write_binary(seed)
+        if baseMD5 is None:
+            raise ValueError("baseMD5 is None")
+        codec.write_string(baseMD5)
+        if compression is None:
+            raise ValueError("compression is None")
+        codec.write_string(compression)
+        if digest is None:
+            raise ValueError("digest is None")
+        codec.write_binary(digest)
+
+        # Send request and process reply.
+        self._clientManager.perform_request(request)
+        blobID.value = codec.read_binary()
+        _result = codec.read_uint32()
+        return _result
+
+    def GetInstallReport(self, report):
+        assert (
+            type(report) is erpc.Reference
+        ), "out parameter must be a Reference object"
+
+        # Build remote function invocation message.
+        request = self._clientManager.create_request()
+        codec = request.codec
+        codec.start_write_message(
+            erpc.codec.MessageInfo(
+                type=erpc.codec.MessageType.kInvocationMessage,
+                service=self.SERVICE_ID,
+                request=self.GETINSTALLREPORT_ID,
+                sequence=request.sequence,
+            )
+        )
+
+        # Send request and process reply.
+        self._clientManager.perform_request(request)
+        report.value = codec.read_string()
+        _result = codec.read_uint32()
+        return _result
+
+    def QueryMD5(self, MD5, state):
+        assert type(state) is erpc.Reference, "out parameter must be a Reference object"
+
+        # Build remote function invocation message.
+        request = self._clientManager.create_request()
+        codec = request.codec
+        codec.start_write_message(
+            erpc.codec.MessageInfo(
+                type=erpc.codec.MessageType.kInvocationMessage,
+                service=self.SERVICE_ID,
+                request=self.QUERYMD5_ID,
+                sequence=request.sequence,
+            )
+        )
+        if MD5 is None:
+            raise ValueError("MD5 is None")
+        codec.write_string(MD5)
+
+        # Send request and process reply.
+        self._clientManager.perform_request(request)
+        state.value = codec.read_int32()
+        _result = codec.read_uint32()
+        return _result
+
+    def GetLogMessages(self, level, fromID, maxCount, messages):
+        assert (
+            type(messages) is erpc.Reference
+        ), "out parameter must be a Reference object"
+
+        # Build remote function invocation message.
+        request = self._clientManager.create_request()
+        codec = request.codec
+        codec.start_write_message(
+            erpc.codec.MessageInfo(
+                type=erpc.codec.MessageType.kInvocationMessage,
+                service=self.SERVICE_ID,
+                request=self.GETLOGMESSAGES_ID,
+                sequence=request.sequence,
+            )
+        )
+        if level is None:
+            raise ValueError("level is None")
+        codec.write_uint8(level)
+        if fromID is None:
+            raise ValueError("fromID is None")
+        codec.write_uint32(fromID)
+        if maxCount is None:
+            raise ValueError("maxCount is None")
+        codec.write_uint32(maxCount)
+
+        # Send request and process reply.
+        self._clientManager.perform_request(request)
+        _n0 = codec.start_read_list()
+        messages.value = []
+        for _i0 in range(_n0):
+            _v0 = common.log_message()._read(codec)
+            messages.value.append(_v0)
+
+        _result = codec.read_uint32()
+        return _result
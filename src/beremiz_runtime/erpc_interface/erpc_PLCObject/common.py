@@ -247,3 +247,155 @@ class trace_order(object):
 
     def __repr__(self):
         return self.__str__()
+
+
+class trace_update(object):
+    def __init__(self, debugtoken=None, positions=None):
+        self.debugtoken = debugtoken  # int32
+        self.positions = positions  # list<int32>
+
+    def _read(self, codec):
+        self.debugtoken = codec.read_int32()
+        _n0 = codec.start_read_list()
+        self.positions = []
+        for _i0 in range(_n0):
+            _v0 = codec.read_int32()
+            self.positions.append(_v0)
+
+        return self
+
+    def _write(self, codec):
+        if self.debugtoken is None:
+            raise ValueError("debugtoken is None")
+        codec.write_int32(self.debugtoken)
+        if self.positions is None:
+            raise ValueError("positions is None")
+        codec.start_write_list(len(self.positions))
+        for _i0 in self.positions:
+            codec.write_int32(_i0)
+
+    def __str__(self):
+        return "<%s@%x debugtoken=%s positions=%s>" % (
+            self.__class__.__name__,
+            id(self),
+            self.debugtoken,
+            self.positions,
+        )
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class trace_clock(object):
+    def __init__(self, tick=None, monotonic=None, realtime=None, period=None):
+        self.tick = tick  # uint32
+        self.monotonic = monotonic  # double
+        self.realtime = realtime  # double
+        self.period = period  # double
+
+    def _read(self, codec):
+        self.tick = codec.read_uint32()
+        self.monotonic = codec.read_double()
+        self.realtime = codec.read_double()
+        self.period = codec.read_double()
+        return self
+
+    def _write(self, codec):
+        if self.tick is None:
+            raise ValueError("tick is None")
+        codec.write_uint32(self.tick)
+        if self.monotonic is None:
+            raise ValueError("monotonic is None")
+        codec.write_double(self.monotonic)
+        if self.realtime is None:
+            raise ValueError("realtime is None")
+        codec.write_double(self.realtime)
+        if self.period is None:
+            raise ValueError("period is None")
+        codec.write_double(self.period)
+
+    def __str__(self):
+        return "<%s@%x tick=%s monotonic=%s realtime=%s period=%s>" % (
+            self.__class__.__name__,
+            id(self),
+            self.tick,
+            self.monotonic,
+            self.realtime,
+            self.period,
+        )
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class TimedTraceVariables(object):
+    def __init__(self, PLCstatus=None, clock=None, traces=None):
+        self.PLCstatus = PLCstatus  # PLCstatus_enum
+        self.clock = clock  # trace_clock
+        self.traces = traces  # list<trace_sample>
+
+    def _read(self, codec):
+        self.PLCstatus = codec.read_int32()
+        self.clock = trace_clock()._read(codec)
+        _n0 = codec.start_read_list()
+        self.traces = []
+        for _i0 in range(_n0):
+            _v0 = trace_sample()._read(codec)
+            self.traces.append(_v0)
+
+        return self
+
+    def _write(self, codec):
+        if self.PLCstatus is None:
+            raise ValueError("PLCstatus is None")
+        codec.write_int32(self.PLCstatus)
+        if self.clock is None:
+            raise ValueError("clock is None")
+        self.clock._write(codec)
+        if self.traces is None:
+            raise ValueError("traces is None")
+        codec.start_write_list(len(self.traces))
+        for _i0 in self.traces:
+            _i0._write(codec)
+
+    def __str__(self):
+        return "<%s@%x PLCstatus=%s clock=%s traces=%s>" % (
+            self.__class__.__name__,
+            id(self),
+            self.PLCstatus,
+            self.clock,
+            self.traces,
+        )
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class blob_range(object):
+    def __init__(self, offset=None, size=None):
+        self.offset = offset  # uint64
+        self.size = size  # uint64
+
+    def _read(self, codec):
+        self.offset = codec.read_uint64()
+        self.size = codec.read_uint64()
+        return self
+
+    def _write(self, codec):
+        if self.offset is None:
+            raise ValueError("offset is None")
+        codec.write_uint64(self.offset)
+        if self.size is None:
+            raise ValueError("size is None")
+        codec.write_uint64(self.size)
+
+    def __str__(self):
+        return "<%s@%x offset=%s size=%s>" % (
+            self.__class__.__name__,
+            id(self),
+            self.offset,
+            self.size,
+        )
+
+    def __repr__(self):
+        return self.__str__()
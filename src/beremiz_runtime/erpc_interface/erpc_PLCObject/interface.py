@@ -22,6 +22,30 @@ class IBeremizPLCObjectService(object):
     SETTRACEVARIABLESLIST_ID = 12
     STARTPLC_ID = 13
     STOPPLC_ID = 14
+    SETTYPEDTRACEVARIABLESLIST_ID = 15
+    STREAMTRACEVARIABLES_ID = 16
+    SETTRACEDECIMATION_ID = 17
+    SETTRACERECORDING_ID = 18
+    GETRECORDEDTRACES_ID = 19
+    OPENTRACESESSION_ID = 20
+    CLOSETRACESESSION_ID = 21
+    SETTRACESESSIONVARIABLES_ID = 22
+    GETTRACESESSIONVARIABLES_ID = 23
+    UPDATETRACEVARIABLESLIST_ID = 24
+    GETTRACECLOCK_ID = 25
+    GETTIMEDTRACEVARIABLES_ID = 26
+    FORCEVARIABLES_ID = 27
+    GETWORKERMETRICS_ID = 28
+    HAVEBLOBS_ID = 29
+    OPENBLOBUPLOAD_ID = 30
+    WRITEBLOBCHUNK_ID = 31
+    FINISHBLOBUPLOAD_ID = 32
+    CANCELBLOBUPLOAD_ID = 33
+    SEEDCOMPRESSEDBLOB_ID = 34
+    SEEDDELTABLOB_ID = 35
+    GETINSTALLREPORT_ID = 36
+    QUERYMD5_ID = 37
+    GETLOGMESSAGES_ID = 38
 
     def AppendChunkToBlob(self, data, blobID, newBlobID):
         raise NotImplementedError()
@@ -64,3 +88,75 @@ class IBeremizPLCObjectService(object):
 
     def StopPLC(self, success):
         raise NotImplementedError()
+
+
+    def SetTypedTraceVariablesList(self, orders, iectypes, debugtoken):
+        raise NotImplementedError()
+    def StreamTraceVariables(self, debugToken, minSamples, maxDelayMs, traces):
+        raise NotImplementedError()
+
+    def SetTraceDecimation(self, debugToken, iectypes, window, unit, result):
+        raise NotImplementedError()
+
+    def SetTraceRecording(self, enable, result):
+        raise NotImplementedError()
+
+    def GetRecordedTraces(self, fromTick, toTick, maxSamples, traces):
+        raise NotImplementedError()
+
+    def OpenTraceSession(self, session):
+        raise NotImplementedError()
+
+    def CloseTraceSession(self, session, result):
+        raise NotImplementedError()
+
+    def SetTraceSessionVariables(self, session, orders, iectypes, token):
+        raise NotImplementedError()
+
+    def GetTraceSessionVariables(self, session, token, traces):
+        raise NotImplementedError()
+
+    def UpdateTraceVariablesList(self, debugToken, adds, removes, iectypes, update):
+        raise NotImplementedError()
+
+    def GetTraceClock(self, clock):
+        raise NotImplementedError()
+
+    def GetTimedTraceVariables(self, debugToken, traces):
+        raise NotImplementedError()
+
+    def ForceVariables(self, debugToken, forces, debugtoken):
+        raise NotImplementedError()
+
+    def GetWorkerMetrics(self, metrics):
+        raise NotImplementedError()
+
+    def HaveBlobs(self, digests, missing):
+        raise NotImplementedError()
+
+    def OpenBlobUpload(self, digest, size, missing):
+        raise NotImplementedError()
+
+    def WriteBlobChunk(self, digest, offset, data, status):
+        raise NotImplementedError()
+
+    def FinishBlobUpload(self, digest, success):
+        raise NotImplementedError()
+
+    def CancelBlobUpload(self, digest):
+        raise NotImplementedError()
+
+    def SeedCompressedBlob(self, seed, compression, blobID):
+        raise NotImplementedError()
+
+    def SeedDeltaBlob(self, seed, baseMD5, compression, digest, blobID):
+        raise NotImplementedError()
+
+    def GetInstallReport(self, report):
+        raise NotImplementedError()
+
+    def QueryMD5(self, MD5, state):
+        raise NotImplementedError()
+
+    def GetLogMessages(self, level, fromID, maxCount, messages):
+        raise NotImplementedError()
@@ -31,6 +31,30 @@ class BeremizPLCObjectServiceService(erpc.server.Service):
             interface.IBeremizPLCObjectService.SETTRACEVARIABLESLIST_ID: self._handle_SetTraceVariablesList,
             interface.IBeremizPLCObjectService.STARTPLC_ID: self._handle_StartPLC,
             interface.IBeremizPLCObjectService.STOPPLC_ID: self._handle_StopPLC,
+            interface.IBeremizPLCObjectService.SETTYPEDTRACEVARIABLESLIST_ID: self._handle_SetTypedTraceVariablesList,
+            interface.IBeremizPLCObjectService.STREAMTRACEVARIABLES_ID: self._handle_StreamTraceVariables,
+            interface.IBeremizPLCObjectService.SETTRACEDECIMATION_ID: self._handle_SetTraceDecimation,
+            interface.IBeremizPLCObjectService.SETTRACERECORDING_ID: self._handle_SetTraceRecording,
+            interface.IBeremizPLCObjectService.GETRECORDEDTRACES_ID: self._handle_GetRecordedTraces,
+            interface.IBeremizPLCObjectService.OPENTRACESESSION_ID: self._handle_OpenTraceSession,
+            interface.IBeremizPLCObjectService.CLOSETRACESESSION_ID: self._handle_CloseTraceSession,
+            interface.IBeremizPLCObjectService.SETTRACESESSIONVARIABLES_ID: self._handle_SetTraceSessionVariables,
+            interface.IBeremizPLCObjectService.GETTRACESESSIONVARIABLES_ID: self._handle_GetTraceSessionVariables,
+            interface.IBeremizPLCObjectService.UPDATETRACEVARIABLESLIST_ID: self._handle_UpdateTraceVariablesList,
+            interface.IBeremizPLCObjectService.GETTRACECLOCK_ID: self._handle_GetTraceClock,
+            interface.IBeremizPLCObjectService.GETTIMEDTRACEVARIABLES_ID: self._handle_GetTimedTraceVariables,
+            interface.IBeremizPLCObjectService.FORCEVARIABLES_ID: self._handle_ForceVariables,
+            interface.IBeremizPLCObjectService.GETWORKERMETRICS_ID: self._handle_GetWorkerMetrics,
+            interface.IBeremizPLCObjectService.HAVEBLOBS_ID: self._handle_HaveBlobs,
+            interface.IBeremizPLCObjectService.OPENBLOBUPLOAD_ID: self._handle_OpenBlobUpload,
+            interface.IBeremizPLCObjectService.WRITEBLOBCHUNK_ID: self._handle_WriteBlobChunk,
+            interface.IBeremizPLCObjectService.FINISHBLOBUPLOAD_ID: self._handle_FinishBlobUpload,
+            interface.IBeremizPLCObjectService.CANCELBLOBUPLOAD_ID: self._handle_CancelBlobUpload,
+            interface.IBeremizPLCObjectService.SEEDCOMPRESSEDBLOB_ID: self._handle_SeedCompressedBlob,
+            interface.IBeremizPLCObjectService.SEEDDELTABLOB_ID: self._handle_SeedDeltaBlob,
+            interface.IBeremizPLCObjectService.GETINSTALLREPORT_ID: self._handle_GetInstallReport,
+            interface.IBeremizPLCObjectService.QUERYMD5_ID: self._handle_QueryMD5,
+            interface.IBeremizPLCObjectService.GETLOGMESSAGES_ID: self._handle_GetLogMessages,
         }
 
     def _handle_AppendChunkToBlob(self, sequence, codec):
@@ -391,3 +415,729 @@ class BeremizPLCObjectServiceService(erpc.server.Service):
             raise ValueError("success.value is None")
         codec.write_bool(success.value)
         codec.write_uint32(_result)
+
+
+    def _handle_SetTypedTraceVariablesList(self, sequence, codec):
+        # Create reference objects to pass into handler for out/inout parameters.
+        debugtoken = erpc.Reference()
+
+        # Read incoming parameters.
+        _n0 = codec.start_read_list()
+        orders = []
+        for _i0 in range(_n0):
+            _v0 = common.trace_order()._read(codec)
+            orders.append(_v0)
+
+        _n0 = codec.start_read_list()
+        iectypes = []
+        for _i0 in range(_n0):
+            _v0 = codec.read_string()
+            iectypes.append(_v0)
+
+        # Invoke user implementation of remote function.
+        _result = self._handler.SetTypedTraceVariablesList(orders, iectypes, debugtoken)
+
+        # Prepare codec for reply message.
+        codec.reset()
+
+        # Construct reply message.
+        codec.start_write_message(
+            erpc.codec.MessageInfo(
+                type=erpc.codec.MessageType.kReplyMessage,
+                service=interface.IBeremizPLCObjectService.SERVICE_ID,
+                request=interface.IBeremizPLCObjectService.SETTYPEDTRACEVARIABLESLIST_ID,
+                sequence=sequence,
+            )
+        )
+        if debugtoken.value is None:
+            raise ValueError("debugtoken.value is None")
+        codec.write_int32(debugtoken.value)
+        codec.write_uint32(_result)
+    def _handle_StreamTraceVariables(self, sequence, codec):
+        # Create reference objects to pass into handler for out/inout parameters.
+        traces = erpc.Reference()
+
+        # Read incoming parameters.
+        debugToken = codec.read_uint32()
+        minSamples = codec.read_uint32()
+        maxDelayMs = codec.read_uint32()
+
+        # Invoke user implementation of remote function.
+        _result = self._handler.StreamTraceVariables(
+            debugToken, minSamples, maxDelayMs, traces
+        )
+
+        # Prepare codec for reply message.
+        codec.reset()
+
+        # Construct reply message.
+        codec.start_write_message(
+            erpc.codec.MessageInfo(
+                type=erpc.codec.MessageType.kReplyMessage,
+                service=interface.IBeremizPLCObjectService.SERVICE_ID,
+                request=interface.IBeremizPLCObjectService.STREAMTRACEVARIABLES_ID,
+                sequence=sequence,
+            )
+        )
+        if traces.value is None:
+            raise ValueError("traces.value is None")
+        traces.value._write(codec)
+        codec.write_uint32(_result)
+
+    def _handle_SetTraceDecimation(self, sequence, codec):
+        # Create reference objects to pass into handler for out/inout parameters.
+        result = erpc.Reference()
+
+        # Read incoming parameters.
+        debugToken = codec.read_uint32()
+        _n0 = codec.start_read_list()
+        iectypes = []
+        for _i0 in range(_n0):
+            _v0 = codec.read_string()
+            iectypes.append(_v0)
+
+        window = codec.read_uint32()
+        unit = codec.read_uint8()
+
+        # Invoke user implementation of remote function.
+        _result = self._handler.SetTraceDecimation(
+            debugToken, iectypes, window, unit, result
+        )
+
+        # Prepare codec for reply message.
+        codec.reset()
+
+        # Construct reply message.
+        codec.start_write_message(
+            erpc.codec.MessageInfo(
+                type=erpc.codec.MessageType.kReplyMessage,
+                service=interface.IBeremizPLCObjectService.SERVICE_ID,
+                request=interface.IBeremizPLCObjectService.SETTRACEDECIMATION_ID,
+                sequence=sequence,
+            )
+        )
+        if result.value is None:
+            raise ValueError("result.value is None")
+        codec.write_int32(result.value)
+        codec.write_uint32(_result)
+
+    def _handle_SetTraceRecording(self, sequence, codec):
+        # Create reference objects to pass into handler for out/inout parameters.
+        result = erpc.Reference()
+
+        # Read incoming parameters.
+        enable = codec.read_bool()
+
+        # Invoke user implementation of remote function.
+        _result = self._handler.SetTraceRecording(enable, result)
+
+        # Prepare codec for reply message.
+        codec.reset()
+
+        # Construct reply message.
+        codec.start_write_message(
+            erpc.codec.MessageInfo(
+                type=erpc.codec.MessageType.kReplyMessage,
+                service=interface.IBeremizPLCObjectService.SERVICE_ID,
+                request=interface.IBeremizPLCObjectService.SETTRACERECORDING_ID,
+                sequence=sequence,
+            )
+        )
+        if result.value is None:
+            raise ValueError("result.value is None")
+        codec.write_int32(result.value)
+        codec.write_uint32(_result)
+
+    def _handle_GetRecordedTraces(self, sequence, codec):
+        # Create reference objects to pass into handler for out/inout parameters.
+        traces = erpc.Reference()
+
+        # Read incoming parameters.
+        fromTick = codec.read_uint32()
+        toTick = codec.read_uint32()
+        maxSamples = codec.read_uint32()
+
+        # Invoke user implementation of remote function.
+        _result = self._handler.GetRecordedTraces(fromTick, toTick, maxSamples, traces)
+
+        # Prepare codec for reply message.
+        codec.reset()
+
+        # Construct reply message.
+        codec.start_write_message(
+            erpc.codec.MessageInfo(
+                type=erpc.codec.MessageType.kReplyMessage,
+                service=interface.IBeremizPLCObjectService.SERVICE_ID,
+                request=interface.IBeremizPLCObjectService.GETRECORDEDTRACES_ID,
+                sequence=sequence,
+            )
+        )
+        if traces.value is None:
+            raise ValueError("traces.value is None")
+        traces.value._write(codec)
+        codec.write_uint32(_result)
+
+    def _handle_OpenTraceSession(self, sequence, codec):
+        # Create reference objects to pass into handler for out/inout parameters.
+        session = erpc.Reference()
+
+        # Read incoming parameters.
+
+        # Invoke user implementation of remote function.
+        _result = self._handler.OpenTraceSession(session)
+
+        # Prepare codec for reply message.
+        codec.reset()
+
+        # Construct reply message.
+        codec.start_write_message(
+            erpc.codec.MessageInfo(
+                type=erpc.codec.MessageType.kReplyMessage,
+                service=interface.IBeremizPLCObjectService.SERVICE_ID,
+                request=interface.IBeremizPLCObjectService.OPENTRACESESSION_ID,
+                sequence=sequence,
+            )
+        )
+        if session.value is None:
+            raise ValueError("session.value is None")
+        codec.write_uint32(session.value)
+        codec.write_uint32(_result)
+
+    def _handle_CloseTraceSession(self, sequence, codec):
+        # Create reference objects to pass into handler for out/inout parameters.
+        result = erpc.Reference()
+
+        # Read incoming parameters.
+        session = codec.read_uint32()
+
+        # Invoke user implementation of remote function.
+        _result = self._handler.CloseTraceSession(session, result)
+
+        # Prepare codec for reply message.
+        codec.reset()
+
+        # Construct reply message.
+        codec.start_write_message(
+            erpc.codec.MessageInfo(
+                type=erpc.codec.MessageType.kReplyMessage,
+                service=interface.IBeremizPLCObjectService.SERVICE_ID,
+                request=interface.IBeremizPLCObjectService.CLOSETRACESESSION_ID,
+                sequence=sequence,
+            )
+        )
+        if result.value is None:
+            raise ValueError("result.value is None")
+        codec.write_int32(result.value)
+        codec.write_uint32(_result)
+
+    def _handle_SetTraceSessionVariables(self, sequence, codec):
+        # Create reference objects to pass into handler for out/inout parameters.
+        token = erpc.Reference()
+
+        # Read incoming parameters.
+        session = codec.read_uint32()
+        _n0 = codec.start_read_list()
+        orders = []
+        for _i0 in range(_n0):
+            _v0 = common.trace_order()._read(codec)
+            orders.append(_v0)
+
+        _n0 = codec.start_read_list()
+        iectypes = []
+        for _i0 in range(_n0):
+            _v0 = codec.read_string()
+            iectypes.append(_v0)
+
+        # Invoke user implementation of remote function.
+        _result = self._handler.SetTraceSessionVariables(
+            session, orders, iectypes, token
+        )
+
+        # Prepare codec for reply message.
+        codec.reset()
+
+        # Construct reply message.
+        codec.start_write_message(
+            erpc.codec.MessageInfo(
+                type=erpc.codec.MessageType.kReplyMessage,
+                service=interface.IBeremizPLCObjectService.SERVICE_ID,
+                request=interface.IBeremizPLCObjectService.SETTRACESESSIONVARIABLES_ID,
+                sequence=sequence,
+            )
+        )
+        if token.value is None:
+            raise ValueError("token.value is None")
+        codec.write_int32(token.value)
+        codec.write_uint32(_result)
+
+    def _handle_GetTraceSessionVariables(self, sequence, codec):
+        # Create reference objects to pass into handler for out/inout parameters.
+        traces = erpc.Reference()
+
+        # Read incoming parameters.
+        session = codec.read_uint32()
+        token = codec.read_uint32()
+
+        # Invoke user implementation of remote function.
+        _result = self._handler.GetTraceSessionVariables(session, token, traces)
+
+        # Prepare codec for reply message.
+        codec.reset()
+
+        # Construct reply message.
+        codec.start_write_message(
+            erpc.codec.MessageInfo(
+                type=erpc.codec.MessageType.kReplyMessage,
+                service=interface.IBeremizPLCObjectService.SERVICE_ID,
+                request=interface.IBeremizPLCObjectService.GETTRACESESSIONVARIABLES_ID,
+                sequence=sequence,
+            )
+        )
+        if traces.value is None:
+            raise ValueError("traces.value is None")
+        traces.value._write(codec)
+        codec.write_uint32(_result)
+
+    def _handle_UpdateTraceVariablesList(self, sequence, codec):
+        # Create reference objects to pass into handler for out/inout parameters.
+        update = erpc.Reference()
+
+        # Read incoming parameters.
+        debugToken = codec.read_uint32()
+        _n0 = codec.start_read_list()
+        adds = []
+        for _i0 in range(_n0):
+            _v0 = common.trace_order()._read(codec)
+            adds.append(_v0)
+
+        _n0 = codec.start_read_list()
+        removes = []
+        for _i0 in range(_n0):
+            _v0 = codec.read_uint32()
+            removes.append(_v0)
+
+        _n0 = codec.start_read_list()
+        iectypes = []
+        for _i0 in range(_n0):
+            _v0 = codec.read_string()
+            iectypes.append(_v0)
+
+        # Invoke user implementation of remote function.
+        _result = self._handler.UpdateTraceVariablesList(
+            debugToken, adds, removes, iectypes, update
+        )
+
+        # Prepare codec for reply message.
+        codec.reset()
+
+        # Construct reply message.
+        codec.start_write_message(
+            erpc.codec.MessageInfo(
+                type=erpc.codec.MessageType.kReplyMessage,
+                service=interface.IBeremizPLCObjectService.SERVICE_ID,
+                request=interface.IBeremizPLCObjectService.UPDATETRACEVARIABLESLIST_ID,
+                sequence=sequence,
+            )
+        )
+        if update.value is None:
+            raise ValueError("update.value is None")
+        update.value._write(codec)
+        codec.write_uint32(_result)
+
+    def _handle_GetTraceClock(self, sequence, codec):
+        # Create reference objects to pass into handler for out/inout parameters.
+        clock = erpc.Reference()
+
+        # Read incoming parameters.
+
+        # Invoke user implementation of remote function.
+        _result = self._handler.GetTraceClock(clock)
+
+        # Prepare codec for reply message.
+        codec.reset()
+
+        # Construct reply message.
+        codec.start_write_message(
+            erpc.codec.MessageInfo(
+                type=erpc.codec.MessageType.kReplyMessage,
+                service=interface.IBeremizPLCObjectService.SERVICE_ID,
+                request=interface.IBeremizPLCObjectService.GETTRACECLOCK_ID,
+                sequence=sequence,
+            )
+        )
+        if clock.value is None:
+            raise ValueError("clock.value is None")
+        clock.value._write(codec)
+        codec.write_uint32(_result)
+
+    def _handle_GetTimedTraceVariables(self, sequence, codec):
+        # Create reference objects to pass into handler for out/inout parameters.
+        traces = erpc.Reference()
+
+        # Read incoming parameters.
+        debugToken = codec.read_uint32()
+
+        # Invoke user implementation of remote function.
+        _result = self._handler.GetTimedTraceVariables(debugToken, traces)
+
+        # Prepare codec for reply message.
+        codec.reset()
+
+        # Construct reply message.
+        codec.start_write_message(
+            erpc.codec.MessageInfo(
+                type=erpc.codec.MessageType.kReplyMessage,
+                service=interface.IBeremizPLCObjectService.SERVICE_ID,
+                request=interface.IBeremizPLCObjectService.GETTIMEDTRACEVARIABLES_ID,
+                sequence=sequence,
+            )
+        )
+        if traces.value is None:
+            raise ValueError("traces.value is None")
+        traces.value._write(codec)
+        codec.write_uint32(_result)
+
+    def _handle_ForceVariables(self, sequence, codec):
+        # Create reference objects to pass into handler for out/inout parameters.
+        debugtoken = erpc.Reference()
+
+        # Read incoming parameters.
+        debugToken = codec.read_uint32()
+        _n0 = codec.start_read_list()
+        forces = []
+        for _i0 in range(_n0):
+            _v0 = common.trace_order()._read(codec)
+            forces.append(_v0)
+
+        # Invoke user implementation of remote function.
+        _result = self._handler.ForceVariables(debugToken, forces, debugtoken)
+
+        # Prepare codec for reply message.
+        codec.reset()
+
+        # Construct reply message.
+        codec.start_write_message(
+            erpc.codec.MessageInfo(
+                type=erpc.codec.MessageType.kReplyMessage,
+                service=interface.IBeremizPLCObjectService.SERVICE_ID,
+                request=interface.IBeremizPLCObjectService.FORCEVARIABLES_ID,
+                sequence=sequence,
+            )
+        )
+        if debugtoken.value is None:
+            raise ValueError("debugtoken.value is None")
+        codec.write_int32(debugtoken.value)
+        codec.write_uint32(_result)
+
+    def _handle_GetWorkerMetrics(self, sequence, codec):
+        # Create reference objects to pass into handler for out/inout parameters.
+        metrics = erpc.Reference()
+
+        # Read incoming parameters.
+
+        # Invoke user implementation of remote function.
+        _result = self._handler.GetWorkerMetrics(metrics)
+
+        # Prepare codec for reply message.
+        codec.reset()
+
+        # Construct reply message.
+        codec.start_write_message(
+            erpc.codec.MessageInfo(
+                type=erpc.codec.MessageType.kReplyMessage,
+                service=interface.IBeremizPLCObjectService.SERVICE_ID,
+                request=interface.IBeremizPLCObjectService.GETWORKERMETRICS_ID,
+                sequence=sequence,
+            )
+        )
+        if metrics.value is None:
+            raise ValueError("metrics.value is None")
+        codec.write_string(metrics.value)
+        codec.write_uint32(_result)
+
+    def _handle_HaveBlobs(self, sequence, codec):
+        # Create reference objects to pass into handler for out/inout parameters.
+        missing = erpc.Reference()
+
+        # Read incoming parameters.
+        _n0 = codec.start_read_list()
+        digests = []
+        for _i0 in range(_n0):
+            _v0 = codec.read_binary()
+            digests.append(_v0)
+
+        # Invoke user implementation of remote function.
+        _result = self._handler.HaveBlobs(digests, missing)
+
+        # Prepare codec for reply message.
+        codec.reset()
+
+        # Construct reply message.
+        codec.start_write_message(
+            erpc.codec.MessageInfo(
+                type=erpc.codec.MessageType.kReplyMessage,
+                service=interface.IBeremizPLCObjectService.SERVICE_ID,
+                request=interface.IBeremizPLCObjectService.HAVEBLOBS_ID,
+                sequence=sequence,
+            )
+        )
+        if missing.value is None:
+            raise ValueError("missing.value is None")
+        codec.start_write_list(len(missing.value))
+        for _i0 in missing.value:
+            codec.write_binary(_i0)
+
+        codec.write_uint32(_result)
+
+    def _handle_OpenBlobUpload(self, sequence, codec):
+        # Create reference objects to pass into handler for out/inout parameters.
+        missing = erpc.Reference()
+
+        # Read incoming parameters.
+        digest = codec.read_binary()
+        size = codec.read_uint64()
+
+        # Invoke user implementation of remote function.
+        _result = self._handler.OpenBlobUpload(digest, size, missing)
+
+        # Prepare codec for reply message.
+        codec.reset()
+
+        # Construct reply message.
+        codec.start_write_message(
+            erpc.codec.MessageInfo(
+                type=erpc.codec.MessageType.kReplyMessage,
+                service=interface.IBeremizPLCObjectService.SERVICE_ID,
+                request=interface.IBeremizPLCObjectService.OPENBLOBUPLOAD_ID,
+                sequence=sequence,
+            )
+        )
+        if missing.value is None:
+            raise ValueError("missing.value is None")
+        codec.start_write_list(len(missing.value))
+        for _i0 in missing.value:
+            _i0._write(codec)
+
+        codec.write_uint32(_result)
+
+    def _handle_WriteBlobChunk(self, sequence, codec):
+        # Create reference objects to pass into handler for out/inout parameters.
+        status = erpc.Reference()
+
+        # Read incoming parameters.
+        digest = codec.read_binary()
+        offset = codec.read_uint64()
+        data = codec.read_binary()
+
+        # Invoke user implementation of remote function.
+        _result = self._handler.WriteBlobChunk(digest, offset, data, status)
+
+        # Prepare codec for reply message.
+        codec.reset()
+
+        # Construct reply message.
+        codec.start_write_message(
+            erpc.codec.MessageInfo(
+                type=erpc.codec.MessageType.kReplyMessage,
+                service=interface.IBeremizPLCObjectService.SERVICE_ID,
+                request=interface.IBeremizPLCObjectService.WRITEBLOBCHUNK_ID,
+                sequence=sequence,
+            )
+        )
+        if status.value is None:
+            raise ValueError("status.value is None")
+        codec.write_int32(status.value)
+        codec.write_uint32(_result)
+
+    def _handle_FinishBlobUpload(self, sequence, codec):
+        # Create reference objects to pass into handler for out/inout parameters.
+        success = erpc.Reference()
+
+        # Read incoming parameters.
+        digest = codec.read_binary()
+
+        # Invoke user implementation of remote function.
+        _result = self._handler.FinishBlobUpload(digest, success)
+
+        # Prepare codec for reply message.
+        codec.reset()
+
+        # Construct reply message.
+        codec.start_write_message(
+            erpc.codec.MessageInfo(
+                type=erpc.codec.MessageType.kReplyMessage,
+                service=interface.IBeremizPLCObjectService.SERVICE_ID,
+                request=interface.IBeremizPLCObjectService.FINISHBLOBUPLOAD_ID,
+                sequence=sequence,
+            )
+        )
+        if success.value is None:
+            raise ValueError("success.value is None")
+        codec.write_bool(success.value)
+        codec.write_uint32(_result)
+
+    def _handle_CancelBlobUpload(self, sequence, codec):
+        # Read incoming parameters.
+        digest = codec.read_binary()
+
+        # Invoke user implementation of remote function.
+        _result = self._handler.CancelBlobUpload(digest)
+
+        # Prepare codec for reply message.
+        codec.reset()
+
+        # Construct reply message.
+        codec.start_write_message(
+            erpc.codec.MessageInfo(
+                type=erpc.codec.MessageType.kReplyMessage,
+                service=interface.IBeremizPLCObjectService.SERVICE_ID,
+                request=interface.IBeremizPLCObjectService.CANCELBLOBUPLOAD_ID,
+                sequence=sequence,
+            )
+        )
+        codec.write_uint32(_result)
+
+    def _handle_SeedCompressedBlob(self, sequence, codec):
+        # Create reference objects to pass into handler for out/inout parameters.
+        blobID = erpc.Reference()
+
+        # Read incoming parameters.
+        seed = codec.read_binary()
+        compression = codec.read_string()
+
+        # Invoke user implementation of remote function.
+        _result = self._handler.SeedCompressedBlob(seed, compression, blobID)
+
+        # Prepare codec for reply message.
+        codec.reset()
+
+        # Construct reply message.
+        codec.start_write_message(
+            erpc.codec.MessageInfo(
+                type=erpc.codec.MessageType.kReplyMessage,
+                service=interface.IBeremizPLCObjectService.SERVICE_ID,
+                request=interface.IBeremizPLCObjectService.SEEDCOMPRESSEDBLOB_ID,
+                sequence=sequence,
+            )
+        )
+        if blobID.value is None:
+            raise ValueError("blobID.value is None")
+        codec.write_binary(blobID.value)
+        codec.write_uint32(_result)
+
+    def _handle_SeedDeltaBlob(self, sequence, codec):
+        # Create reference objects to pass into handler for out/inout parameters.
+        blobID = erpc.Reference()
+
+        # Read incoming parameters.
+        seed = codec.read_binary()
+        baseMD5 = codec.read_string()
+        compression = codec.read_string()
+        digest = codec.read_binary()
+
+        # Invoke user implementation of remote function.
+        _result = self._handler.SeedDeltaBlob(
+            seed, baseMD5, compression, digest, blobID
+        )
+
+        # Prepare codec for reply message.
+        codec.reset()
+
+        # Construct reply message.
+        codec.start_write_message(
+            erpc.codec.MessageInfo(
+                type=erpc.codec.MessageType.kReplyMessage,
+                service=interface.IBeremizPLCObjectService.SERVICE_ID,
+                request=interface.IBeremizPLCObjectService.SEEDDELTABLOB_ID,
+                sequence=sequence,
+            )
+        )
+        if blobID.value is None:
+            raise ValueError("blobID.value is None")
+        codec.write_binary(blobID.value)
+        codec.write_uint32(_result)
+
+    def _handle_GetInstallReport(self, sequence, codec):
+        # Create reference objects to pass into handler for out/inout parameters.
+        report = erpc.Reference()
+
+        # Read incoming parameters.
+
+        # Invoke user implementation of remote function.
+        _result = self._handler.GetInstallReport(report)
+
+        # Prepare codec for reply message.
+        codec.reset()
+
+        # Construct reply message.
+        codec.start_write_message(
+            erpc.codec.MessageInfo(
+                type=erpc.codec.MessageType.kReplyMessage,
+                service=interface.IBeremizPLCObjectService.SERVICE_ID,
+                request=interface.IBeremizPLCObjectService.GETINSTALLREPORT_ID,
+                sequence=sequence,
+            )
+        )
+        if report.value is None:
+            raise ValueError("report.value is None")
+        codec.write_string(report.value)
+        codec.write_uint32(_result)
+
+    def _handle_QueryMD5(self, sequence, codec):
+        # Create reference objects to pass into handler for out/inout parameters.
+        state = erpc.Reference()
+
+        # Read incoming parameters.
+        MD5 = codec.read_string()
+
+        # Invoke user implementation of remote function.
+        _result = self._handler.QueryMD5(MD5, state)
+
+        # Prepare codec for reply message.
+        codec.reset()
+
+        # Construct reply message.
+        codec.start_write_message(
+            erpc.codec.MessageInfo(
+                type=erpc.codec.MessageType.kReplyMessage,
+                service=interface.IBeremizPLCObjectService.SERVICE_ID,
+                request=interface.IBeremizPLCObjectService.QUERYMD5_ID,
+                sequence=sequence,
+            )
+        )
+        if state.value is None:
+            raise ValueError("state.value is None")
+        codec.write_int32(state.value)
+        codec.write_uint32(_result)
+
+    def _handle_GetLogMessages(self, sequence, codec):
+        # Create reference objects to pass into handler for out/inout parameters.
+        messages = erpc.Reference()
+
+        # Read incoming parameters.
+        level = codec.read_uint8()
+        fromID = codec.read_uint32()
+        maxCount = codec.read_uint32()
+
+        # Invoke user implementation of remote function.
+        _result = self._handler.GetLogMessages(level, fromID, maxCount, messages)
+
+        # Prepare codec for reply message.
+        codec.reset()
+
+        # Construct reply message.
+        codec.start_write_message(
+            erpc.codec.MessageInfo(
+                type=erpc.codec.MessageType.kReplyMessage,
+                service=interface.IBeremizPLCObjectService.SERVICE_ID,
+                request=interface.IBeremizPLCObjectService.GETLOGMESSAGES_ID,
+                sequence=sequence,
+            )
+        )
+        if messages.value is None:
+            raise ValueError("messages.value is None")
+        codec.start_write_list(len(messages.value))
+        for _i0 in messages.value:
+            _i0._write(codec)
+
+        codec.write_uint32(_result)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of Beremiz runtime.
+#
+# See COPYING.Runtime file for copyrights details.
+
+"""
+Non blocking access to PLCObject for network front-ends.
+
+Methods decorated with RunInMain are submitted to MainWorker queue, and
+their result is delivered through an asyncio future or a Twisted
+Deferred, no thread waits for them. Other methods may block, i.e.
+StreamTraceVariables, they are run in a thread pool.
+"""
+
+import asyncio
+from functools import partial, wraps
+
+from beremiz_runtime.runtime import MainWorker
+
+try:
+    from twisted.internet import reactor, threads
+    from twisted.internet.defer import Deferred
+    from twisted.python.failure import Failure
+except ImportError:
+    Deferred = None
+
+
+def SubmitCall(method, *args, **kwargs):
+    """
+    Submit call of a RunInMain decorated bound method to MainWorker.
+    Returns a concurrent.futures.Future, or None if method isn't
+    decorated with RunInMain
+    """
+    func = getattr(method, "_run_in_main", None)
+    if func is None:
+        return None
+    return MainWorker.submit(func, method.__self__, *args, **kwargs)
+
+
+class AsyncPLCObject(object):
+    """
+    asyncio facade of a PLCObject : each method X is available as
+    coroutine aX, i.e. await facade.aGetPLCstatus()
+    """
+
+    def __init__(self, plcobj, executor=None):
+        self.plcobj = plcobj
+        self.executor = executor
+
+    def __getattr__(self, name):
+        if not (name.startswith("a") and name[1:2].isupper()):
+            raise AttributeError(name)
+        method = getattr(self.plcobj, name[1:])
+
+        @wraps(method)
+        async def coroutine(*args, **kwargs):
+            future = SubmitCall(method, *args, **kwargs)
+            if future is not None:
+                return await asyncio.wrap_future(future)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self.executor, partial(method, *args, **kwargs)
+            )
+
+        coroutine.__name__ = name
+        # next lookups don't go through __getattr__
+        setattr(self, name, coroutine)
+        return coroutine
+
+
+def DeferredCall(method, *args, **kwargs):
+    """
+    Call PLCObject method, returning a Twisted Deferred fired in reactor
+    thread with method result
+    """
+    future = SubmitCall(method, *args, **kwargs)
+    if future is None:
+        return threads.deferToThread(method, *args, **kwargs)
+
+    d = Deferred()
+
+    def done(future):
+        try:
+            result = future.result()
+        except BaseException as e:
+            reactor.callFromThread(d.errback, Failure(e))
+        else:
+            reactor.callFromThread(d.callback, result)
+
+    future.add_done_callback(done)
+    return d
+
+
+def AsDeferred(method):
+    """
+    Wrap RunInMain PLCObject method so that it returns a Deferred instead
+    of blocking caller, i.e. to register it as a WAMP callee. Other
+    methods are returned as is, they keep being called in reactor thread.
+    """
+    if getattr(method, "_run_in_main", None) is None:
+        return method
+    if Deferred is None:
+        raise ImportError("Twisted is needed for Deferred calls")
+
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        return DeferredCall(method, *args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,197 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of Beremiz runtime.
+#
+# See COPYING.Runtime file for copyrights details.
+
+"""
+Binary delta of a file against a base file, i.e. new PLC shared object
+against installed one, so that only changed parts are transfered.
+
+A delta is DeltaMagic followed by instructions, little endian :
+  COPY  : OpCopy, uint64 offset, uint32 size : size bytes of base file
+  ADD   : OpAdd, uint32 size, size bytes of data
+  END   : OpEnd, nothing can follow
+New file is the concatenation of instructions output. DeltaDecoder
+rebuilds it as delta is received, without buffering it.
+"""
+
+import os
+from struct import Struct
+
+DeltaMagic = b"BDLT\x01"
+OpEnd = 0
+OpCopy = 1
+OpAdd = 2
+
+_Copy = Struct("<BQI")
+_Add = Struct("<BI")
+_OpSizes = {OpEnd: 1, OpCopy: _Copy.size, OpAdd: _Add.size}
+
+# Bytes of base file read at once
+CopyBlockSize = 1024 * 1024
+# Size of blocks of base file looked for in new file by MakeDelta
+DefaultBlockSize = 64
+MaxInstructionSize = 0xFFFFFFFF
+
+
+class DeltaDecoder(object):
+    """
+    Incremental decoder of a delta against given base file. Base file is
+    kept open, it can be removed meanwhile.
+    """
+
+    def __init__(self, basepath):
+        self.base = open(basepath, "rb")
+        self.basesize = os.fstat(self.base.fileno()).st_size
+        self.header = False
+        self.pending = bytearray()
+        self.adding = 0
+        self.ended = False
+
+    def _needed(self):
+        if not self.header:
+            return len(DeltaMagic)
+        if not self.pending:
+            return 1
+        try:
+            return _OpSizes[self.pending[0]]
+        except KeyError:
+            raise ValueError("Invalid delta instruction %d" % self.pending[0])
+
+    def _instruction(self):
+        instruction = bytes(self.pending)
+        del self.pending[:]
+        if not self.header:
+            if instruction != DeltaMagic:
+                raise ValueError("Invalid delta header")
+            self.header = True
+        elif instruction[0] == OpEnd:
+            self.ended = True
+        elif instruction[0] == OpAdd:
+            _op, self.adding = _Add.unpack(instruction)
+        else:
+            _op, offset, size = _Copy.unpack(instruction)
+            if offset + size > self.basesize:
+                raise ValueError("Delta copies out of base file")
+            self.base.seek(offset)
+            while size:
+                block = self.base.read(min(size, CopyBlockSize))
+                if not block:
+                    raise ValueError("Delta base file changed")
+                size -= len(block)
+                yield block
+
+    def decode(self, data):
+        view = memoryview(data)
+        pos = 0
+        while True:
+            if self.adding:
+                if pos == len(view):
+                    return
+                size = min(self.adding, len(view) - pos)
+                yield view[pos : pos + size]
+                self.adding -= size
+                pos += size
+                continue
+            need = self._needed()
+            if len(self.pending) == need:
+                yield from self._instruction()
+                continue
+            if pos == len(view):
+                return
+            if self.ended:
+                raise ValueError("Data after end of delta")
+            size = min(need - len(self.pending), len(view) - pos)
+            self.pending += view[pos : pos + size]
+            pos += size
+
+    def flush(self):
+        if not self.ended:
+            raise ValueError("Truncated delta")
+        self.close()
+        return ()
+
+    def close(self):
+        self.base.close()
+
+
+class DeltaEncoder(object):
+    """
+    Builds delta instructions, merging consecutive ones
+    """
+
+    def __init__(self):
+        self.parts = [DeltaMagic]
+        self.copy = None
+        self.literal = bytearray()
+
+    def _flush_copy(self):
+        if self.copy is not None:
+            offset, size = self.copy
+            self.parts.append(_Copy.pack(OpCopy, offset, size))
+            self.copy = None
+
+    def _flush_literal(self):
+        literal = self.literal
+        for start in range(0, len(literal), MaxInstructionSize):
+            chunk = bytes(literal[start : start + MaxInstructionSize])
+            self.parts.append(_Add.pack(OpAdd, len(chunk)) + chunk)
+        self.literal = bytearray()
+
+    def add(self, data):
+        self._flush_copy()
+        self.literal += data
+
+    def copy_from(self, offset, size):
+        self._flush_literal()
+        if self.copy is not None:
+            last_offset, last_size = self.copy
+            if (
+                last_offset + last_size == offset
+                and last_size + size <= MaxInstructionSize
+            ):
+                self.copy = (last_offset, last_size + size)
+                return
+            self._flush_copy()
+        self.copy = (offset, size)
+
+    def finish(self):
+        self._flush_copy()
+        self._flush_literal()
+        self.parts.append(bytes([OpEnd]))
+        return b"".join(self.parts)
+
+
+def MakeDelta(base, target, blocksize=DefaultBlockSize):
+    """
+    Delta rebuilding target bytes from base bytes. Blocks of base aligned
+    on blocksize are looked for at every offset of target, and matches
+    are extended forward.
+    """
+    blocks = {}
+    for offset in range(0, len(base) - blocksize + 1, blocksize):
+        blocks.setdefault(base[offset : offset + blocksize], offset)
+
+    encoder = DeltaEncoder()
+    pos = 0
+    literal_start = 0
+    end = len(target) - blocksize
+    while pos <= end:
+        offset = blocks.get(target[pos : pos + blocksize])
+        if offset is None:
+            pos += 1
+            continue
+        size = blocksize
+        limit = min(len(base) - offset, len(target) - pos, MaxInstructionSize)
+        while size < limit and base[offset + size] == target[pos + size]:
+            size += 1
+        if literal_start < pos:
+            encoder.add(target[literal_start:pos])
+        encoder.copy_from(offset, size)
+        pos += size
+        literal_start = pos
+    if literal_start < len(target):
+        encoder.add(target[literal_start:])
+    return encoder.finish()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of Beremiz runtime.
+#
+# See COPYING.Runtime file for copyrights details.
+
+"""
+Bounded set of blobs being uploaded.
+
+Abandoned uploads would otherwise keep their file descriptor, memory
+and temporary file until PurgeBlobs. Incomplete blobs idle for more than
+a TTL are discarded. Complete blobs are kept until NewPLC or PurgeBlobs
+consumes them, whatever their count or size : limits on open files and
+on memory don't discard any blob, least recently touched blobs beyond
+limits are closed or written to a file instead.
+
+Managed blobs have a fd attribute, None if they don't hold a file open,
+a resident attribute giving bytes they keep in memory, a complete()
+method telling whether they can still be discarded by TTL, and
+suspend(), spill() and discard() methods. suspend() closes file until
+blob is written again and returns False if blob is in use, spill() moves
+content kept in memory to a file.
+"""
+
+from collections import OrderedDict
+from threading import Lock, Timer
+from time import monotonic
+
+
+class BlobManager(object):
+    """
+    Blobs by ID, least recently touched first
+    """
+
+    def __init__(self, ttl, maxfiles, maxmemory):
+        self.ttl = ttl
+        self.maxfiles = maxfiles
+        self.maxmemory = maxmemory
+        self.lock = Lock()
+        self.blobs = OrderedDict()
+        self.touched = {}
+        self.timer = None
+        self.evicted = 0
+
+    def __len__(self):
+        return len(self.blobs)
+
+    def _touch(self, blobID):
+        self.blobs.move_to_end(blobID)
+        self.touched[blobID] = monotonic()
+
+    def _discard(self, blobID):
+        blob = self.blobs.pop(blobID)
+        del self.touched[blobID]
+        blob.discard()
+
+    def _expire(self):
+        deadline = monotonic() - self.ttl
+        for blobID, blob in list(self.blobs.items()):
+            if self.touched[blobID] > deadline:
+                # others were touched later
+                break
+            if blob.complete():
+                # waits for NewPLC or PurgeBlobs
+                continue
+            self._discard(blobID)
+            self.evicted += 1
+
+    def _enforce(self):
+        self._expire()
+        blobs = list(self.blobs.values())
+        resident = sum(blob.resident for blob in blobs)
+        for blob in blobs:
+            if resident <= self.maxmemory:
+                break
+            if blob.resident:
+                resident -= blob.resident
+                blob.spill()
+        files = sum(blob.fd is not None for blob in blobs)
+        for blob in blobs:
+            if files <= self.maxfiles:
+                break
+            if blob.fd is not None and blob.suspend():
+                files -= 1
+
+    def _expire_later(self):
+        with self.lock:
+            self.timer = None
+            self._expire()
+            self._schedule()
+
+    def _schedule(self):
+        # abandoned blobs are discarded even if no other blob is uploaded
+        if self.timer is None and self.blobs:
+            self.timer = Timer(self.ttl / 2.0, self._expire_later)
+            self.timer.daemon = True
+            self.timer.start()
+
+    def put(self, blobID, blob):
+        """
+        Add or touch blob, closing or spilling others if limits are
+        exceeded
+        """
+        with self.lock:
+            self.blobs[blobID] = blob
+            self._touch(blobID)
+            self._enforce()
+            self._schedule()
+
+    def get(self, blobID):
+        """
+        Touch and return blob, None if missing
+        """
+        with self.lock:
+            if blobID not in self.blobs:
+                return None
+            self._touch(blobID)
+            return self.blobs[blobID]
+
+    def pop(self, blobID):
+        """
+        Remove blob and return it, None if missing
+        """
+        with self.lock:
+            self._expire()
+            self.touched.pop(blobID, None)
+            return self.blobs.pop(blobID, None)
+
+    def discard(self, blobID):
+        with self.lock:
+            if blobID in self.blobs:
+                self._discard(blobID)
+
+    def clear(self):
+        with self.lock:
+            for blobID in list(self.blobs):
+                self._discard(blobID)
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of Beremiz runtime.
+#
+# See COPYING.Runtime file for copyrights details.
+
+"""
+Persistent content addressed store of uploaded files.
+
+Files are kept under working directory, named after SHA-256 of their
+content, so that a client can ask which of its files are already there
+and upload only missing ones. Files are installed from store by hard
+link, or reflink, or copy as a last resort. Files that may be written
+once installed, i.e. PLC extra files, are never hard linked, so that
+they are writable and store content can't be changed through them.
+
+Stored files are read-only and their modification time is set to
+StoreMTime : a hard linked file written by PLC afterwards gets another
+modification time, and is dropped from store instead of being installed
+again with unexpected content.
+"""
+
+import hashlib
+import os
+import shutil
+import stat
+from time import time
+
+HashName = "sha256"
+HashSize = hashlib.new(HashName).digest_size
+StoreMTime = 0
+
+# linux/fs.h FICLONE ioctl, copy-on-write clone of a whole file
+_FICLONE = 0x40049409
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+def _reflink(src, dst):
+    """
+    Copy-on-write clone of src as dst, False if filesystem can't do it
+    """
+    if fcntl is None:
+        return False
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        try:
+            fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+        except (OSError, IOError):
+            failed = True
+        else:
+            failed = False
+    if failed:
+        os.remove(dst)
+    return not failed
+
+
+class BlobStore(object):
+    """
+    Content addressed store of files, in given directory
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        # files being uploaded, their received ranges are lost on restart
+        self.uploads = os.path.join(directory, "uploads")
+        if os.path.exists(self.uploads):
+            shutil.rmtree(self.uploads)
+        os.mkdir(self.uploads)
+
+    def upload_path(self, digest):
+        return os.path.join(self.uploads, digest.hex())
+
+    def path(self, digest):
+        name = digest.hex()
+        return os.path.join(self.directory, name[:2], name)
+
+    def has(self, digest):
+        """
+        Tell if a valid file of given digest is stored
+        """
+        if len(digest) != HashSize:
+            return False
+        path = self.path(digest)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        if int(st.st_mtime) != StoreMTime:
+            # written through a hard link, content doesn't match digest
+            self._remove(path)
+            return False
+        return True
+
+    def missing(self, digests):
+        """
+        Digests of files not stored amongst given ones
+        """
+        return [digest for digest in digests if not self.has(digest)]
+
+    def add(self, path, digest):
+        """
+        Move file of given content digest into store
+        """
+        dst = self.path(digest)
+        if self.has(digest):
+            os.remove(path)
+            return dst
+        parent = os.path.dirname(dst)
+        if not os.path.isdir(parent):
+            os.makedirs(parent)
+        os.chmod(path, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+        os.utime(path, (StoreMTime, StoreMTime))
+        # atomic, store never exposes partial files
+        os.replace(path, dst)
+        return dst
+
+    def install(self, digest, newpath, link=False):
+        """
+        Install stored file as newpath, by read-only hard link if link is
+        True and if possible, otherwise as a writable reflink or copy.
+        Returns method used : "link", "reflink" or "copy"
+        """
+        if not self.has(digest):
+            raise KeyError(digest)
+        src = self.path(digest)
+        if os.path.lexists(newpath):
+            os.remove(newpath)
+        if link:
+            try:
+                os.link(src, newpath)
+                return "link"
+            except OSError:
+                # i.e. other filesystem, or links not supported
+                pass
+        if _reflink(src, newpath):
+            return "reflink"
+        shutil.copyfile(src, newpath)
+        return "copy"
+
+    def digests(self):
+        """
+        Digests of all stored files
+        """
+        for sub in os.listdir(self.directory):
+            subdir = os.path.join(self.directory, sub)
+            if len(sub) != 2 or not os.path.isdir(subdir):
+                # i.e. uploads
+                continue
+            for name in os.listdir(subdir):
+                try:
+                    yield bytes.fromhex(name)
+                except ValueError:
+                    pass
+
+    def size(self, digest):
+        try:
+            return os.stat(self.path(digest)).st_size
+        except OSError:
+            return 0
+
+    def collect(self, keep, grace):
+        """
+        Remove stored files which digest isn't in keep, unless they were
+        stored or installed less than grace seconds ago, i.e. uploaded
+        for a NewPLC to come
+        """
+        deadline = time() - grace
+        for digest in list(self.digests()):
+            if digest in keep:
+                continue
+            path = self.path(digest)
+            try:
+                # changed by rename into store and by each hard link
+                if os.stat(path).st_ctime > deadline:
+                    continue
+            except OSError:
+                continue
+            self._remove(path)
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
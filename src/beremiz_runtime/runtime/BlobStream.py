@@ -0,0 +1,278 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of Beremiz runtime.
+#
+# See COPYING.Runtime file for copyrights details.
+
+"""
+Blob being uploaded with SeedBlob/AppendChunkToBlob.
+
+Chunks go through an optional decoder before being written, i.e. a
+decompressor or a delta decoder, so that blob ID and digest are computed on decoded
+content : a compressed upload installs the same file with the same blob
+ID as an uncompressed one.
+"""
+
+import hashlib
+import os
+import zlib
+from tempfile import mkstemp
+
+from beremiz_runtime.runtime.BlobStore import HashName
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Bytes decompressed at once, bounds memory used by a highly compressed
+# chunk
+MaxDecompressedSize = 1024 * 1024
+
+# zstd has no bounded decompression : a zstd block decodes to at most
+# ZstdMaxBlockSize bytes and takes at least ZstdMinBlockSize bytes of
+# input, so input is fed by slices whose output can't exceed about
+# MaxDecompressedSize
+ZstdMaxBlockSize = 128 * 1024
+ZstdMinBlockSize = 4
+ZstdSliceSize = MaxDecompressedSize // ZstdMaxBlockSize * ZstdMinBlockSize
+
+
+class ZlibDecoder(object):
+    """
+    Incremental decoder of a zlib stream
+    """
+
+    def __init__(self):
+        self.decompressor = zlib.decompressobj()
+
+    def decode(self, data):
+        decompressor = self.decompressor
+        while data:
+            yield decompressor.decompress(data, MaxDecompressedSize)
+            data = decompressor.unconsumed_tail
+
+    @property
+    def ended(self):
+        return self.decompressor.eof
+
+    def flush(self):
+        yield self.decompressor.flush()
+        if not self.decompressor.eof or self.decompressor.unused_data:
+            raise ValueError("Invalid zlib stream")
+
+    def close(self):
+        pass
+
+
+class ZstdDecoder(object):
+    """
+    Incremental decoder of a zstd frame
+    """
+
+    def __init__(self):
+        if zstandard is None:
+            raise ImportError("zstandard is needed to decompress zstd blobs")
+        self.decompressor = zstandard.ZstdDecompressor().decompressobj()
+
+    def decode(self, data):
+        view = memoryview(data)
+        decompressor = self.decompressor
+        for start in range(0, len(view), ZstdSliceSize):
+            yield decompressor.decompress(view[start : start + ZstdSliceSize])
+
+    @property
+    def ended(self):
+        return getattr(self.decompressor, "eof", False)
+
+    def flush(self):
+        # without eof, end of frame can't be verified
+        if not getattr(self.decompressor, "eof", False):
+            raise ValueError("Invalid or unverifiable zstd stream")
+        if getattr(self.decompressor, "unused_data", b""):
+            raise ValueError("Invalid zstd stream")
+        return ()
+
+    def close(self):
+        pass
+
+
+class ChainedDecoder(object):
+    """
+    Output of first decoder decoded by second one, i.e. a compressed delta
+    """
+
+    def __init__(self, first, second):
+        self.first = first
+        self.second = second
+
+    def decode(self, data):
+        for decoded in self.first.decode(data):
+            yield from self.second.decode(decoded)
+
+    @property
+    def ended(self):
+        return self.first.ended and self.second.ended
+
+    def flush(self):
+        for decoded in self.first.flush():
+            yield from self.second.decode(decoded)
+        yield from self.second.flush()
+
+    def close(self):
+        self.first.close()
+        self.second.close()
+
+
+BlobDecoders = {
+    "zlib": ZlibDecoder,
+    "zstd": ZstdDecoder,
+}
+
+
+def GetBlobDecoder(compression):
+    """
+    Decoder for given compression, None if no compression
+    """
+    if not compression:
+        return None
+    try:
+        return BlobDecoders[compression]()
+    except KeyError:
+        raise ValueError("Unsupported blob compression: " + compression)
+
+
+class BlobStream(object):
+    """
+    Blob written by chunks, blob ID being MD5 of seed and content written
+    so far. If expected SHA-256 digest of content is given, it is
+    verified when finished.
+
+    Content is kept in memory as long as it doesn't exceed memorysize,
+    then in a temporary file of given directory, so that small blobs
+    don't use a file descriptor nor flash writes unless installed.
+    File is closed by suspend() and reopened when written again.
+
+    Blob is complete once its decoder reached end of stream. Without
+    decoder, end of content can't be told and blob is always complete.
+    """
+
+    def __init__(self, directory, seed, decoder=None, expected=None, memorysize=0):
+        self.directory = directory
+        self.fd = self.path = None
+        self.memory = bytearray() if memorysize > 0 else None
+        self.memorysize = memorysize
+        self.size = 0
+        self.decoder = decoder
+        self.expected = expected
+        self.md5sum = hashlib.new("md5")
+        # seed isn't content, only digest of content is kept in store
+        self.md5sum.update(seed)
+        self.digest = hashlib.new(HashName)
+        if self.memory is None:
+            self._open()
+
+    def _open(self):
+        self.fd, self.path = mkstemp(dir=self.directory)
+        memory, self.memory = self.memory, None
+        if memory:
+            self._write_file(memory)
+
+    @property
+    def resident(self):
+        return len(self.memory) if self.memory is not None else 0
+
+    def complete(self):
+        return self.decoder is None or self.decoder.ended
+
+    def spill(self):
+        """
+        Write content kept in memory to file
+        """
+        if self.memory is not None:
+            self._open()
+
+    def suspend(self):
+        """
+        Close file until next write
+        """
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+        return True
+
+    def _write_file(self, data):
+        if self.fd is None:
+            self.fd = os.open(self.path, os.O_WRONLY | os.O_APPEND)
+        view = memoryview(data)
+        while view:
+            view = view[os.write(self.fd, view) :]
+
+    def blobID(self):
+        return self.md5sum.digest()
+
+    def _write(self, data):
+        if not data:
+            return
+        self.md5sum.update(data)
+        self.digest.update(data)
+        self.size += len(data)
+        if self.memory is not None:
+            if self.size <= self.memorysize:
+                self.memory += data
+                return
+            # too big to be kept in memory
+            self._open()
+        self._write_file(data)
+
+    def append(self, data):
+        """
+        Decode and write chunk, returns new blob ID
+        """
+        if self.decoder is None:
+            self._write(data)
+        else:
+            for decoded in self.decoder.decode(data):
+                self._write(decoded)
+        return self.blobID()
+
+    def finish(self):
+        """
+        Write remaining decoded content and close file, file being
+        created if content was in memory.
+        Returns SHA-256 digest of content
+        """
+        try:
+            if self.decoder is not None:
+                for decoded in self.decoder.flush():
+                    self._write(decoded)
+            if self.path is None:
+                self._open()
+            elif self.fd is None:
+                self.fd = os.open(self.path, os.O_WRONLY | os.O_APPEND)
+            os.fsync(self.fd)
+        finally:
+            self.close()
+        digest = self.digest.digest()
+        if self.expected is not None and digest != self.expected:
+            raise ValueError("Blob content doesn't match expected digest")
+        return digest
+
+    def close(self):
+        if self.decoder is not None:
+            self.decoder.close()
+            self.decoder = None
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+        self.memory = None
+
+    def discard(self):
+        """
+        Close and remove blob
+        """
+        self.close()
+        if self.path is not None:
+            os.remove(self.path)
+            self.path = None
@@ -0,0 +1,214 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of Beremiz runtime.
+#
+# See COPYING.Runtime file for copyrights details.
+
+"""
+Offset addressed upload of a file of known size and SHA-256 digest.
+
+Unlike SeedBlob/AppendChunkToBlob, chunks don't need to be sent in
+order : each one is written at its offset in a preallocated file, and
+received ranges are tracked so that an interrupted upload can be resumed
+by sending missing ranges only. Digest is verified once, when all ranges
+are received.
+"""
+
+import hashlib
+import os
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+from threading import Condition, Lock
+
+from beremiz_runtime.runtime.BlobStore import HashName
+
+# Size of reads when verifying digest
+VerifyBlockSize = 1024 * 1024
+
+
+# serializes seek and read/write where pread and pwrite are missing
+_SeekLock = Lock()
+
+
+def _pwrite(fd, data, offset):
+    with _SeekLock:
+        os.lseek(fd, offset, os.SEEK_SET)
+        return os.write(fd, data)
+
+
+def _pread(fd, size, offset):
+    with _SeekLock:
+        os.lseek(fd, offset, os.SEEK_SET)
+        return os.read(fd, size)
+
+
+pwrite = getattr(os, "pwrite", _pwrite)
+pread = getattr(os, "pread", _pread)
+
+
+class RangeSet(object):
+    """
+    Sorted disjoint [start, end) ranges, adjacent ranges being merged
+    """
+
+    def __init__(self):
+        # flat list of bounds : start0, end0, start1, end1...
+        self.bounds = []
+
+    def add(self, start, end):
+        if start >= end:
+            return
+        bounds = self.bounds
+        # ranges overlapping or touching [start, end)
+        lo = bisect_left(bounds, start)
+        hi = bisect_right(bounds, end)
+        merged = []
+        if lo % 2 == 0:
+            merged.append(start)
+        if hi % 2 == 0:
+            merged.append(end)
+        bounds[lo:hi] = merged
+
+    def covered(self):
+        bounds = self.bounds
+        return sum(bounds[i + 1] - bounds[i] for i in range(0, len(bounds), 2))
+
+    def missing(self, size):
+        """
+        (offset, size) of ranges missing in [0, size)
+        """
+        res = []
+        pos = 0
+        bounds = self.bounds
+        for i in range(0, len(bounds), 2):
+            start, end = bounds[i], bounds[i + 1]
+            if start > pos:
+                res.append((pos, start - pos))
+            pos = end
+        if pos < size:
+            res.append((pos, size - pos))
+        return res
+
+
+class BlobUpload(object):
+    """
+    File being uploaded by chunks at any offset, possibly concurrently.
+    File is closed by suspend() when unused, and reopened when used again.
+    """
+
+    # content is never kept in memory
+    resident = 0
+
+    def __init__(self, path, size, digest):
+        self.path = path
+        self.size = size
+        self.digest = digest
+        self.lock = Lock()
+        # file can't be closed while being read or written
+        self.idle = Condition(self.lock)
+        self.users = 0
+        self.received = RangeSet()
+        self.discarded = False
+        flags = os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0)
+        self.fd = os.open(path, flags, 0o600)
+        try:
+            os.posix_fallocate(self.fd, 0, size)
+        except (AttributeError, OSError, ValueError):
+            # not supported by OS or filesystem, file will grow as written
+            os.ftruncate(self.fd, size)
+
+    @contextmanager
+    def _using(self):
+        with self.lock:
+            if self.discarded:
+                raise EOFError("Blob upload was discarded")
+            if self.fd is None:
+                self.fd = os.open(self.path, os.O_RDWR | getattr(os, "O_BINARY", 0))
+            self.users += 1
+        try:
+            yield self.fd
+        finally:
+            with self.lock:
+                self.users -= 1
+                self.idle.notify_all()
+
+    def write(self, offset, data):
+        """
+        Write chunk at given offset
+        """
+        if offset < 0 or offset + len(data) > self.size:
+            raise ValueError("Chunk out of blob bounds")
+        view = memoryview(data)
+        pos = offset
+        with self._using() as fd:
+            while view:
+                written = pwrite(fd, view, pos)
+                view = view[written:]
+                pos += written
+        with self.lock:
+            self.received.add(offset, offset + len(data))
+
+    def missing(self):
+        with self.lock:
+            return self.received.missing(self.size)
+
+    def complete(self):
+        return not self.missing()
+
+    def verify(self):
+        """
+        Check digest of received file. On mismatch, whole file is
+        considered missing again.
+        """
+        digest = hashlib.new(HashName)
+        pos = 0
+        with self._using() as fd:
+            while pos < self.size:
+                block = pread(fd, min(VerifyBlockSize, self.size - pos), pos)
+                if not block:
+                    break
+                digest.update(block)
+                pos += len(block)
+        if digest.digest() == self.digest:
+            return True
+        with self.lock:
+            self.received = RangeSet()
+        return False
+
+    def spill(self):
+        pass
+
+    def suspend(self):
+        """
+        Close file until next use, returns False if it is in use
+        """
+        with self.lock:
+            if self.users > 0:
+                return False
+            if self.fd is not None:
+                os.close(self.fd)
+                self.fd = None
+            return True
+
+    def close(self):
+        with self.lock:
+            self.idle.wait_for(lambda: self.users == 0)
+            if self.fd is not None:
+                os.fsync(self.fd)
+                os.close(self.fd)
+                self.fd = None
+
+    def discard(self):
+        """
+        Close and remove file, once pending writes are done
+        """
+        with self.lock:
+            self.idle.wait_for(lambda: self.users == 0)
+            if self.discarded:
+                return
+            self.discarded = True
+            if self.fd is not None:
+                os.close(self.fd)
+                self.fd = None
+            os.remove(self.path)
@@ -24,11 +24,12 @@
 
 
 import collections
+import json
 import shutil
 
 from formless import annotate, configurable, webform
 from nevow import appserver, loaders, rend, tags, url
-from nevow.static import File
+from nevow.static import Data, File
 from twisted.internet import reactor
 from zope.interface import implementer
 
@@ -231,6 +232,11 @@ class SettingsPage(StyledSettingsPage):
         """
         return ConfigurableSettings
 
+    def child_worker_metrics(self, ctx):
+        """MainWorker calls metrics, as JSON"""
+        metrics = GetPLCObjectSingleton().GetWorkerMetrics()
+        return Data(json.dumps(metrics).encode(), "application/json")
+
     def sendLogMessage(self, level, message, **kwargs):
         level = LogLevelsDict[level]
         GetPLCObjectSingleton().LogMessage(level, "Web form log message: " + message)
@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of Beremiz runtime.
+#
+# See COPYING.Runtime file for copyrights details.
+
+"""
+Mapped segments of a loaded PLC library.
+
+Pages of a freshly loaded library are only read from file when first
+used, and private writable pages are only copied when first written, so
+that first PLC cycles take page faults that steady state cycles don't.
+Segments are found in /proc/self/maps, they can be prefaulted and locked
+in memory once library is loaded, before PLC is started. Anonymous
+mapping guessed to be .bss is only read, never written, as it could
+belong to something else. Without /proc/self/maps, i.e. on Windows, no
+segment is found and this does nothing.
+"""
+
+import ctypes
+import mmap
+import os
+
+PageSize = mmap.PAGESIZE
+
+MADV_WILLNEED = 3
+
+try:
+    _libc = ctypes.CDLL(None, use_errno=True)
+    _madvise = _libc.madvise
+    _madvise.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_int]
+    _mlock = _libc.mlock
+    _mlock.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
+except (AttributeError, OSError, TypeError):
+    _madvise = _mlock = None
+
+
+class Segment(object):
+    """
+    Mapped range of library, with its permissions as in /proc/self/maps
+    """
+
+    def __init__(self, start, end, perms, anonymous=False):
+        self.start = start
+        self.end = end
+        self.perms = perms
+        # not backed by library file
+        self.anonymous = anonymous
+
+    @property
+    def size(self):
+        return self.end - self.start
+
+    @property
+    def readable(self):
+        return self.perms[0] == "r"
+
+    @property
+    def writable(self):
+        return self.perms[1] == "w" and self.perms[3] == "p"
+
+
+def LibrarySegments(path):
+    """
+    Segments mapping given library file, including anonymous mapping
+    following its last writable segment, i.e. its .bss
+    """
+    try:
+        maps = open("/proc/self/maps", "r").readlines()
+    except OSError:
+        return []
+    try:
+        st = os.stat(path)
+    except OSError:
+        return []
+    realpath = os.path.realpath(path)
+    segments = []
+    last = None
+    for line in maps:
+        fields = line.split(None, 5)
+        if len(fields) < 5:
+            continue
+        bounds, perms, _offset, dev, inode = fields[:5]
+        start, end = [int(bound, 16) for bound in bounds.split("-")]
+        major, minor = [int(number, 16) for number in dev.split(":")]
+        mapped = len(fields) == 6 and fields[5].strip()
+        segment = Segment(start, end, perms, not mapped)
+        # device differs from stat one on overlay filesystems
+        if int(inode) == st.st_ino and (
+            os.makedev(major, minor) == st.st_dev or mapped == realpath
+        ):
+            segments.append(segment)
+            last = segment
+        elif (
+            not mapped
+            and last is not None
+            and last.end == start
+            and last.writable
+            and segment.writable
+        ):
+            # .bss, mappings beyond may be used by anything else
+            segments.append(segment)
+            last = None
+        else:
+            last = None
+    return segments
+
+
+def PrefaultSegments(segments):
+    """
+    Read every page of readable segments and write back every page of
+    private writable ones backed by library file, so that they are
+    present and copied already. Library must not be running yet.
+    Returns count of pages touched.
+    """
+    pages = 0
+    for segment in segments:
+        if not segment.readable:
+            continue
+        if _madvise is not None:
+            _madvise(segment.start, segment.size, MADV_WILLNEED)
+        memory = (ctypes.c_char * segment.size).from_address(segment.start)
+        if segment.writable and not segment.anonymous:
+            for offset in range(0, segment.size, PageSize):
+                memory[offset] = memory[offset]
+        else:
+            # reads one byte per page
+            memory[::PageSize]
+        pages += (segment.size + PageSize - 1) // PageSize
+    return pages
+
+
+def LockSegments(segments):
+    """
+    Lock segments in memory, they are unlocked when library is unloaded.
+    Returns error message, None if all segments are locked.
+    """
+    if _mlock is None:
+        return "mlock is not available"
+    for segment in segments:
+        if _mlock(segment.start, segment.size) != 0:
+            errno = ctypes.get_errno()
+            return "mlock failed : " + os.strerror(errno)
+    return None
@@ -23,23 +23,50 @@
 
 
 import ctypes
-import hashlib
 import os
 import platform as platform_module
 import shutil
 import sys
 import traceback
+from collections import namedtuple
 from functools import partial, wraps
-from tempfile import mkstemp
+from struct import error as StructError
 from threading import Condition, Event, Lock, Thread
-from time import time
+from time import monotonic, perf_counter, time
 
 import _ctypes
 
 from beremiz_runtime.i18n import _
 from beremiz_runtime.runtime import MainWorker, PlcStatus, default_evaluator
+from beremiz_runtime.runtime.BlobDelta import DeltaDecoder
+from beremiz_runtime.runtime.BlobManager import BlobManager
+from beremiz_runtime.runtime.BlobStore import BlobStore, HashSize
+from beremiz_runtime.runtime.BlobStream import (
+    BlobStream,
+    ChainedDecoder,
+    GetBlobDecoder,
+)
+from beremiz_runtime.runtime.BlobUpload import BlobUpload
 from beremiz_runtime.runtime.loglevels import LogLevelsCount, LogLevelsDefault
+from beremiz_runtime.runtime.PLCLibrary import (
+    LibrarySegments,
+    LockSegments,
+    PrefaultSegments,
+)
+from beremiz_runtime.runtime.PLCVersions import PLCVersionCache
 from beremiz_runtime.runtime.Stunnel import getPSKID
+from beremiz_runtime.runtime.TickClock import TickClock
+from beremiz_runtime.runtime.TraceDecimator import TraceDecimator, WindowTicks
+from beremiz_runtime.runtime.TraceExport import ExportRecordedTraces
+from beremiz_runtime.runtime.TraceRecorder import TraceRecorder
+from beremiz_runtime.runtime.TraceSessions import TraceSessionMux
+from beremiz_runtime.runtime.TraceStore import (
+    DefaultTraceBudget,
+    TraceAcquisitionStats,
+    TraceRingBuffer,
+)
+from beremiz_runtime.runtime.typemapping import GetTraceDecoder, PackForces
+from beremiz_runtime.runtime.WorkerMetrics import WorkerMetrics
 
 if os.name in ("nt", "ce"):
     dlopen = _ctypes.LoadLibrary
@@ -67,15 +94,86 @@ def PLCprint(message):
         sys.stdout.flush()
 
 
+def _ForcePointer(force):
+    """
+    RegisterDebugVariable argument for any bytes-like force value,
+    without copy if writable, i.e. a view on a buffer from PackForces
+    """
+    if force is None or isinstance(force, bytes):
+        return force
+    try:
+        return ctypes.addressof(ctypes.c_char.from_buffer(force))
+    except TypeError:
+        return bytes(force)
+
+
+# Immutable PLC status, published anew each time status, log counts or
+# PLC md5 change, with an increasing version
+PLCStatusSnapshot = namedtuple(
+    "PLCStatusSnapshot", ["version", "status", "logcounts", "md5"]
+)
+
+
 def RunInMain(func):
     @wraps(func)
     def func_wrapper(*args, **kwargs):
         return MainWorker.call(func, *args, **kwargs)
 
+    # lets AsyncPLCObject submit func without blocking
+    func_wrapper._run_in_main = func
     return func_wrapper
 
 
 class PLCObject(object):
+    # Bytes kept for trace samples not yet polled, can be customized
+    TraceBudget = DefaultTraceBudget
+    # Seconds trace thread keeps running without traces being consumed
+    TraceKeepAlive = 3
+    # Trace thread hands PLC debug data out by batches lasting about
+    # TraceBatchPeriod seconds, of at most TraceMaxBatch samples. PLC
+    # library lock is released in between samples of a batch
+    TraceBatchPeriod = 0.01
+    TraceMaxBatch = 64
+    TraceBatchBudget = 256 * 1024
+    # Bytes kept per trace session, and seconds after which a session
+    # that isn't polled anymore is closed
+    TraceSessionBudget = 256 * 1024
+    TraceSessionTimeout = 60
+    # Longest wait of StreamTraceVariables, a pending call blocks eRPC
+    # server
+    StreamMaxDelayMs = 2000
+    # Most samples returned by one GetRecordedTraces call
+    RecordedTracesMaxSamples = 10000
+    # Seconds after which log counts of status snapshot are read again,
+    # they can change as PLC logs messages
+    StatusRefreshPeriod = 0.1
+    # Bytes of text above which GetLogMessages returns no more messages,
+    # bounds size of reply
+    LogMessagesBudget = 64 * 1024
+    # Incomplete uploaded blobs not touched for BlobTTL seconds are
+    # discarded, complete ones are kept until NewPLC or PurgeBlobs.
+    # Blobs up to BlobMemorySize bytes are kept in memory, they are
+    # written to flash only when installed. Least recently touched blobs
+    # are written to file beyond BlobMaxMemory bytes in memory, and
+    # closed beyond BlobMaxFiles open files
+    BlobTTL = 600
+    BlobMaxMemory = 16 * 1024 * 1024
+    BlobMaxFiles = 16
+    BlobMemorySize = 256 * 1024
+    # Seconds PLC is expected to be down when NewPLC swaps PLCs, a
+    # warning is logged beyond
+    SwapWindowBudget = 0.5
+    # Installed PLC versions kept so that they can be installed again
+    # without transfer, least recently used ones being forgotten beyond
+    # count or total size of their files
+    PLCVersionsCount = 8
+    PLCVersionsMaxBytes = 256 * 1024 * 1024
+    # Pages of PLC library are faulted in when loaded, and locked in
+    # memory if MlockPLCLibrary, so that first PLC cycles don't take page
+    # faults. Locking needs CAP_IPC_LOCK or a large enough RLIMIT_MEMLOCK
+    PrefaultPLCLibrary = True
+    MlockPLCLibrary = False
+
     def __init__(self, WorkingDir, statuschange, evaluator, pyruntimevars):
         self.workingdir = WorkingDir  # must exits already
         self.tmpdir = os.path.join(WorkingDir, "tmp")
@@ -86,23 +184,61 @@ class PLCObject(object):
         self.statuschange = statuschange
         self.evaluator = evaluator
         self.pyruntimevars = pyruntimevars
-        self.PLCStatus = PlcStatus.Empty
         self.PLClibraryHandle = None
         self.PLClibraryLock = Lock()
         # Creates fake C funcs proxies
         self._InitPLCStubCalls()
         self._loading_error = None
+        self.CurrentPLCFilename = None
+        self.InstallReport = {}
+        self.LoadReport = {}
+        self.StatusLock = Lock()
+        self.StatusSnapshot = None
+        self.StatusRefreshed = 0
+        self.PLCStatus = PlcStatus.Empty
         self.python_runtime_vars = None
         self.TraceThread = None
         self.TraceLock = Lock()
-        self.Traces = []
+        self.TraceCond = Condition(self.TraceLock)
+        self.TraceWaiters = 0
+        self.Traces = TraceRingBuffer(self.TraceBudget)
         self.DebugToken = 0
+        # (idx, force) and IEC types of variables registered in debugger
+        self.TraceOrders = []
+        self.TraceIECTypes = None
+        self.TraceDecoder = None
+        self.TraceDecimator = None
+        self.TraceRecorder = TraceRecorder(os.path.join(WorkingDir, "traces"))
+        self.TraceRecording = False
+        self.TraceStats = TraceAcquisitionStats(
+            self.TraceBatchPeriod, self.TraceMaxBatch
+        )
+        self.TraceDropped = 0
+        self.TraceSessions = TraceSessionMux(self.TraceSessionBudget)
+        self.TraceClock = TickClock()
+        # latencies of jobs done by MainWorker, i.e. RunInMain methods
+        self.WorkerMetrics = WorkerMetrics()
+        MainWorker.observer = self.WorkerMetrics.observe
 
         # Event to signal when PLC is stopped.
         self.PlcStopped = Event()
         self.PlcStopped.set()
 
+        self.BlobStore = BlobStore(os.path.join(WorkingDir, "blobs"))
+        self.blobs = BlobManager(self.BlobTTL, self.BlobMaxFiles, self.BlobMaxMemory)
+        # offset addressed uploads, by digest, kept through PurgeBlobs so
+        # that they can be resumed
+        self.BlobUploads = BlobManager(
+            self.BlobTTL, self.BlobMaxFiles, self.BlobMaxMemory
+        )
+        self.BlobUploadsLock = Lock()
         self._init_blobs()
+        self.PLCVersions = PLCVersionCache(
+            os.path.join(WorkingDir, "versions"),
+            self.BlobStore,
+            self.PLCVersionsCount,
+            self.PLCVersionsMaxBytes,
+        )
 
     # First task of worker -> no @RunInMain
     def AutoLoad(self, autostart):
@@ -124,6 +260,70 @@ class PLCObject(object):
 
         self.StatusChange()
 
+    @property
+    def PLCStatus(self):
+        return self._PLCStatus
+
+    @PLCStatus.setter
+    def PLCStatus(self, status):
+        self._PLCStatus = status
+        self._RefreshStatus()
+
+    def _ReadLogCounts(self):
+        return tuple(map(self.GetLogCount, range(LogLevelsCount)))
+
+    def _PublishStatus(self, logcounts=None):
+        """
+        Publish a new status snapshot if something changed.
+        Former log counts are kept if none are given.
+        """
+        with self.StatusLock:
+            previous = self.StatusSnapshot
+            if logcounts is None:
+                logcounts = (
+                    previous.logcounts
+                    if previous is not None
+                    else (0,) * LogLevelsCount
+                )
+            else:
+                self.StatusRefreshed = monotonic()
+            status = self._PLCStatus
+            md5 = None
+            if status != PlcStatus.Empty and self.CurrentPLCFilename is not None:
+                md5 = os.path.splitext(self.CurrentPLCFilename)[0]
+            if previous is not None and previous[1:] == (status, logcounts, md5):
+                return previous
+            self.StatusSnapshot = PLCStatusSnapshot(
+                0 if previous is None else previous.version + 1,
+                status,
+                logcounts,
+                md5,
+            )
+            return self.StatusSnapshot
+
+    def _RefreshStatus(self):
+        """
+        Publish status snapshot, reading log counts again unless PLC
+        library is in use, i.e. being loaded
+        """
+        logcounts = None
+        if self.PLClibraryLock.acquire(False):
+            try:
+                logcounts = self._ReadLogCounts()
+            finally:
+                self.PLClibraryLock.release()
+        return self._PublishStatus(logcounts)
+
+    def GetStatusSnapshot(self):
+        """
+        Current PLCStatusSnapshot. Doesn't go through MainWorker, can be
+        called from any thread.
+        """
+        snapshot = self.StatusSnapshot
+        if monotonic() - self.StatusRefreshed > self.StatusRefreshPeriod:
+            snapshot = self._RefreshStatus()
+        return snapshot
+
     def StatusChange(self):
         if self.statuschange is not None:
             for callee in self.statuschange:
@@ -138,13 +338,16 @@ class PLCObject(object):
         PLCprint(msg)
         if self._LogMessage is not None:
             bmsg = msg.encode()
-            return self._LogMessage(level, bmsg, len(bmsg))
+            res = self._LogMessage(level, bmsg, len(bmsg))
+            self._RefreshStatus()
+            return res
         return None
 
     @RunInMain
     def ResetLogCount(self):
         if self._ResetLogCount is not None:
             self._ResetLogCount()
+            self._RefreshStatus()
 
     # used internaly
     def GetLogCount(self, level):
@@ -154,48 +357,107 @@ class PLCObject(object):
             return 1
         return 0
 
+    def _ReadLogMessage(self, level, msgid, tick, tv_sec, tv_nsec):
+        maxsz = len(self._log_read_buffer) - 1
+        sz = self._GetLogMessage(
+            level,
+            msgid,
+            self._log_read_buffer,
+            maxsz,
+            ctypes.byref(tick),
+            ctypes.byref(tv_sec),
+            ctypes.byref(tv_nsec),
+        )
+        if sz and sz <= maxsz:
+            self.TraceClock.add_realtime(
+                tick.value, tv_sec.value + tv_nsec.value * 1e-9
+            )
+            return (
+                self._log_read_buffer[:sz].decode(),
+                tick.value,
+                tv_sec.value,
+                tv_nsec.value,
+            )
+        return None
+
     @RunInMain
     def GetLogMessage(self, level, msgid):
         tick = ctypes.c_uint32()
         tv_sec = ctypes.c_uint32()
         tv_nsec = ctypes.c_uint32()
         if self._GetLogMessage is not None:
-            maxsz = len(self._log_read_buffer) - 1
-            sz = self._GetLogMessage(
-                level,
-                msgid,
-                self._log_read_buffer,
-                maxsz,
-                ctypes.byref(tick),
-                ctypes.byref(tv_sec),
-                ctypes.byref(tv_nsec),
-            )
-            if sz and sz <= maxsz:
-                return (
-                    self._log_read_buffer[:sz].decode(),
-                    tick.value,
-                    tv_sec.value,
-                    tv_nsec.value,
-                )
+            return self._ReadLogMessage(level, msgid, tick, tv_sec, tv_nsec)
         elif self._loading_error is not None and level == 0:
             return self._loading_error, 0, 0, 0
         return None
 
+    @RunInMain
+    def GetLogMessages(self, level, fromID, maxCount):
+        """
+        Up to maxCount messages of given level, from fromID on, read at
+        once through log read buffer. Fewer are returned if there are no
+        more messages or if LogMessagesBudget bytes of text are reached.
+        Returns list of (msg, tick, sec, nsec), ith being message fromID + i
+        """
+        if self._GetLogMessage is None:
+            if self._loading_error is not None and level == 0 and fromID == 0:
+                return [(self._loading_error, 0, 0, 0)]
+            return []
+        tick = ctypes.c_uint32()
+        tv_sec = ctypes.c_uint32()
+        tv_nsec = ctypes.c_uint32()
+        messages = []
+        size = 0
+        for msgid in range(fromID, fromID + maxCount):
+            message = self._ReadLogMessage(level, msgid, tick, tv_sec, tv_nsec)
+            if message is None:
+                break
+            size += len(message[0])
+            if messages and size > self.LogMessagesBudget:
+                break
+            messages.append(message)
+        return messages
+
     def _GetMD5FileName(self):
         return os.path.join(self.workingdir, "lasttransferedPLC.md5")
 
     def _GetLibFileName(self):
         return os.path.join(self.workingdir, self.CurrentPLCFilename)
 
-    def _LoadPLC(self):
+    def _OpenPLCLibrary(self, path):
+        """
+        dlopen PLC library, then prefault and lock its pages as
+        configured. Durations of these phases are kept in LoadReport.
         """
-        Load PLC library
+        report = self.LoadReport = {}
+        t = perf_counter()
+        handle = dlopen(path)
+        report["dlopen"], t = perf_counter() - t, perf_counter()
+        try:
+            segments = LibrarySegments(path)
+            if self.PrefaultPLCLibrary:
+                report["pages"] = PrefaultSegments(segments)
+                report["prefault"], t = perf_counter() - t, perf_counter()
+            if self.MlockPLCLibrary:
+                report["mlock_error"] = LockSegments(segments)
+                report["mlock"] = perf_counter() - t
+        except Exception:
+            dlclose(handle)
+            raise
+        return handle
+
+    def _LoadPLC(self, handle=None):
+        """
+        Load PLC library, unless already loaded with given handle
         Declare all functions, arguments and return values
         """
         md5 = open(self._GetMD5FileName(), "r").read()
         self.PLClibraryLock.acquire()
         try:
-            self._PLClibraryHandle = dlopen(self._GetLibFileName())
+            if handle is None:
+                handle = self._OpenPLCLibrary(self._GetLibFileName())
+            t = perf_counter()
+            self._PLClibraryHandle = handle
             self.PLClibraryHandle = ctypes.CDLL(
                 self.CurrentPLCFilename, handle=self._PLClibraryHandle
             )
@@ -297,6 +559,7 @@ class PLCObject(object):
                 ctypes.POINTER(ctypes.c_uint32),
             ]
 
+            self.LoadReport["bind"] = perf_counter() - t
             self._loading_error = None
 
         except Exception:
@@ -309,11 +572,19 @@ class PLCObject(object):
         return True
 
     @RunInMain
-    def LoadPLC(self):
-        res = self._LoadPLC()
+    def LoadPLC(self, handle=None, compiled=None):
+        res = self._LoadPLC(handle)
         if res:
+            if self.LoadReport.get("mlock_error"):
+                self.LogMessage(
+                    1,
+                    _("Couldn't lock PLC library in memory : ")
+                    + self.LoadReport["mlock_error"],
+                )
             try:
-                self.PythonRuntimeInit()
+                t = perf_counter()
+                self.PythonRuntimeInit(compiled)
+                self.LoadReport["runtime"] = perf_counter() - t
             except Exception:
                 self._loading_error = traceback.format_exc()
                 PLCprint(self._loading_error)
@@ -384,7 +655,11 @@ class PLCObject(object):
                 self.LogMessage(0, "\n".join(traceback.format_exception(*exp)))
 
     # used internaly
-    def PythonRuntimeInit(self):
+    def PythonRuntimeInit(self, compiled=None):
+        """
+        Run RUNTIME*.py files of working directory. Code of files given in
+        compiled dict, by file name, is not compiled again.
+        """
         MethodNames = ["init", "start", "stop", "cleanup"]
         self.python_runtime_vars = globals().copy()
         self.python_runtime_vars.update(self.pyruntimevars)
@@ -447,14 +722,10 @@ class PLCObject(object):
             for filename in filenames:
                 name, ext = os.path.splitext(filename)
                 if name.upper().startswith("RUNTIME") and ext.upper() == ".PY":
-                    exec(
-                        compile(
-                            open(os.path.join(self.workingdir, filename), "rb").read(),
-                            os.path.join(self.workingdir, filename),
-                            "exec",
-                        ),
-                        self.python_runtime_vars,
-                    )
+                    code = (compiled or {}).get(filename)
+                    if code is None:
+                        code = self._CompileRuntimeFile(self.workingdir, filename)
+                    exec(code, self.python_runtime_vars)
                     for methodname in MethodNames:
                         method = self.python_runtime_vars.get(
                             "_%s_%s" % (name, methodname), None
@@ -477,6 +748,14 @@ class PLCObject(object):
         self.PythonThread = Thread(target=self.PythonThreadProc, name="PLCPythonThread")
         self.PythonThread.start()
 
+    def _CompileRuntimeFile(self, directory, filename):
+        # code is named after its installed path, for tracebacks
+        return compile(
+            open(os.path.join(directory, filename), "rb").read(),
+            os.path.join(self.workingdir, filename),
+            "exec",
+        )
+
     # used internaly
     def PythonRuntimeCleanup(self):
         if self.python_runtime_vars is not None:
@@ -614,6 +893,7 @@ class PLCObject(object):
         if self.CurrentPLCFilename is not None and self.PLCStatus == PlcStatus.Stopped:
             self.PythonThreadCommand("PreStart")
             c_argv = ctypes.c_char_p * len(self.argv)
+            self.TraceClock.reset()
             res = self._startPLC(len(self.argv), c_argv(*self.argv))
             if res == 0:
                 self.LogMessage("PLC started")
@@ -643,69 +923,177 @@ class PLCObject(object):
         return self.PLCStatus == PlcStatus.Stopped
 
     def GetPLCstatus(self):
-        try:
-            return self._GetPLCstatus()
-        except EOFError:
+        """
+        Status and log counts from status snapshot, without waiting for
+        MainWorker
+        """
+        if not MainWorker.enabled:
             return (PlcStatus.Disconnected, [0] * LogLevelsCount)
-
-    @RunInMain
-    def _GetPLCstatus(self):
-        return self.PLCStatus, list(map(self.GetLogCount, range(LogLevelsCount)))
+        snapshot = self.GetStatusSnapshot()
+        return snapshot.status, list(snapshot.logcounts)
 
     @RunInMain
     def GetPLCID(self):
         return getPSKID(partial(self.LogMessage, 0))
 
     def _init_blobs(self):
-        self.blobs = {}
         if os.path.exists(self.tmpdir):
             shutil.rmtree(self.tmpdir)
         os.mkdir(self.tmpdir)
 
     @RunInMain
     def SeedBlob(self, seed):
-        blob = mkstemp(dir=self.tmpdir) + (hashlib.new("md5"),)
-        _fd, _path, md5sum = blob
-        md5sum.update(seed)
-        newBlobID = md5sum.digest()
-        self.blobs[newBlobID] = blob
+        return self._SeedBlob(self._BlobStream(seed))
+
+    @RunInMain
+    def SeedCompressedBlob(self, seed, compression):
+        """
+        Same as SeedBlob, for chunks being parts of a compressed stream
+        ("zlib" or "zstd"). They are decompressed as they are appended, and
+        blob ID is computed on decompressed content, as for SeedBlob.
+        """
+        decoder = GetBlobDecoder(compression)
+        return self._SeedBlob(self._BlobStream(seed, decoder))
+
+    @RunInMain
+    def SeedDeltaBlob(self, seed, baseMD5, compression, digest):
+        """
+        Same as SeedBlob, for chunks being a delta (see BlobDelta) against
+        currently installed PLC shared object, identified by its baseMD5,
+        possibly compressed. New file is rebuilt as chunks are appended,
+        and its content is checked against given SHA-256 digest.
+        Client should check with MatchMD5 that baseMD5 is installed.
+        """
+        if self.CurrentPLCFilename is None or not self.MatchMD5(baseMD5):
+            raise ValueError("Delta base is not installed PLC")
+        decoder = DeltaDecoder(self._GetLibFileName())
+        compressed = GetBlobDecoder(compression)
+        if compressed is not None:
+            decoder = ChainedDecoder(compressed, decoder)
+        return self._SeedBlob(self._BlobStream(seed, decoder, digest or None))
+
+    def _BlobStream(self, seed, decoder=None, expected=None):
+        return BlobStream(self.tmpdir, seed, decoder, expected, self.BlobMemorySize)
+
+    def _SeedBlob(self, blob):
+        newBlobID = blob.blobID()
+        self.blobs.put(newBlobID, blob)
         return newBlobID
 
     @RunInMain
     def AppendChunkToBlob(self, data, blobID):
-        blob = self.blobs.pop(blobID, None)
+        blob = self.blobs.pop(blobID)
 
         if blob is None:
             return None
 
-        fd, _path, md5sum = blob
-        md5sum.update(data)
-        newBlobID = md5sum.digest()
-        os.write(fd, data)
-        self.blobs[newBlobID] = blob
+        try:
+            newBlobID = blob.append(data)
+        except Exception:
+            # i.e. corrupted compressed stream, blob is dropped
+            blob.discard()
+            raise
+        self.blobs.put(newBlobID, blob)
         return newBlobID
 
     @RunInMain
     def PurgeBlobs(self):
-        for fd, _path, _md5sum in list(self.blobs.values()):
-            os.close(fd)
+        self.blobs.clear()
         self._init_blobs()
 
-    def BlobAsFile(self, blobID, newpath):
-        blob = self.blobs.pop(blobID, None)
+    @RunInMain
+    def HaveBlobs(self, digests):
+        """
+        Returns which of given SHA-256 digests of files are missing in
+        blob store. Stored ones don't need to be uploaded, their digest
+        can be given as blob ID to NewPLC.
+        """
+        return self.BlobStore.missing(digests)
+
+    def OpenBlobUpload(self, digest, size):
+        """
+        Start or resume upload of a file of given SHA-256 digest and size.
+        Returns (offset, size) ranges still to be written with
+        WriteBlobChunk, in any order, empty if all are received or if file
+        is stored already. Doesn't go through MainWorker.
+        """
+        if len(digest) != HashSize:
+            raise ValueError("Invalid blob digest")
+        if self.BlobStore.has(digest):
+            return []
+        with self.BlobUploadsLock:
+            upload = self.BlobUploads.get(digest)
+            if upload is not None and upload.size != size:
+                self.BlobUploads.discard(digest)
+                upload = None
+            if upload is None:
+                upload = BlobUpload(self.BlobStore.upload_path(digest), size, digest)
+                self.BlobUploads.put(digest, upload)
+        return upload.missing()
+
+    def WriteBlobChunk(self, digest, offset, data):
+        """
+        Write a chunk of an opened upload at given offset. Chunks of
+        same upload can be written concurrently. Returns 0, or -1 if
+        upload isn't opened or was discarded, -2 if chunk is out of file
+        bounds.
+        """
+        upload = self.BlobUploads.get(digest)
+        if upload is None:
+            return -1
+        try:
+            upload.write(offset, data)
+        except EOFError:
+            return -1
+        except ValueError:
+            return -2
+        return 0
+
+    def FinishBlobUpload(self, digest):
+        """
+        Verify digest of completely received upload and move it to blob
+        store, where NewPLC can find it. Returns False if upload isn't
+        complete, or if digest doesn't match, all ranges being missing
+        again in that case.
+        """
+        if self.BlobStore.has(digest):
+            return True
+        with self.BlobUploadsLock:
+            upload = self.BlobUploads.get(digest)
+            if upload is None or not upload.complete() or not upload.verify():
+                return False
+            self.BlobUploads.pop(digest)
+        upload.close()
+        self.BlobStore.add(upload.path, digest)
+        return True
+
+    def CancelBlobUpload(self, digest):
+        with self.BlobUploadsLock:
+            self.BlobUploads.discard(digest)
+
+    def BlobAsFile(self, blobID, newpath, link=False):
+        """
+        Install blob or stored file as newpath, returns its digest.
+        File is a read-only hard link to store if link is True, a
+        writable file otherwise.
+        """
+        if len(blobID) == HashSize and self.BlobStore.has(blobID):
+            self.BlobStore.install(blobID, newpath, link)
+            return blobID
+
+        blob = self.blobs.pop(blobID)
 
         if blob is None:
             raise Exception(_(f"Missing data to create file: {newpath}").decode())
 
-        self._BlobAsFile(blob, newpath)
+        return self._BlobAsFile(blob, newpath, link)
 
-    def _BlobAsFile(self, blob, newpath):
-        fd, path, _md5sum = blob
-        fobj = os.fdopen(fd)
-        fobj.flush()
-        os.fsync(fd)
-        fobj.close()
-        shutil.move(path, newpath)
+    def _BlobAsFile(self, blob, newpath, link=False):
+        digest = blob.finish()
+        # kept in store so that next NewPLC doesn't need it uploaded again
+        self.BlobStore.add(blob.path, digest)
+        self.BlobStore.install(digest, newpath, link)
+        return digest
 
     def _extra_files_log_path(self):
         return os.path.join(self.workingdir, "extra_files.txt")
@@ -744,82 +1132,252 @@ class PLCObject(object):
 
         # TODO: PLCObject restart
 
-    @RunInMain
-    def NewPLC(self, md5sum, plc_object, extrafiles):
-        if self.PLCStatus in [PlcStatus.Stopped, PlcStatus.Empty, PlcStatus.Broken]:
-            NewFileName = md5sum + lib_ext
-            extra_files_log = self._extra_files_log_path()
+    def _StagingDir(self):
+        return os.path.join(self.workingdir, "staging")
+
+    def _StagePLC(self, md5sum, plc_object, extrafiles):
+        """
+        Write new PLC files in staging directory, current PLC being kept
+        as is, possibly running.
+        Returns digests of library and of extra files by name
+        """
+        staging = self._StagingDir()
+        if os.path.exists(staging):
+            shutil.rmtree(staging)
+        os.mkdir(staging)
+
+        # Create new PLC file
+        # library is only read, it can share store file
+        library = self.BlobAsFile(
+            plc_object, os.path.join(staging, md5sum + lib_ext), link=True
+        )
+
+        # Then write the files
+        digests = []
+        with open(os.path.join(staging, "extra_files.txt"), "w") as log:
+            for fname, blobID in extrafiles:
+                digest = self.BlobAsFile(blobID, os.path.join(staging, fname))
+                digests.append((fname, digest))
+                log.write(fname + "\n")
+
+        # Store new PLC filename based on md5 key
+        with open(os.path.join(staging, "lasttransferedPLC.md5"), "w") as f:
+            f.write(md5sum)
+            f.flush()
+            os.fsync(f.fileno())
 
-            new_PLC_filename = os.path.join(self.workingdir, NewFileName)
+        return library, digests
 
+    def _PreloadPLC(self, NewFileName):
+        """
+        Load staged PLC library and compile staged runtime python files,
+        so that this isn't done while no PLC is running.
+        Returns library handle, None if it can't be loaded beside current
+        one, and compiled code by file name
+        """
+        staging = self._StagingDir()
+        path = os.path.join(staging, NewFileName)
+        handle = None
+        if self.CurrentPLCFilename is None or not (
+            os.path.exists(self._GetLibFileName())
+            and os.path.samefile(path, self._GetLibFileName())
+        ):
+            # same file would be loaded once, sharing current PLC state
+            handle = self._OpenPLCLibrary(path)
+        compiled = {}
+        try:
+            for filename in sorted(os.listdir(staging)):
+                name, ext = os.path.splitext(filename)
+                if name.upper().startswith("RUNTIME") and ext.upper() == ".PY":
+                    compiled[filename] = self._CompileRuntimeFile(staging, filename)
+        except Exception:
+            if handle is not None:
+                dlclose(handle)
+            raise
+        return handle, compiled
+
+    def _SwapPLC(self, NewFileName, handle, compiled, report):
+        """
+        Replace current PLC with staged one : stop, swap files, load and
+        start again if it was running. If swap fails once current PLC is
+        unloaded, PLC is Broken.
+        """
+        started = self.PLCStatus == PlcStatus.Started
+        t = perf_counter()
+        if started and not self.StopPLC():
+            if handle is not None:
+                dlclose(handle)
+            return False
+        report["stop"], t = perf_counter() - t, perf_counter()
+
+        try:
             self.UnLoadPLC()
+            report["unload"], t = perf_counter() - t, perf_counter()
 
             self.PurgePLC()
+            staging = self._StagingDir()
+            # md5 file last, it tells which PLC is installed
+            md5file = os.path.basename(self._GetMD5FileName())
+            filenames = [f for f in os.listdir(staging) if f != md5file] + [md5file]
+            for filename in filenames:
+                os.replace(
+                    os.path.join(staging, filename),
+                    os.path.join(self.workingdir, filename),
+                )
+            self.CurrentPLCFilename = NewFileName
+            report["swap"], t = perf_counter() - t, perf_counter()
+
+            # LoadPLC takes over handle, even if it fails
+            preloaded, handle = handle, None
+            loaded = self.LoadPLC(preloaded, compiled)
+        except Exception:
+            if handle is not None:
+                dlclose(handle)
+            self.PLCStatus = PlcStatus.Broken
+            self.StatusChange()
+            self.LogMessage(
+                0, _("Problem installing new PLC :\n") + traceback.format_exc()
+            )
+            return False
 
-            self.LogMessage("NewPLC (%s)" % md5sum)
+        if not loaded:
+            self._fail(_("Problem installing new PLC : can't load PLC"))
+            return False
+        self.PLCStatus = PlcStatus.Stopped
+        self.StatusChange()
+        report["load"], t = perf_counter() - t, perf_counter()
 
-            try:
-                # Create new PLC file
-                self.BlobAsFile(plc_object, new_PLC_filename)
-
-                # Then write the files
-                log = open(extra_files_log, "w")
-                for fname, blobID in extrafiles:
-                    fpath = os.path.join(self.workingdir, fname)
-                    self.BlobAsFile(blobID, fpath)
-                    log.write(fname + "\n")
-
-                # Store new PLC filename based on md5 key
-                with open(self._GetMD5FileName(), "w") as f:
-                    f.write(md5sum)
-                    f.flush()
-                    os.fsync(f.fileno())
-
-                # Store new PLC filename
-                self.CurrentPLCFilename = NewFileName
-            except Exception:
-                self.PLCStatus = PlcStatus.Broken
-                self.StatusChange()
-                PLCprint(traceback.format_exc())
+        if started:
+            self.StartPLC()
+        report["start"] = perf_counter() - t
+        return True
+
+    @RunInMain
+    def NewPLC(self, md5sum, plc_object, extrafiles):
+        """
+        Install new PLC. Files are staged and new PLC is loaded while
+        current one keeps running, it is then stopped, replaced and new
+        one is started if current one was running, in a short window.
+
+        If plc_object is empty, PLC version md5sum is installed from
+        versions cache without any transfer, see QueryMD5.
+        """
+        if self.PLCStatus not in [
+            PlcStatus.Started,
+            PlcStatus.Stopped,
+            PlcStatus.Empty,
+            PlcStatus.Broken,
+        ]:
+            return False
+
+        NewFileName = md5sum + lib_ext
+        self.LogMessage("NewPLC (%s)" % md5sum)
+        report = {"md5": md5sum, "preloaded": False, "cached": not plc_object}
+        self.InstallReport = report
+
+        if not plc_object:
+            version = self.PLCVersions.get(md5sum)
+            if version is None:
+                self.LogMessage(
+                    0, _("Problem installing new PLC : version isn't cached")
+                )
                 return False
+            plc_object, extrafiles = version
 
-            if self.LoadPLC():
-                self.PLCStatus = PlcStatus.Stopped
-                self.StatusChange()
-            else:
-                self._fail(_("Problem installing new PLC : can't load PLC"))
+        t = perf_counter()
+        try:
+            library, digests = self._StagePLC(md5sum, plc_object, extrafiles)
+            report["stage"], t = perf_counter() - t, perf_counter()
+            handle, compiled = self._PreloadPLC(NewFileName)
+            report["preload"] = perf_counter() - t
+            report["preloaded"] = handle is not None
+        except Exception:
+            # current PLC is left untouched
+            shutil.rmtree(self._StagingDir(), ignore_errors=True)
+            self.LogMessage(
+                0, _("Problem installing new PLC :\n") + traceback.format_exc()
+            )
+            return False
 
-            return self.PLCStatus == PlcStatus.Stopped
-        return False
+        t = perf_counter()
+        res = self._SwapPLC(NewFileName, handle, compiled, report)
+        report["window"] = window = perf_counter() - t
+        report["library"] = self.LoadReport
+        if res:
+            self.LogMessage(
+                1 if window > self.SwapWindowBudget else LogLevelsDefault,
+                _("New PLC swapped in %.1f ms") % (window * 1000),
+            )
+            try:
+                self.PLCVersions.add(md5sum, library, digests)
+            except Exception:
+                self.LogMessage(
+                    1, _("Couldn't cache PLC version :\n") + traceback.format_exc()
+                )
+        return res and self.PLCStatus in [PlcStatus.Started, PlcStatus.Stopped]
 
-    def MatchMD5(self, MD5):
+    def GetInstallReport(self):
+        """
+        Durations of last NewPLC steps in seconds : stage, preload and
+        swap window including stop, unload, swap, load and start.
+        Library gives durations of PLC library load phases : dlopen,
+        prefault, mlock, bind of functions and runtime python init
+        """
+        return self.InstallReport
+
+    def _InstalledMD5(self):
         try:
-            last_md5 = open(self._GetMD5FileName(), "r").read()
-            return last_md5 == MD5
+            return open(self._GetMD5FileName(), "r").read()
         except Exception:
-            pass
-        return False
+            return None
+
+    def MatchMD5(self, MD5):
+        return self._InstalledMD5() == MD5
+
+    def QueryMD5(self, MD5):
+        """
+        PLCVersionInstalled if MD5 is installed PLC, PLCVersionCached if it
+        can be installed by NewPLC without transfer, i.e. with empty
+        plc_object, PLCVersionUnknown otherwise
+        """
+        return self.PLCVersions.state(MD5, self._InstalledMD5())
 
     @RunInMain
-    def SetTraceVariablesList(self, idxs):
+    def SetTraceVariablesList(self, idxs, iectypes=None):
         """
         Call ctype imported function to append
-        these indexes to registred variables in PLC debugger
+        these indexes to registred variables in PLC debugger.
+        Optional iectypes gives IEC types of these variables, used to
+        compile self.TraceDecoder once for this DebugToken.
+        Caller takes over whole registration, trace sessions are closed.
         """
+        self.TraceSessions.reset()
+        return self._RegisterTraceVariables(idxs, iectypes)
+
+    def SetTypedTraceVariablesList(self, idxs, iectypes):
+        """
+        SetTraceVariablesList with IEC types, for eRPC clients : former
+        SetTraceVariablesList call is kept as is for compatibility
+        """
+        return self.SetTraceVariablesList(idxs, iectypes)
+
+    def _RegisterTraceVariables(self, idxs, iectypes):
         self.DebugToken += 1
+        self.TraceDecoder = GetTraceDecoder(tuple(iectypes)) if iectypes else None
+        self.TraceDecimator = None
+        self.TraceOrders = []
+        self.TraceIECTypes = None
+        self._WakeTraceWaiters()
         if idxs:
             # suspend but dont disable
             if self._suspendDebug(False) == 0:
                 # keep a copy of requested idx
                 self._ResetDebugVariables()
-                for idx, force in idxs:
-                    res = self._RegisterDebugVariable(
-                        idx, force, 0 if force is None else len(force)
-                    )
-                    if res != 0:
-                        self._resumeDebug()
-                        self._suspendDebug(True)
-                        return -res
+                res = self._RegisterDebugVariables(idxs)
+                if res != 0:
+                    return res
+                self.TraceOrders = list(idxs)
+                self.TraceIECTypes = list(iectypes) if iectypes else None
                 self._TracesSwap()
                 self._resumeDebug()
                 return self.DebugToken
@@ -827,14 +1385,315 @@ class PLCObject(object):
             self._suspendDebug(True)
         return -5  # DEBUG_SUSPENDED
 
-    def _TracesSwap(self):
+    def _RegisterDebugVariables(self, idxs):
+        """
+        Append variables to debugger registration, debugger being suspended.
+        On error debugger is disabled and negative error is returned.
+        """
+        for idx, force in idxs:
+            res = self._RegisterDebugVariable(
+                idx, _ForcePointer(force), 0 if force is None else len(force)
+            )
+            if res != 0:
+                self._resumeDebug()
+                self._suspendDebug(True)
+                return -res
+        return 0
+
+    @RunInMain
+    def UpdateTraceVariablesList(self, DebugToken, adds, removes, iectypes=None):
+        """
+        Apply changes to variables registered by SetTraceVariablesList :
+        adds is a list of (idx, force) to register or to change force of,
+        removes a list of idx to unregister. Optional iectypes gives
+        IEC types of added variables.
+
+        Nothing is done if registered variables are unchanged. If
+        variables are only appended, they are registered without
+        resetting debugger, former variables staying at the beginning of
+        samples. Otherwise debugger registration is done again, as with
+        SetTraceVariablesList. Either way, samples buffered under former
+        layout are dropped.
+
+        Returns new DebugToken, or negative error, and new position of
+        formerly registered variables in samples, -1 for removed ones.
+        """
+        if (
+            DebugToken is None
+            or DebugToken != self.DebugToken
+            or self.TraceSessions.active
+        ):
+            return -1, []
+
+        removes = set(removes)
+        orders = []
+        positions = []
+        for idx, force in self.TraceOrders:
+            if idx in removes:
+                positions.append(-1)
+            else:
+                positions.append(len(orders))
+                orders.append((idx, force))
+        # types stay known unless a new variable comes without its type
+        typed = iectypes is not None and len(iectypes) == len(adds)
+        types = None
+        if self.TraceIECTypes is not None:
+            types = [
+                iectype
+                for (idx, _force), iectype in zip(self.TraceOrders, self.TraceIECTypes)
+                if idx not in removes
+            ]
+        kept = len(orders)
+        byidx = dict((idx, pos) for pos, (idx, _force) in enumerate(orders))
+        for n, (idx, force) in enumerate(adds):
+            if idx in byidx:
+                orders[byidx[idx]] = (idx, force)
+            else:
+                byidx[idx] = len(orders)
+                orders.append((idx, force))
+                if typed and types is not None:
+                    types.append(iectypes[n])
+                else:
+                    types = None
+
+        if orders == self.TraceOrders:
+            return self.DebugToken, positions
+
+        appended = orders[kept:]
+        if kept == 0 or orders[:kept] != self.TraceOrders:
+            return self._RegisterTraceVariables(orders, types), positions
+
+        # only appended variables, no need to reset debugger
+        self.DebugToken += 1
+        self.TraceDecoder = GetTraceDecoder(tuple(types)) if types else None
+        self.TraceDecimator = None
+        self._WakeTraceWaiters()
+        if self._suspendDebug(False) != 0:
+            self.TraceOrders = []
+            return -5, positions  # DEBUG_SUSPENDED
+        res = self._RegisterDebugVariables(appended)
+        if res != 0:
+            self.TraceOrders = []
+            return res, positions
+        self.TraceOrders = orders
+        self.TraceIECTypes = types
+        self._TracesSwap()
+        self._resumeDebug()
+        return self.DebugToken, positions
+
+    @RunInMain
+    def ForceVariables(self, DebugToken, forces):
+        """
+        Change forced values of variables registered by
+        SetTraceVariablesList. forces is a list of (idx, force), force
+        being None to release variable, bytes-like IEC value otherwise.
+        Samples layout doesn't change, so DebugToken and buffered samples
+        are kept. All forces are applied in a single registration pass.
+        Returns DebugToken or negative error.
+        """
+        if (
+            DebugToken is None
+            or DebugToken != self.DebugToken
+            or self.TraceSessions.active
+        ):
+            return -1
+        orders = list(self.TraceOrders)
+        byidx = dict((idx, pos) for pos, (idx, _force) in enumerate(orders))
+        for idx, force in forces:
+            pos = byidx.get(idx)
+            if pos is None:
+                # not registered, see UpdateTraceVariablesList
+                return -3
+            orders[pos] = (idx, force)
+        if not orders or self._suspendDebug(False) != 0:
+            return -5  # DEBUG_SUSPENDED
+        self._ResetDebugVariables()
+        res = self._RegisterDebugVariables(orders)
+        if res != 0:
+            self.TraceOrders = []
+            return res
+        self.TraceOrders = orders
+        self._resumeDebug()
+        return self.DebugToken
+
+    @RunInMain
+    def ForceVariableValues(self, DebugToken, forces):
+        """
+        ForceVariables with a list of (idx, iectype, value), value being
+        None to release variable. Values are packed in a single buffer,
+        see typemapping.PackForces. Returns -2 if a value can't be packed.
+        """
+        try:
+            _buff, packed = PackForces(forces)
+        except (KeyError, TypeError, ValueError, StructError):
+            return -2
+        return self.ForceVariables(DebugToken, packed)
+
+    @RunInMain
+    def SetTraceDecimation(self, DebugToken, window, unit=WindowTicks, iectypes=None):
+        """
+        Have trace thread aggregate samples by windows of given count of
+        ticks or milliseconds, see TraceDecimator. Traces then convey
+        min/max/mean/last of each variable per window instead of raw
+        samples. Variables types must be known, either given here or
+        to SetTraceVariablesList. Null window restores raw samples.
+        """
+        if (
+            DebugToken is None
+            or DebugToken != self.DebugToken
+            or self.TraceSessions.active
+        ):
+            return -1
+        if iectypes:
+            self.TraceDecoder = GetTraceDecoder(tuple(iectypes))
+        if window and self.TraceDecoder is None:
+            return -2
+        decimator = (
+            TraceDecimator(self.TraceDecoder, window, unit, self.TraceClock)
+            if window
+            else None
+        )
+        self.TraceLock.acquire()
+        # don't mix raw and aggregated samples
+        self.Traces.clear()
+        self.TraceDecimator = decimator
+        self.TraceLock.release()
+        return 0
+
+    def _ApplyTraceSessions(self):
+        """
+        Register union of variables traced by sessions in PLC debugger.
+        Samples pending under former registration are handed to sessions
+        first. The debugger can't deregister a single variable, so
+        registration is reset and done again.
+        """
+        mux = self.TraceSessions
+        if mux.active:
+            self.TraceLock.acquire()
+            mux.distribute(self.Traces.swap())
+            self.TraceLock.release()
+        orders, iectypes = mux.merge()
+        mux.active = bool(mux.sessions)
+        res = self._RegisterTraceVariables(orders, iectypes)
+        if not orders:
+            return 0
+        return res
+
+    def _ExpireTraceSessions(self):
+        if self.TraceSessions.expire(self.TraceSessionTimeout):
+            self._ApplyTraceSessions()
+
+    @RunInMain
+    def OpenTraceSession(self):
+        """
+        Open a trace session, letting a client trace its own variables
+        alongside other clients. See SetTraceSessionVariables.
+        """
+        self._ExpireTraceSessions()
+        if not self.TraceSessions.active:
+            # sessions take over registration done by SetTraceVariablesList
+            self.TraceSessions.active = True
+            self._RegisterTraceVariables([], None)
+        return self.TraceSessions.open()
+
+    @RunInMain
+    def CloseTraceSession(self, session):
+        if not self.TraceSessions.close(session):
+            return -1
+        self._ApplyTraceSessions()
+        return 0
+
+    @RunInMain
+    def SetTraceSessionVariables(self, session, idxs, iectypes):
+        """
+        Change variables traced by given session. IEC types of variables
+        are mandatory, they are needed to extract session's variables
+        from merged samples. Variables forced by several sessions take
+        value from session that changed its variables last.
+        Returns session token to give to GetTraceSessionVariables,
+        or negative error.
+        """
+        try:
+            token = self.TraceSessions.set(session, idxs, iectypes)
+        except KeyError:
+            return -2
+        if token < 0:
+            return token
+        res = self._ApplyTraceSessions()
+        if res < 0:
+            return res
+        return token
+
+    @RunInMain
+    def GetTraceSessionVariables(self, session, token):
+        self._ExpireTraceSessions()
+        trace_session = self.TraceSessions.get(session)
+        if trace_session is None or token != trace_session.token:
+            return PlcStatus.Broken, []
         self.LastSwapTrace = time()
+        self._StartTraceThread()
+        self.TraceLock.acquire()
+        self.TraceSessions.distribute(self.Traces.swap())
+        self.TraceLock.release()
+        trace_session.LastSwap = time()
+        return self.PLCStatus, trace_session.Traces.swap()
+
+    @RunInMain
+    def SetTraceRecording(self, enable):
+        """
+        Record raw traced samples on disk, see TraceRecorder.
+        While recording, trace thread keeps running even if no client
+        consumes traces, so that recorded data is available for post
+        mortem analysis with GetRecordedTraces.
+        """
+        self.TraceRecording = bool(enable)
+        if self.TraceRecording:
+            self.LastSwapTrace = time()
+            self._StartTraceThread()
+        else:
+            self.TraceRecorder.stop()
+        return 0
+
+    def GetRecordedTraces(self, fromTick, toTick, maxSamples):
+        """
+        Return recorded (tick, TraceBuffer) samples in given ticks range,
+        at most maxSamples and RecordedTracesMaxSamples.
+        Doesn't go through MainWorker.
+        """
+        maxSamples = min(
+            maxSamples or self.RecordedTracesMaxSamples, self.RecordedTracesMaxSamples
+        )
+        return self.PLCStatus, self.TraceRecorder.samples(fromTick, toTick, maxSamples)
+
+    def ExportRecordedTraces(self, directory, fromTick=0, toTick=0xFFFFFFFF):
+        """
+        Export recorded samples in given ticks range as NumPy columns in
+        given local directory, see TraceExport. Needs NumPy.
+        """
+        return ExportRecordedTraces(self.TraceRecorder, directory, fromTick, toTick)
+
+    def _RecordTraces(self, samples):
+        decoder = self.TraceDecoder
+        try:
+            self.TraceRecorder.extend(
+                self.DebugToken,
+                decoder.iectypes if decoder is not None else None,
+                samples,
+            )
+        except Exception:
+            self.TraceRecording = False
+            self.LogMessage(0, "Trace recording stopped\n" + traceback.format_exc())
+
+    def _StartTraceThread(self):
         if self.TraceThread is None and self.PLCStatus == PlcStatus.Started:
             self.TraceThread = Thread(target=self.TraceThreadProc, name="PLCTrace")
             self.TraceThread.start()
+
+    def _TracesSwap(self):
+        self.LastSwapTrace = time()
+        self._StartTraceThread()
         self.TraceLock.acquire()
-        Traces = self.Traces
-        self.Traces = []
+        Traces = self.Traces.swap()
         self.TraceLock.release()
         return Traces
 
@@ -844,51 +1703,199 @@ class PLCObject(object):
             return self.PLCStatus, self._TracesSwap()
         return PlcStatus.Broken, []
 
-    def TraceThreadProc(self):
+    def _TraceTimeBase(self, tick):
+        estimate = self.TraceClock.estimate(tick)
+        if estimate is None:
+            return 0, 0.0, 0.0, 0.0
+        return (tick,) + estimate
+
+    def GetTraceClock(self):
         """
-        Return a list of traces, corresponding to the list of required idx
+        Return last seen tick, with its estimated monotonic and realtime
+        timestamps in seconds, and estimated seconds per tick.
+        All zero while estimation isn't possible yet.
         """
-        self._resumeDebug()  # Re-enable debugger
-        while self.PLCStatus == PlcStatus.Started:
-            tick = ctypes.c_uint32()
-            size = ctypes.c_uint32()
-            buff = ctypes.c_void_p()
-            TraceBuffer = None
+        tick = self.TraceClock.lasttick
+        if tick is None:
+            return 0, 0.0, 0.0, 0.0
+        return self._TraceTimeBase(tick & 0xFFFFFFFF)
 
-            self.PLClibraryLock.acquire()
+    @RunInMain
+    def GetTimedTraceVariables(self, DebugToken):
+        """
+        Same as GetTraceVariables, with time base of first sample :
+        tick, monotonic and realtime timestamps, and seconds per tick,
+        from which timestamps of all samples of batch can be computed.
+        """
+        status, traces = self.GetTraceVariables(DebugToken)
+        if not traces:
+            return status, self.GetTraceClock(), traces
+        return status, self._TraceTimeBase(traces[0][0]), traces
 
-            res = self._GetDebugData(
-                ctypes.byref(tick), ctypes.byref(size), ctypes.byref(buff)
+    @RunInMain
+    def _RestartTraces(self):
+        self.LastSwapTrace = time()
+        self._StartTraceThread()
+
+    def StreamTraceVariables(self, DebugToken, minSamples, maxDelayMs):
+        """
+        Streaming alternative to GetTraceVariables polling, meant to be
+        called back to back by trace consumer. Blocks until minSamples
+        samples are available or maxDelayMs elapsed, then hands out all
+        available samples. maxDelayMs is bounded by StreamMaxDelayMs.
+        Waiting doesn't go through MainWorker, only restarting trace
+        thread does. Pending calls keep trace thread alive, in place of
+        polling age. If PLC isn't running, call waits for maxDelayMs, so
+        that a consumer calling back to back doesn't spin.
+        Waiting needs a server handling calls concurrently : eRPC server
+        handles one call at a time, eRPC calls are given a null
+        maxDelayMs and return available samples at once.
+        """
+        if DebugToken is None or DebugToken != self.DebugToken:
+            return PlcStatus.Broken, []
+
+        if self.TraceThread is None:
+            self._RestartTraces()
+        running = self.TraceThread is not None
+
+        minSamples = max(1, minSamples)
+        delay = min(maxDelayMs, self.StreamMaxDelayMs) / 1000.0
+
+        def ready():
+            return (
+                len(self.Traces) >= minSamples
+                or DebugToken != self.DebugToken
+                # trace thread ended while waiting, i.e. PLC stopped
+                or (running and self.TraceThread is None)
             )
-            if res == 0:
-                if size.value:
-                    TraceBuffer = ctypes.string_at(buff.value, size.value)
-                self._FreeDebugData()
 
-            self.PLClibraryLock.release()
+        self.TraceLock.acquire()
+        self.TraceWaiters += 1
+        try:
+            self.TraceCond.wait_for(ready, delay)
+            if DebugToken != self.DebugToken:
+                return PlcStatus.Broken, []
+            self.LastSwapTrace = time()
+            return self.PLCStatus, self.Traces.swap()
+        finally:
+            self.TraceWaiters -= 1
+            self.TraceLock.release()
 
-            # leave thread if GetDebugData isn't happy.
-            if res != 0:
-                break
+    def _WakeTraceWaiters(self):
+        self.TraceLock.acquire()
+        self.TraceCond.notify_all()
+        self.TraceLock.release()
 
-            if TraceBuffer is not None:
+    def TraceThreadProc(self):
+        """
+        Return a list of traces, corresponding to the list of required idx
+        """
+        # out parameters of GetDebugData, reused for all samples
+        tick = ctypes.c_uint32()
+        size = ctypes.c_uint32()
+        buff = ctypes.c_void_p()
+        outargs = (ctypes.byref(tick), ctypes.byref(size), ctypes.byref(buff))
+        # samples of current batch, before being handed to self.Traces
+        batch = TraceRingBuffer(self.TraceBatchBudget, self.TraceMaxBatch)
+        stats = self.TraceStats
+        stats.reset()
+
+        self._resumeDebug()  # Re-enable debugger
+        res = 0
+        while self.PLCStatus == PlcStatus.Started and res == 0:
+            decimator = self.TraceDecimator
+            recording = self.TraceRecording
+            # samples of a batch overlapping a layout change are dropped
+            token = self.DebugToken
+            nsamples = 0
+            start = perf_counter()
+
+            # GetDebugData waits for next PLC cycle, lock is only held
+            # for one sample so that other PLC library calls get in
+            for _i in range(stats.batchsize):
+                self.PLClibraryLock.acquire()
+                locked = perf_counter()
+                res = self._GetDebugData(*outargs)
+                if res == 0:
+                    if size.value:
+                        batch.append_from(tick.value, buff.value, size.value)
+                        nsamples += 1
+                    self._FreeDebugData()
+                # PLC library is held anyway, refresh log counts of status
+                if monotonic() - self.StatusRefreshed > self.StatusRefreshPeriod:
+                    self._PublishStatus(self._ReadLogCounts())
+                unlocked = perf_counter()
+                self.PLClibraryLock.release()
+                stats.hold(unlocked - locked)
+                if res != 0 or unlocked - start > self.TraceBatchPeriod:
+                    break
+
+            stats.update(nsamples, perf_counter() - start)
+            if nsamples:
+                # last sample of batch was just produced
+                self.TraceClock.add(tick.value, monotonic())
+
+            # views are handed out before batch is filled again
+            samples = batch.swap_views()
+            if token != self.DebugToken:
+                samples = []
+            if recording and samples:
+                # file I/O out of PLC library lock
+                self._RecordTraces(samples)
+            if decimator is not None:
+                # aggregate out of PLC library lock
+                samples = decimator.feed_batch(samples)
+            if samples:
                 self.TraceLock.acquire()
-                lT = len(self.Traces)
-                if lT != 0 and lT * len(self.Traces[0]) > 1024 * 1024:
-                    self.Traces.pop(0)
-                self.Traces.append((tick.value, TraceBuffer))
+                if decimator is self.TraceDecimator and token == self.DebugToken:
+                    self.Traces.extend(samples)
+                    if self.TraceWaiters:
+                        self.TraceCond.notify_all()
                 self.TraceLock.release()
 
-            # TraceProc stops here if Traces not polled for 3 seconds
+            # TraceProc stops here if Traces not consumed for TraceKeepAlive
+            # seconds, no StreamTraceVariables call is pending and not recording
             traces_age = time() - self.LastSwapTrace
-            if traces_age > 3:
+            if (
+                traces_age > self.TraceKeepAlive
+                and not self.TraceWaiters
+                and not self.TraceRecording
+            ):
                 self.TraceLock.acquire()
-                self.Traces = []
+                self.Traces.clear()
                 self.TraceLock.release()
                 self._suspendDebug(True)  # Disable debugger
                 break
 
+        self.TraceDropped += batch.dropped
         self.TraceThread = None
+        self.TraceRecorder.stop()
+        self._WakeTraceWaiters()
+
+    def GetTraceStatistics(self):
+        """
+        Trace acquisition counters : samples, rate, lock hold time and
+        samples dropped because not consumed fast enough
+        """
+        res = self.TraceStats.GetStatistics()
+        res["dropped"] = self.Traces.dropped + self.TraceDropped
+        return res
+
+    def GetWorkerMetrics(self):
+        """
+        Per method queue wait and execution time percentiles, caller
+        threads and contention count of RunInMain calls. Doesn't go
+        through MainWorker.
+        """
+        return self.WorkerMetrics.summary()
+
+    def DumpWorkerMetrics(self):
+        """
+        Log RunInMain calls metrics as a table
+        """
+        self.LogMessage(
+            LogLevelsDefault, "MainWorker metrics :\n" + self.WorkerMetrics.dump()
+        )
 
     def RemoteExec(self, script, *kwargs):
         try:
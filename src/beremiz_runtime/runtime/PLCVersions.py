@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of Beremiz runtime.
+#
+# See COPYING.Runtime file for copyrights details.
+
+"""
+Cache of last installed PLC versions.
+
+Each version is a manifest, named after PLC md5, giving digests of PLC
+library and extra files kept in blob store. A cached version can be
+installed again without any transfer. Least recently used versions are
+forgotten beyond a count or a total size of their files, files not used
+by remaining versions being removed from blob store.
+"""
+
+import json
+import os
+
+# States of a PLC version, see PLCVersionCache.state
+PLCVersionUnknown = 0
+PLCVersionCached = 1
+PLCVersionInstalled = 2
+
+# Seconds stored files not used by any version are kept, they may have
+# been uploaded for a NewPLC to come
+DefaultGrace = 3600
+
+
+class PLCVersionCache(object):
+    """
+    PLC versions manifests in given directory, files in given BlobStore
+    """
+
+    def __init__(self, directory, store, maxversions, maxbytes, grace=DefaultGrace):
+        self.directory = directory
+        self.store = store
+        self.maxversions = maxversions
+        self.maxbytes = maxbytes
+        self.grace = grace
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def _path(self, md5):
+        if not md5 or not md5.isalnum():
+            raise ValueError("Invalid PLC md5")
+        return os.path.join(self.directory, md5 + ".json")
+
+    def _read(self, md5):
+        try:
+            with open(self._path(md5), "r") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return (
+            bytes.fromhex(manifest["library"]),
+            [
+                (fname, bytes.fromhex(digest))
+                for fname, digest in manifest["extrafiles"]
+            ],
+        )
+
+    def get(self, md5, touch=True):
+        """
+        (library digest, [(extra file name, digest)]) of cached version,
+        None if unknown or if some file is missing
+        """
+        version = self._read(md5)
+        if version is None:
+            return None
+        library, extrafiles = version
+        for digest in [library] + [digest for _fname, digest in extrafiles]:
+            if not self.store.has(digest):
+                return None
+        if touch:
+            os.utime(self._path(md5))
+        return version
+
+    def add(self, md5, library, extrafiles):
+        """
+        Record installed version, forgetting least recently used ones if
+        needed
+        """
+        path = self._path(md5)
+        manifest = {
+            "library": library.hex(),
+            "extrafiles": [[fname, digest.hex()] for fname, digest in extrafiles],
+        }
+        with open(path + ".tmp", "w") as f:
+            json.dump(manifest, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(path + ".tmp", path)
+        self._evict()
+
+    def versions(self):
+        """
+        Cached md5, most recently used first
+        """
+        res = []
+        for fname in os.listdir(self.directory):
+            md5, ext = os.path.splitext(fname)
+            if ext == ".json":
+                try:
+                    used = os.stat(os.path.join(self.directory, fname)).st_mtime
+                except OSError:
+                    continue
+                res.append((used, md5))
+        return [md5 for _used, md5 in sorted(res, reverse=True)]
+
+    def _evict(self):
+        kept = set()
+        count = size = 0
+        for md5 in self.versions():
+            version = self._read(md5)
+            if version is not None:
+                library, extrafiles = version
+                digests = set([library] + [digest for _fname, digest in extrafiles])
+                added = sum(self.store.size(d) for d in digests - kept)
+                # most recent version is kept whatever its size
+                if not count or (
+                    count < self.maxversions and size + added <= self.maxbytes
+                ):
+                    kept |= digests
+                    count += 1
+                    size += added
+                    continue
+            os.remove(self._path(md5))
+        self.store.collect(kept, self.grace)
+
+    def state(self, md5, installed):
+        """
+        PLCVersionInstalled if md5 is installed one, PLCVersionCached if it
+        can be installed without transfer, PLCVersionUnknown otherwise
+        """
+        if md5 == installed:
+            return PLCVersionInstalled
+        if self.get(md5, touch=False) is not None:
+            return PLCVersionCached
+        return PLCVersionUnknown
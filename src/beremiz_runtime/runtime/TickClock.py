@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of Beremiz runtime.
+#
+# See COPYING.Runtime file for copyrights details.
+
+from threading import Lock
+from time import monotonic, time
+
+# Weight given to former points each time a new point is added
+DefaultForgetting = 0.995
+
+
+class TickClock(object):
+    """
+    Continuously fitted linear model of PLC ticks against monotonic clock,
+    and offset of realtime clock to monotonic clock, so that a tick can be
+    given absolute timestamps.
+
+    Points come from trace samples arrival times and from log messages
+    timestamps. Weighted least squares with exponential forgetting follow
+    slow drift of PLC cycle. Ticks are 32 bits and are unwrapped.
+
+    Sums are kept relative to last point : they are shifted each time a
+    point is added, so that they don't grow with uptime and lose
+    precision.
+    """
+
+    def __init__(self, forgetting=DefaultForgetting):
+        self.forgetting = forgetting
+        self.lock = Lock()
+        self.reset()
+
+    def reset(self):
+        """
+        Forget all points, i.e. when PLC restarts and ticks start over
+        """
+        with self.lock:
+            self.started = time()
+            self.lasttick = None
+            self.reftick = None
+            self.refmono = None
+            self.points = 0
+            self.sw = self.sx = self.sy = self.sxx = self.sxy = 0.0
+            self.offset = None
+            self.intercept = 0.0
+            self.slope = None
+
+    def _unwrapped(self, tick):
+        # nearest unwrapped value of tick to last seen one
+        last = self.lasttick
+        if last is None:
+            return tick
+        return last + (tick - last + 0x80000000) % 0x100000000 - 0x80000000
+
+    def _unwrap(self, tick):
+        unwrapped = self._unwrapped(tick)
+        if self.lasttick is None or unwrapped > self.lasttick:
+            self.lasttick = unwrapped
+        return unwrapped
+
+    def _rebase(self, tick, mono):
+        # move origin of sums to given point
+        dx = float(tick - self.reftick)
+        dy = mono - self.refmono
+        sw, sx, sy = self.sw, self.sx, self.sy
+        self.sxx += dx * dx * sw - 2.0 * dx * sx
+        self.sxy += dx * dy * sw - dx * sy - dy * sx
+        self.sx = sx - dx * sw
+        self.sy = sy - dy * sw
+        if self.slope is not None:
+            self.intercept += self.slope * dx - dy
+        self.reftick = tick
+        self.refmono = mono
+
+    def _add(self, tick, mono):
+        tick = self._unwrap(tick)
+        if self.reftick is None:
+            self.reftick = tick
+            self.refmono = mono
+        else:
+            self._rebase(tick, mono)
+        # new point is origin
+        f = self.forgetting
+        self.sw = self.sw * f + 1.0
+        self.sx *= f
+        self.sy *= f
+        self.sxx *= f
+        self.sxy *= f
+        self.points += 1
+        det = self.sw * self.sxx - self.sx * self.sx
+        if self.points > 1 and det > 0:
+            self.slope = (self.sw * self.sxy - self.sx * self.sy) / det
+            self.intercept = (self.sy - self.slope * self.sx) / self.sw
+
+    def _update_offset(self, offset):
+        if self.offset is None:
+            self.offset = offset
+        else:
+            self.offset += (offset - self.offset) * 0.1
+
+    def add(self, tick, mono=None, real=None):
+        """
+        Add a point, tick having been observed at given monotonic time
+        """
+        if mono is None:
+            mono = monotonic()
+        if real is None:
+            real = time()
+        with self.lock:
+            self._update_offset(real - mono)
+            self._add(tick, mono)
+
+    def add_realtime(self, tick, real):
+        """
+        Add a point, tick being timestamped with realtime clock,
+        i.e. by PLC logging
+        """
+        with self.lock:
+            # ignore timestamps older than model, i.e. former PLC run
+            if real < self.started or self.offset is None:
+                return
+            self._add(tick, real - self.offset)
+
+    def estimate(self, tick):
+        """
+        Returns monotonic and realtime estimated for given tick and
+        estimated seconds per tick, or None if not enough points yet
+        """
+        with self.lock:
+            if self.slope is None:
+                return None
+            x = self._unwrapped(tick) - self.reftick
+            mono = self.refmono + self.intercept + self.slope * x
+            return mono, mono + self.offset, self.slope
@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of Beremiz runtime.
+#
+# See COPYING.Runtime file for copyrights details.
+
+from datetime import timedelta
+from struct import Struct
+from time import monotonic
+
+# Units of decimation window
+WindowTicks = 0
+WindowMilliseconds = 1
+
+NaN = float("nan")
+
+
+def _as_float(value):
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    if isinstance(value, str):
+        return NaN
+    return float(value)
+
+
+def _AggregatedStruct(nvars):
+    return Struct("=I" + "dddd" * nvars)
+
+
+class TraceDecimator(object):
+    """
+    Aggregates traced samples by windows of a given count of ticks or
+    milliseconds, for each registered variable.
+
+    Each closed window gives one (tick, buffer) sample, tick being first
+    tick of window, buffer packing count of aggregated samples followed by
+    min, max, mean and last value of each variable as doubles.
+    TIME values are given in seconds, STRING values as NaN.
+
+    A window is closed when first sample of next window arrives.
+
+    Millisecond windows need time at which each sample was taken : it is
+    estimated from its tick by given TickClock. Until clock has enough
+    points, time at which sample is aggregated is used instead.
+    """
+
+    def __init__(self, decoder, window, unit=WindowTicks, clock=None):
+        if window <= 0:
+            raise ValueError("Decimation window must be positive")
+        if unit not in (WindowTicks, WindowMilliseconds):
+            raise ValueError("Unknown decimation window unit")
+        self.decoder = decoder
+        self.window = window
+        self.unit = unit
+        self.clock = clock
+        self.nvars = len(decoder.iectypes)
+        self.struct = _AggregatedStruct(self.nvars)
+        self._reset(None, None)
+
+    def _reset(self, key, tick):
+        self.key = key
+        self.tick = tick
+        self.count = 0
+        self.mins = [NaN] * self.nvars
+        self.maxs = [NaN] * self.nvars
+        self.sums = [0.0] * self.nvars
+        self.lasts = [NaN] * self.nvars
+
+    def _window_key(self, tick):
+        if self.unit == WindowTicks:
+            return tick // self.window
+        estimate = None if self.clock is None else self.clock.estimate(tick)
+        mono = monotonic() if estimate is None else estimate[0]
+        return int(mono * 1000) // self.window
+
+    def feed(self, tick, buff):
+        """
+        Aggregate one raw sample.
+        Returns previous window as a (tick, bytes) sample if it just closed
+        """
+        values = self.decoder.decode(buff)
+        if values is None:
+            return None
+        return self._aggregate(tick, values)
+
+    def feed_batch(self, samples):
+        """
+        Aggregate a list of raw (tick, buffer) samples, decoded at once.
+        Returns list of windows closed meanwhile
+        """
+        decoded = self.decoder.decode_batch([buff for _tick, buff in samples])
+        res = []
+        for (tick, _buff), values in zip(samples, decoded):
+            if values is not None:
+                window = self._aggregate(tick, values)
+                if window is not None:
+                    res.append(window)
+        return res
+
+    def _aggregate(self, tick, values):
+        key = self._window_key(tick)
+        res = None
+        if key != self.key:
+            res = self.flush()
+            self._reset(key, tick)
+
+        mins, maxs, sums, lasts = self.mins, self.maxs, self.sums, self.lasts
+        first = self.count == 0
+        for i, value in enumerate(values):
+            value = _as_float(value)
+            if first:
+                mins[i] = maxs[i] = value
+            else:
+                if value < mins[i]:
+                    mins[i] = value
+                if value > maxs[i]:
+                    maxs[i] = value
+            sums[i] += value
+            lasts[i] = value
+        self.count += 1
+        return res
+
+    def flush(self):
+        """
+        Close current window. Returns it as a (tick, bytes) sample,
+        or None if empty
+        """
+        if not self.count:
+            return None
+        aggregates = []
+        for i in range(self.nvars):
+            aggregates += (
+                self.mins[i],
+                self.maxs[i],
+                self.sums[i] / self.count,
+                self.lasts[i],
+            )
+        res = self.tick, self.struct.pack(self.count, *aggregates)
+        self._reset(None, None)
+        return res
+
+
+def UnpackAggregatedBuffer(buff, nvars):
+    """
+    Decode a buffer produced by TraceDecimator into sample count and
+    a list of (min, max, mean, last) tuples, one per variable.
+    Returns None if buffer doesn't match variable count
+    """
+    aggstruct = _AggregatedStruct(nvars)
+    if len(buff) != aggstruct.size:
+        return None
+    values = aggstruct.unpack(buff)
+    return values[0], [tuple(values[1 + i * 4 : 5 + i * 4]) for i in range(nvars)]
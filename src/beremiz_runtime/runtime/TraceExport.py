@@ -0,0 +1,256 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of Beremiz runtime.
+#
+# See COPYING.Runtime file for copyrights details.
+
+"""
+Columnar export of traced samples : one typed NumPy array per variable,
+plus a tick column, instead of one list of Python values per sample.
+
+Columns can be saved in a .npz archive, or exported as one .npy file per
+column in a directory, that analysis jobs can load memory mapped with
+LoadTraceColumns. Export is done by chunks, whatever the count of samples.
+
+BOOL columns are numpy bools, TIME, TOD, DATE and DT columns are
+timedelta64[ns] and STRING columns are fixed size bytes. Samples from
+targets of swaped endianess are read through byteswapped dtypes and
+converted to host byte order in a single vectorized pass per column.
+"""
+
+import os
+from struct import Struct
+
+from beremiz_runtime.runtime.TraceRecorder import TraceSegment
+from beremiz_runtime.runtime.typemapping import GetTraceDecoder
+
+try:
+    import numpy
+    from numpy.lib.format import dtype_to_descr
+except ImportError:
+    numpy = None
+
+TickColumn = "tick"
+DefaultChunkSize = 65536
+
+# IEC_STRING body size, see typemapping.IEC_STRING
+StringSize = 126
+
+_TimeTypes = ("TIME", "TOD", "DATE", "DT")
+
+# .npy files are written before count of samples is known, header has a
+# fixed size so that it can be rewritten once export is complete
+_NpyMagic = b"\x93NUMPY\x01\x00"
+_NpyHeaderLen = Struct("<H")
+_NpyHeaderSize = 128
+
+
+def _require_numpy():
+    if numpy is None:
+        raise ImportError("NumPy is needed to export traces as columns")
+
+
+def _ColumnNames(decoder, names):
+    if names is None:
+        return ["var%d" % i for i in range(len(decoder.iectypes))]
+    if len(names) != len(decoder.iectypes) or TickColumn in names:
+        raise ValueError("Invalid trace column names")
+    return list(names)
+
+
+def _RawDtype(fmt, byteorder):
+    if len(fmt) == 1:
+        return numpy.dtype(byteorder + fmt)
+    # IEC_TIME
+    return numpy.dtype([("s", byteorder + fmt[0]), ("ns", byteorder + fmt[1])])
+
+
+def _Convert(iectype, raw):
+    if iectype == "BOOL":
+        return raw != 0
+    if iectype in _TimeTypes:
+        ns = raw["s"].astype(numpy.int64) * 1000000000 + raw["ns"]
+        return ns.view("m8[ns]")
+    # to host byte order if needed
+    return numpy.ascontiguousarray(raw, dtype=raw.dtype.newbyteorder("="))
+
+
+def _DecodeColumns(decoder, samples):
+    """
+    Typed columns for given samples, samples not matching decoder skipped
+    """
+    byteorder = decoder.byteorder
+    if decoder.fixedsize is not None:
+        size = decoder.fixedsize
+        kept = [(tick, buff) for tick, buff in samples if len(buff) == size]
+        records = numpy.frombuffer(
+            b"".join(buff for _tick, buff in kept),
+            dtype=numpy.dtype(
+                [
+                    ("f%d" % i, _RawDtype(fmt, byteorder))
+                    for i, fmt in enumerate(decoder.formats)
+                ]
+            ),
+        )
+        ticks = numpy.array([tick for tick, _buff in kept], dtype=numpy.uint32)
+        raws = [records["f%d" % i] for i in range(len(decoder.formats))]
+    else:
+        ticks = []
+        parts = [[] for _fmt in decoder.formats]
+        for tick, buff in samples:
+            spans = decoder.spans(buff)
+            if spans is None:
+                continue
+            ticks.append(tick)
+            for part, (start, end) in zip(parts, spans):
+                part.append(buff[start:end])
+        ticks = numpy.array(ticks, dtype=numpy.uint32)
+        raws = []
+        for fmt, part in zip(decoder.formats, parts):
+            if fmt is None:
+                # strip length byte
+                raws.append(
+                    numpy.array(
+                        [bytes(value[1:]) for value in part], dtype="S%d" % StringSize
+                    )
+                )
+            else:
+                raws.append(
+                    numpy.frombuffer(b"".join(part), dtype=_RawDtype(fmt, byteorder))
+                )
+    return ticks, [
+        _Convert(iectype, raw) for iectype, raw in zip(decoder.iectypes, raws)
+    ]
+
+
+def TraceColumns(iectypes, samples, names=None, swaped=False):
+    """
+    Convert (tick, TraceBuffer) samples of variables of given IEC types
+    into a dict of NumPy arrays : ticks, and one column per variable,
+    named after names or var0, var1...
+    """
+    _require_numpy()
+    decoder = GetTraceDecoder(tuple(iectypes), swaped)
+    names = _ColumnNames(decoder, names)
+    ticks, columns = _DecodeColumns(decoder, samples)
+    res = {TickColumn: ticks}
+    res.update(zip(names, columns))
+    return res
+
+
+def SaveTraceColumns(path, iectypes, samples, names=None, swaped=False):
+    """
+    Save trace columns in a .npz archive
+    """
+    numpy.savez(path, **TraceColumns(iectypes, samples, names, swaped))
+
+
+def _NpyHeader(dtype, count):
+    header = "{'descr': %r, 'fortran_order': False, 'shape': (%d,), }" % (
+        dtype_to_descr(dtype),
+        count,
+    )
+    headersize = _NpyHeaderSize - len(_NpyMagic) - _NpyHeaderLen.size
+    header = header.ljust(headersize - 1) + "\n"
+    if len(header) != headersize:
+        raise ValueError("Unsupported trace column type")
+    return _NpyMagic + _NpyHeaderLen.pack(headersize) + header.encode("latin1")
+
+
+def _Chunks(samples, chunksize):
+    chunk = []
+    for sample in samples:
+        chunk.append(sample)
+        if len(chunk) == chunksize:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def ExportTraceColumns(
+    directory,
+    iectypes,
+    samples,
+    names=None,
+    chunksize=DefaultChunkSize,
+    swaped=False,
+):
+    """
+    Export samples from any iterable as one .npy file per column in given
+    directory, converting them by chunks of chunksize samples.
+    Returns count of exported samples.
+    """
+    _require_numpy()
+    decoder = GetTraceDecoder(tuple(iectypes), swaped)
+    names = [TickColumn] + _ColumnNames(decoder, names)
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    files = [open(os.path.join(directory, name + ".npy"), "wb") for name in names]
+    dtypes = None
+    count = 0
+    try:
+        for f in files:
+            f.seek(_NpyHeaderSize)
+        for chunk in _Chunks(samples, chunksize):
+            ticks, columns = _DecodeColumns(decoder, chunk)
+            columns = [ticks] + columns
+            if dtypes is None:
+                dtypes = [column.dtype for column in columns]
+            for f, column in zip(files, columns):
+                f.write(column.tobytes())
+            count += len(ticks)
+        if dtypes is None:
+            ticks, columns = _DecodeColumns(decoder, [])
+            dtypes = [column.dtype for column in [ticks] + columns]
+        for f, dtype in zip(files, dtypes):
+            f.seek(0)
+            f.write(_NpyHeader(dtype, count))
+    finally:
+        for f in files:
+            f.close()
+    return count
+
+
+def LoadTraceColumns(directory, mmap_mode="r"):
+    """
+    Load columns exported by ExportTraceColumns, memory mapped by default
+    """
+    _require_numpy()
+    res = {}
+    for fname in sorted(os.listdir(directory)):
+        name, ext = os.path.splitext(fname)
+        if ext == ".npy":
+            res[name] = numpy.load(os.path.join(directory, fname), mmap_mode=mmap_mode)
+    return res
+
+
+def ExportRecordedTraces(recorder, directory, fromtick=0, totick=0xFFFFFFFF):
+    """
+    Export samples recorded by a TraceRecorder in given ticks range, one
+    sub-directory of columns per recorded segment. Segments recorded
+    without variables IEC types can't be exported and are skipped.
+    Returns list of (sub-directory, count of samples).
+    """
+    _require_numpy()
+    res = []
+    for path in recorder.segment_paths():
+        try:
+            # opened apart so that recording goes on during export
+            segment = TraceSegment.open(path)
+        except (OSError, ValueError):
+            # removed by recorder in the meantime
+            continue
+        try:
+            if not segment.iectypes:
+                continue
+            name = os.path.splitext(os.path.basename(path))[0]
+            subdir = os.path.join(directory, name)
+            count = ExportTraceColumns(
+                subdir, segment.iectypes, segment.samples(fromtick, totick)
+            )
+            res.append((subdir, count))
+        finally:
+            segment.close()
+    return res
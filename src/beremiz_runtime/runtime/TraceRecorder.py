@@ -0,0 +1,332 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of Beremiz runtime.
+#
+# See COPYING.Runtime file for copyrights details.
+
+import mmap
+import os
+from bisect import bisect_right
+from struct import Struct
+from threading import Lock
+from time import time
+
+SegmentMagic = b"BRZTRACE"
+SegmentVersion = 1
+
+# magic, version, debug token, creation time, end of records, types length
+SegmentHeader = Struct("=8sIIdQI")
+# end of records in segment header, updated on each append
+_EndOffset = 24
+_EndField = Struct("=Q")
+# tick, size, followed by raw debug buffer
+RecordHeader = Struct("=II")
+# tick, offset of record in segment
+IndexEntry = Struct("=IQ")
+
+DefaultSegmentSize = 16 * 1024 * 1024
+DefaultSegmentAge = 3600
+DefaultMaxSegments = 16
+# count of records between two sparse index entries
+IndexInterval = 64
+
+
+class TraceSegment(object):
+    """
+    Memory mapped file holding raw debug buffers of one variable
+    registration, preallocated to its maximum size. A sparse tick index
+    is kept aside in a .idx file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.indexpath = os.path.splitext(path)[0] + ".idx"
+        self.index = []
+        self._indexfile = None
+        self.writable = False
+
+    @classmethod
+    def create(cls, path, size, token, iectypes):
+        self = cls(path)
+        types = ",".join(iectypes or []).encode()
+        self.token = token
+        self.iectypes = list(iectypes or [])
+        self.created = time()
+        self.start = SegmentHeader.size + len(types)
+        if self.start + RecordHeader.size >= size:
+            raise ValueError("Trace segment size too small")
+        fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.ftruncate(fd, size)
+            self.mm = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+        SegmentHeader.pack_into(
+            self.mm,
+            0,
+            SegmentMagic,
+            SegmentVersion,
+            token,
+            self.created,
+            self.start,
+            len(types),
+        )
+        self.mm[SegmentHeader.size : self.start] = types
+        self.end = self.start
+        self.count = 0
+        self._indexfile = open(self.indexpath, "wb")
+        self.writable = True
+        return self
+
+    @classmethod
+    def open(cls, path):
+        """
+        Open existing segment read-only, i.e. left by a previous run
+        """
+        self = cls(path)
+        with open(path, "rb") as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.token, self.created, self.end, typeslen = (
+            SegmentHeader.unpack_from(self.mm)
+        )
+        if magic != SegmentMagic or version != SegmentVersion:
+            self.mm.close()
+            raise ValueError("Not a trace segment : " + path)
+        self.start = SegmentHeader.size + typeslen
+        types = self.mm[SegmentHeader.size : self.start].decode()
+        self.iectypes = types.split(",") if types else []
+        self.end = min(self.end, len(self.mm))
+        self._load_index()
+        return self
+
+    def _load_index(self):
+        try:
+            with open(self.indexpath, "rb") as f:
+                data = f.read()
+        except OSError:
+            data = b""
+        data = data[: len(data) - len(data) % IndexEntry.size]
+        self.index = [
+            entry for entry in IndexEntry.iter_unpack(data) if entry[1] < self.end
+        ]
+        if not self.index:
+            # rebuild sparse index from records
+            for n, (tick, offset) in enumerate(self._records(self.start)):
+                if n % IndexInterval == 0:
+                    self.index.append((tick, offset))
+
+    def _records(self, offset):
+        mm = self.mm
+        end = self.end
+        while offset + RecordHeader.size <= end:
+            tick, size = RecordHeader.unpack_from(mm, offset)
+            data = offset + RecordHeader.size
+            if data + size > end:
+                break
+            yield tick, offset
+            offset = data + size
+
+    def append(self, tick, buff):
+        """
+        Copy one raw debug buffer in segment.
+        Returns False if segment is full
+        """
+        size = len(buff)
+        offset = self.end
+        data = offset + RecordHeader.size
+        if data + size > len(self.mm):
+            return False
+        RecordHeader.pack_into(self.mm, offset, tick, size)
+        self.mm[data : data + size] = buff
+        if self.count % IndexInterval == 0:
+            self.index.append((tick, offset))
+            self._indexfile.write(IndexEntry.pack(tick, offset))
+        self.count += 1
+        self.end = data + size
+        # committed once end is updated
+        _EndField.pack_into(self.mm, _EndOffset, self.end)
+        return True
+
+    @property
+    def firsttick(self):
+        return self.index[0][0] if self.index else None
+
+    def samples(self, fromtick, totick):
+        """
+        Generate (tick, bytes) samples with fromtick <= tick <= totick
+        """
+        keys = [tick for tick, _offset in self.index]
+        # start from last indexed record before fromtick
+        pos = bisect_right(keys, fromtick) - 1
+        offset = self.index[pos][1] if pos >= 0 else self.start
+        for tick, offset in self._records(offset):
+            if tick > totick:
+                break
+            if tick >= fromtick:
+                data = offset + RecordHeader.size
+                _tick, size = RecordHeader.unpack_from(self.mm, offset)
+                yield tick, self.mm[data : data + size]
+
+    def close(self):
+        if self._indexfile is not None:
+            self._indexfile.close()
+            self._indexfile = None
+        if self.writable:
+            self.mm.flush()
+            self.mm.close()
+            # give back preallocated space
+            os.truncate(self.path, self.end)
+            self.writable = False
+        else:
+            self.mm.close()
+
+    def remove(self):
+        self.close()
+        for path in (self.path, self.indexpath):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+class TraceRecorder(object):
+    """
+    Records raw debug buffers in segmented memory mapped files, for post
+    mortem analysis. A new segment is started when current one is full,
+    older than given age, or variable registration changed. Oldest
+    segments are removed to keep at most maxsegments.
+    Recordings from previous runs found in directory are kept and can
+    be queried.
+    """
+
+    def __init__(
+        self,
+        directory,
+        segmentsize=DefaultSegmentSize,
+        segmentage=DefaultSegmentAge,
+        maxsegments=DefaultMaxSegments,
+    ):
+        self.directory = directory
+        self.segmentsize = segmentsize
+        self.segmentage = segmentage
+        self.maxsegments = maxsegments
+        self.lock = Lock()
+        self.segments = None
+        self.current = None
+        self.lasttick = None
+        self.sequence = 0
+
+    def _load(self):
+        if self.segments is not None:
+            return
+        self.segments = []
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+        for fname in sorted(os.listdir(self.directory)):
+            name, ext = os.path.splitext(fname)
+            if ext != ".seg":
+                continue
+            try:
+                self.segments.append(
+                    TraceSegment.open(os.path.join(self.directory, fname))
+                )
+                self.sequence = max(self.sequence, int(name) + 1)
+            except Exception:
+                pass
+
+    def _close_current(self):
+        if self.current is not None:
+            self.current.close()
+            # reopen read-only to keep it available for queries
+            idx = self.segments.index(self.current)
+            self.segments[idx] = TraceSegment.open(self.current.path)
+            self.current = None
+
+    def _rotate(self, token, iectypes):
+        self._close_current()
+        while len(self.segments) >= self.maxsegments:
+            self.segments.pop(0).remove()
+        path = os.path.join(self.directory, "%08d.seg" % self.sequence)
+        self.sequence += 1
+        self.current = TraceSegment.create(path, self.segmentsize, token, iectypes)
+        self.segments.append(self.current)
+
+    def _append(self, token, iectypes, tick, buff):
+        current = self.current
+        if (
+            current is None
+            or current.token != token
+            or (self.lasttick is not None and tick < self.lasttick)
+            or time() - current.created > self.segmentage
+        ):
+            self._rotate(token, iectypes)
+        if not self.current.append(tick, buff):
+            self._rotate(token, iectypes)
+            if not self.current.append(tick, buff):
+                # bigger than a segment, drop it
+                return False
+        self.lasttick = tick
+        return True
+
+    def extend(self, token, iectypes, samples):
+        """
+        Record (tick, bytes-like) raw debug buffers, registered with
+        given debug token. Returns count of recorded samples.
+        """
+        with self.lock:
+            self._load()
+            return sum(
+                self._append(token, iectypes, tick, buff) for tick, buff in samples
+            )
+
+    def stop(self):
+        """
+        Close current segment. Next recorded sample starts a new one.
+        """
+        with self.lock:
+            self._close_current()
+            self.lasttick = None
+
+    def samples(self, fromtick, totick, maxsamples=None):
+        """
+        Recorded (tick, bytes) samples with fromtick <= tick <= totick,
+        oldest first, from all segments.
+        Segments are opened apart and read without holding recorder lock,
+        so that recording isn't blocked by a large query.
+        """
+        res = []
+        for path in self.segment_paths():
+            try:
+                segment = TraceSegment.open(path)
+            except (OSError, ValueError):
+                # removed by recorder in the meantime
+                continue
+            try:
+                for sample in segment.samples(fromtick, totick):
+                    if maxsamples is not None and len(res) >= maxsamples:
+                        return res
+                    res.append(sample)
+            finally:
+                segment.close()
+        return res
+
+    def segment_paths(self):
+        """
+        Paths of recorded segments, oldest first
+        """
+        with self.lock:
+            self._load()
+            return [s.path for s in self.segments]
+
+    def segments_info(self):
+        """
+        List of (creation time, debug token, iectypes, first tick, size)
+        describing recorded segments, oldest first.
+        """
+        with self.lock:
+            self._load()
+            return [
+                (s.created, s.token, s.iectypes, s.firsttick, s.end)
+                for s in self.segments
+            ]
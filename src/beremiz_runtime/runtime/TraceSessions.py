@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of Beremiz runtime.
+#
+# See COPYING.Runtime file for copyrights details.
+
+from time import time
+
+from beremiz_runtime.runtime.TraceStore import TraceRingBuffer
+from beremiz_runtime.runtime.typemapping import GetTraceDecoder
+
+DefaultSessionBudget = 256 * 1024
+
+
+class TraceSession(object):
+    """
+    Variables traced for one client, and samples not yet polled
+    """
+
+    def __init__(self, sid, budget):
+        self.sid = sid
+        self.orders = []
+        self.iectypes = []
+        self.token = 0
+        # sessions updated last take precedence when forcing same variable
+        self.updated = 0
+        self.Traces = TraceRingBuffer(budget)
+        self.LastSwap = time()
+        # position of session variables in merged registration
+        self.positions = []
+        # contiguous (start, end) byte ranges of session variables in
+        # merged samples, when merged layout is fixed
+        self.ranges = None
+
+
+class TraceSessionMux(object):
+    """
+    Merges variables requested by several trace sessions into a single
+    debugger registration, and demultiplexes merged samples into
+    per-session samples. Variables are reference counted, they stay
+    registered as long as a session traces them.
+
+    Demultiplexing relies on variables IEC types, sessions must give them.
+    """
+
+    def __init__(self, budget=DefaultSessionBudget):
+        self.budget = budget
+        self.sessions = {}
+        self.nextsid = 1
+        self.updates = 0
+        # True when current registration results from merge()
+        self.active = False
+        self.orders = []
+        self.iectypes = []
+        self.refcounts = {}
+        self.decoder = None
+
+    def get(self, sid):
+        return self.sessions.get(sid)
+
+    def open(self):
+        sid = self.nextsid
+        self.nextsid += 1
+        self.sessions[sid] = TraceSession(sid, self.budget)
+        return sid
+
+    def close(self, sid):
+        return self.sessions.pop(sid, None) is not None
+
+    def reset(self):
+        """
+        Drop all sessions, i.e. when a client takes over whole registration
+        """
+        self.sessions.clear()
+        self.active = False
+
+    def expire(self, timeout):
+        """
+        Close sessions that weren't polled for given time.
+        Returns True if some session was closed.
+        """
+        now = time()
+        expired = [
+            sid
+            for sid, session in self.sessions.items()
+            if now - session.LastSwap > timeout
+        ]
+        for sid in expired:
+            del self.sessions[sid]
+        return bool(expired)
+
+    def set(self, sid, orders, iectypes):
+        """
+        Change variables traced by a session.
+        Returns new session token, or negative error
+        """
+        session = self.sessions.get(sid)
+        if session is None:
+            return -1
+        if len(orders) != len(iectypes):
+            return -2
+        # raises KeyError if a type isn't supported by debugger
+        GetTraceDecoder(tuple(iectypes))
+        self.updates += 1
+        session.orders = list(orders)
+        session.iectypes = list(iectypes)
+        session.updated = self.updates
+        session.token += 1
+        session.Traces.clear()
+        session.LastSwap = time()
+        return session.token
+
+    def merge(self):
+        """
+        Compute union of variables of all sessions, in order of first
+        request, and how to extract each session's samples from it.
+        Returns merged list of (idx, force) and list of IEC types.
+        """
+        positions = {}
+        forces = {}
+        orders = []
+        iectypes = []
+        refcounts = {}
+        for session in self.sessions.values():
+            for (idx, force), iectype in zip(session.orders, session.iectypes):
+                if idx not in positions:
+                    positions[idx] = len(orders)
+                    orders.append(idx)
+                    iectypes.append(iectype)
+                    refcounts[idx] = 0
+                refcounts[idx] += 1
+                if force is not None:
+                    updated, _force = forces.get(idx, (-1, None))
+                    if session.updated > updated:
+                        forces[idx] = (session.updated, force)
+
+        self.orders = [(idx, forces.get(idx, (None, None))[1]) for idx in orders]
+        self.iectypes = iectypes
+        self.refcounts = refcounts
+        self.decoder = GetTraceDecoder(tuple(iectypes)) if iectypes else None
+
+        for session in self.sessions.values():
+            session.positions = [positions[idx] for idx, _force in session.orders]
+            session.ranges = None
+            if self.decoder is not None and self.decoder.fixedspans is not None:
+                ranges = []
+                for pos in session.positions:
+                    start, end = self.decoder.fixedspans[pos]
+                    if ranges and ranges[-1][1] == start:
+                        ranges[-1] = (ranges[-1][0], end)
+                    else:
+                        ranges.append((start, end))
+                session.ranges = ranges
+
+        return self.orders, self.iectypes
+
+    def distribute(self, samples):
+        """
+        Split merged (tick, buffer) samples into sessions samples
+        """
+        decoder = self.decoder
+        if decoder is None:
+            return
+        sessions = [s for s in self.sessions.values() if s.positions]
+        for tick, buff in samples:
+            spans = decoder.spans(buff)
+            if spans is None:
+                continue
+            for session in sessions:
+                ranges = session.ranges
+                if ranges is None:
+                    ranges = [spans[pos] for pos in session.positions]
+                if len(ranges) == 1:
+                    start, end = ranges[0]
+                    session.Traces.append(tick, buff[start:end])
+                else:
+                    session.Traces.append(
+                        tick, b"".join(buff[start:end] for start, end in ranges)
+                    )
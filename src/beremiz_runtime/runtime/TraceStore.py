@@ -0,0 +1,235 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of Beremiz runtime.
+#
+# See COPYING.Runtime file for copyrights details.
+
+import ctypes
+from array import array
+
+# Same 1MB cap as former list based PLCObject.Traces
+DefaultTraceBudget = 1024 * 1024
+
+# Used to size tick index when maximum sample count isn't given
+MinAverageSampleSize = 8
+
+
+class _Ring(object):
+    """
+    Preallocated bytes and index arrays for one ring of samples
+    """
+
+    def __init__(self, budget, maxsamples):
+        self.budget = budget
+        self.maxsamples = maxsamples
+        self.data = bytearray(budget)
+        self.view = memoryview(self.data)
+        # keep ctypes export alive, it pins bytearray and gives its address
+        self._cdata = (ctypes.c_char * budget).from_buffer(self.data)
+        self.address = ctypes.addressof(self._cdata)
+        self.ticks = array("L", [0]) * maxsamples
+        self.offsets = array("L", [0]) * maxsamples
+        self.sizes = array("L", [0]) * maxsamples
+        self.clear()
+
+    def clear(self):
+        self.first = 0
+        self.count = 0
+        self.tail = 0
+
+    def evict(self):
+        self.count -= 1
+        if self.count:
+            self.first = (self.first + 1) % self.maxsamples
+        else:
+            self.clear()
+
+    def reserve(self, tick, size):
+        """
+        Find room for a sample of given size, evicting oldest samples
+        if needed. Samples are never split, if sample doesn't fit at the
+        end of the ring, ring wraps.
+        Returns offset in ring and count of evicted samples
+        """
+        evicted = 0
+        if self.count == self.maxsamples:
+            self.evict()
+            evicted += 1
+        pos = self.tail
+        if pos + size > self.budget:
+            # samples located after tail are left from previous lap
+            # and are the oldest ones
+            while self.count and self.offsets[self.first] >= pos:
+                self.evict()
+                evicted += 1
+            pos = 0
+        end = pos + size
+        while self.count and pos <= self.offsets[self.first] < end:
+            self.evict()
+            evicted += 1
+        last = (self.first + self.count) % self.maxsamples
+        self.ticks[last] = tick
+        self.offsets[last] = pos
+        self.sizes[last] = size
+        self.count += 1
+        self.tail = end
+        return pos, evicted
+
+    def samples(self, copy):
+        res = []
+        idx = self.first
+        view = self.view
+        for _i in range(self.count):
+            offset = self.offsets[idx]
+            data = view[offset : offset + self.sizes[idx]]
+            res.append((self.ticks[idx], bytes(data) if copy else data))
+            idx = (idx + 1) % self.maxsamples
+        return res
+
+
+class TraceRingBuffer(object):
+    """
+    Byte budgeted store of (tick, TraceBuffer) samples.
+
+    Sample bytes go in a preallocated bytearray used as a ring, ticks,
+    offsets and sizes in preallocated arrays. Appending a sample and
+    evicting the oldest one are O(1) and do not allocate.
+
+    Two rings are used in turn : swap() hands out samples of the ring
+    filled so far and makes the other one current. swap() copies samples
+    to bytes, swap_views() hands out memoryviews on the ring instead,
+    that are only valid until next swap, for a caller keeping them to
+    itself.
+
+    Not thread safe, caller must serialize access.
+    """
+
+    def __init__(self, budget=DefaultTraceBudget, maxsamples=None):
+        if maxsamples is None:
+            maxsamples = max(1, budget // MinAverageSampleSize)
+        self.budget = budget
+        self.maxsamples = maxsamples
+        self._rings = (_Ring(budget, maxsamples), _Ring(budget, maxsamples))
+        self._current = self._rings[0]
+        self.dropped = 0
+
+    def __len__(self):
+        return self._current.count
+
+    def _reserve(self, tick, size):
+        if size == 0 or size > self.budget:
+            self.dropped += 1
+            return None
+        pos, evicted = self._current.reserve(tick, size)
+        self.dropped += evicted
+        return pos
+
+    def append(self, tick, data):
+        """
+        Copy given bytes-like sample into ring
+        """
+        size = len(data)
+        pos = self._reserve(tick, size)
+        if pos is None:
+            return False
+        self._current.view[pos : pos + size] = data
+        return True
+
+    def append_from(self, tick, address, size):
+        """
+        Copy sample directly from given memory address into ring,
+        i.e. from buffer returned by PLC's GetDebugData
+        """
+        pos = self._reserve(tick, size)
+        if pos is None:
+            return False
+        ctypes.memmove(self._current.address + pos, address, size)
+        return True
+
+    def extend(self, samples):
+        """
+        Copy given (tick, bytes-like) samples into ring
+        """
+        for tick, data in samples:
+            self.append(tick, data)
+
+    def _swap(self, copy):
+        ring = self._current
+        res = ring.samples(copy)
+        self._current = self._rings[1] if ring is self._rings[0] else self._rings[0]
+        self._current.clear()
+        return res
+
+    def swap(self):
+        """
+        Return list of (tick, bytes) for all stored samples, oldest
+        first, and start filling the other ring.
+        """
+        return self._swap(True)
+
+    def swap_views(self):
+        """
+        Same as swap() without copy, returned memoryviews are overwritten
+        once ring is filled again after next swap
+        """
+        return self._swap(False)
+
+    def clear(self):
+        for ring in self._rings:
+            ring.clear()
+
+
+class TraceAcquisitionStats(object):
+    """
+    Counters of trace thread, and adaptive count of samples handed out
+    per batch, so that a batch lasts about batchperiod seconds whatever
+    the PLC cycle rate. PLC library lock hold is counted per acquisition.
+    """
+
+    def __init__(self, batchperiod, maxbatch):
+        self.batchperiod = batchperiod
+        self.maxbatch = maxbatch
+        self.reset()
+
+    def reset(self):
+        self.samples = 0
+        self.batches = 0
+        self.locks = 0
+        self.lockhold = 0.0
+        self.maxlockhold = 0.0
+        # smoothed seconds in between samples
+        self.period = None
+        self.batchsize = 1
+
+    def hold(self, lockhold):
+        self.locks += 1
+        self.lockhold += lockhold
+        self.maxlockhold = max(self.maxlockhold, lockhold)
+
+    def update(self, nsamples, elapsed):
+        self.samples += nsamples
+        self.batches += 1
+        if nsamples:
+            period = elapsed / nsamples
+            if self.period is None:
+                self.period = period
+            else:
+                self.period += (period - self.period) * 0.2
+            if self.period > 0:
+                self.batchsize = int(
+                    min(self.maxbatch, max(1, self.batchperiod / self.period))
+                )
+            else:
+                self.batchsize = self.maxbatch
+
+    def GetStatistics(self):
+        return {
+            "samples": self.samples,
+            "batches": self.batches,
+            "samples_per_second": 1.0 / self.period if self.period else 0.0,
+            "batch_size": self.batchsize,
+            "lock_hold_total": self.lockhold,
+            "lock_hold_max": self.maxlockhold,
+            "lock_hold_mean": self.lockhold / self.locks if self.locks else 0.0,
+        }
@@ -39,6 +39,7 @@ from twisted.python.components import registerAdapter
 
 from beremiz_runtime.i18n import _
 from beremiz_runtime.runtime import GetPLCObjectSingleton
+from beremiz_runtime.runtime.AsyncPLCObject import AsDeferred
 
 mandatoryConfigItems = ["ID", "active", "realm", "url"]
 
@@ -56,15 +57,39 @@ ExposedCalls = [
     ("GetPLCstatus", {}),
     ("GetPLCID", {}),
     ("SeedBlob", {}),
+    ("SeedCompressedBlob", {}),
+    ("SeedDeltaBlob", {}),
     ("AppendChunkToBlob", {}),
     ("PurgeBlobs", {}),
+    ("HaveBlobs", {}),
+    ("OpenBlobUpload", {}),
+    ("WriteBlobChunk", {}),
+    ("FinishBlobUpload", {}),
+    ("CancelBlobUpload", {}),
     ("NewPLC", {}),
     ("RepairPLC", {}),
     ("MatchMD5", {}),
+    ("QueryMD5", {}),
+    ("GetInstallReport", {}),
     ("SetTraceVariablesList", {}),
+    ("UpdateTraceVariablesList", {}),
+    ("ForceVariables", {}),
+    ("ForceVariableValues", {}),
     ("GetTraceVariables", {}),
+    ("GetTimedTraceVariables", {}),
+    ("GetTraceClock", {}),
+    ("SetTraceDecimation", {}),
+    ("SetTraceRecording", {}),
+    ("GetRecordedTraces", {}),
+    ("GetTraceStatistics", {}),
+    ("GetWorkerMetrics", {}),
+    ("OpenTraceSession", {}),
+    ("CloseTraceSession", {}),
+    ("SetTraceSessionVariables", {}),
+    ("GetTraceSessionVariables", {}),
     ("RemoteExec", {}),
     ("GetLogMessage", {}),
+    ("GetLogMessages", {}),
     ("ResetLogCount", {}),
 ]
 
@@ -135,7 +160,10 @@ class WampSession(wamp.ApplicationSession):
                 registerOptions = None
                 print(_("TypeError register option: {}".format(e)))
 
-            self.register(GetCallee(name), ".".join((ID, name)), registerOptions)
+            # don't block reactor while PLCObject is busy
+            self.register(
+                AsDeferred(GetCallee(name)), ".".join((ID, name)), registerOptions
+            )
 
         for name in SubscribedEvents:
             self.subscribe(GetCallee(name), str(name))
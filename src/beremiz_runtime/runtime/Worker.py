@@ -8,7 +8,15 @@
 # See COPYING.Runtime file for copyrights details.
 
 
-from threading import Condition, Lock, Thread, get_ident
+from concurrent.futures import CancelledError, Future
+from functools import partial
+from heapq import heappop, heappush
+from itertools import count
+from threading import Condition, Lock, Thread, current_thread, get_ident
+from time import perf_counter
+
+# Priority of jobs submitted through call(), lower runs first
+DefaultPriority = 0
 
 
 class job(object):
@@ -21,37 +29,67 @@ class job(object):
         self.result = None
         self.success = None
         self.exc_info = None
+        self.future = Future()
+        # timing, see worker.observer
+        self.caller = current_thread().name
+        self.queued = self.started = self.finished = perf_counter()
+        self.contended = False
 
     def do(self):
         """
         do the job by executing the call, and deal with exceptions
         """
+        self.started = perf_counter()
+        if not self.future.set_running_or_notify_cancel():
+            # cancelled through its future while queued
+            self.success = False
+            self.exc_info = CancelledError()
+            self.finished = self.started
+            return
         try:
             call, args, kwargs = self.job
             self.result = call(*args, **kwargs)
             self.success = True
+            self.finished = perf_counter()
+            self.future.set_result(self.result)
         except Exception as e:
             self.success = False
             self.exc_info = e
+            self.finished = perf_counter()
+            self.future.set_exception(e)
+
+    def interrupt(self):
+        """
+        job won't be done, worker is quitting
+        """
+        if self.future.set_running_or_notify_cancel():
+            self.future.set_exception(EOFError("Worker job was interrupted"))
 
 
 class worker(object):
     """
     serialize main thread load/unload of PLC shared objects
+
+    Jobs are queued and done in order of priority, then in order of
+    submission. call() blocks until job is done, submit() returns a
+    concurrent.futures.Future.
     """
 
     def __init__(self):
-        # Only one job at a time
         self._finish = False
         self._threadID = None
         self.mutex = Lock()
         self.todo = Condition(self.mutex)
         self.done = Condition(self.mutex)
-        self.free = Condition(self.mutex)
+        # heap of (priority, sequence, job)
+        self.queue = []
+        self.sequence = count()
         self.job = None
         self.enabled = False
         self.stopper = None
         self.own_thread = None
+        # called with each done job, i.e. WorkerMetrics.observe
+        self.observer = None
 
     def reraise(self, job):
         """
@@ -60,6 +98,26 @@ class worker(object):
         """
         raise job.exc_info
 
+    def _observe(self, job):
+        observer = self.observer
+        if observer is not None:
+            observer(job)
+
+    def _next_job(self):
+        """
+        wait for a job to do, mutex being held.
+        returns None if worker is finishing
+        """
+        self.todo.wait_for(lambda: self.queue or self._finish)
+        if self._finish:
+            return None
+        return heappop(self.queue)[2]
+
+    def _interrupt_queued(self):
+        while self.queue:
+            heappop(self.queue)[2].interrupt()
+        self.done.notify_all()
+
     def runloop(self, *args, **kwargs):
         """
         meant to be called by worker thread (blocking)
@@ -75,15 +133,19 @@ class worker(object):
                 self.reraise(self.job)
             self.job = None
 
-        self.free.notify()
-
         while not self._finish:
-            self.todo.wait_for(lambda: self.job is not None)
+            self.job = self._next_job()
+            if self.job is None:
+                break
+            # let other threads queue jobs meanwhile
+            self.mutex.release()
             self.job.do()
-            self.done.notify()
+            self._observe(self.job)
+            self.mutex.acquire()
             self.job = None
-            self.free.notify()
+            self.done.notify_all()
 
+        self._interrupt_queued()
         self.mutex.release()
 
     def interleave(self, waker, stopper, *args, **kwargs):
@@ -95,9 +157,10 @@ class worker(object):
         self._threadID = get_ident()
         self.stopper = stopper
 
-        def do_pending_job():
+        def do_pending_job(_job):
+            _job.do()
+            self._observe(_job)
             self.mutex.acquire()
-            self.job.do()
             self.done.notify_all()
             self.mutex.release()
 
@@ -108,24 +171,22 @@ class worker(object):
             # Handle first job
             if args or kwargs:
                 self.job = job(*args, **kwargs)
-                waker(do_pending_job)
+                waker(partial(do_pending_job, self.job))
                 self.done.wait_for(lambda: self.job.success is not None)
                 # fail if first job fails
                 if not self.job.success:
                     self.reraise(self.job)
                 self.job = None
 
-            self.free.notify()
-
             while not self._finish:
-                self.todo.wait_for(lambda: self.job is not None)
-                if self._finish:
+                self.job = self._next_job()
+                if self.job is None:
                     break
-                waker(do_pending_job)
-                self.done.wait_for(lambda: self.job.success is not None)
+                waker(partial(do_pending_job, self.job))
+                self.done.wait_for(lambda: self._finish or self.job.success is not None)
                 self.job = None
-                self.free.notify()
 
+            self._interrupt_queued()
             self.mutex.release()
 
         self.own_thread = Thread(target=wakerfeedingloop)
@@ -138,12 +199,54 @@ class worker(object):
         self.mutex.acquire()
         self._finish = True
         self.enabled = False
-        self.job = None
         self.todo.notify()
         self.done.notify_all()
         self.mutex.release()
         self.own_thread.join()
 
+    def _queue(self, priority, jobs):
+        """
+        queue jobs, mutex being held
+        """
+        if not self.enabled:
+            raise EOFError("Worker is disabled")
+        # jobs will have to wait for others
+        contended = bool(self.queue) or self.job is not None
+        for _job in jobs:
+            _job.contended = contended
+            # next jobs of batch wait for this one
+            contended = True
+            heappush(self.queue, (priority, next(self.sequence), _job))
+        self.todo.notify()
+
+    def submit_prioritized(self, priority, *args, **kwargs):
+        """
+        creates a job to be executed in worker thread, after jobs of
+        lower priority value and former jobs of same priority.
+        returns a concurrent.futures.Future, that must not be waited for
+        from worker thread
+        """
+        _job = job(*args, **kwargs)
+        with self.mutex:
+            self._queue(priority, [_job])
+        return _job.future
+
+    def submit(self, *args, **kwargs):
+        """
+        same as submit_prioritized, with default priority
+        """
+        return self.submit_prioritized(DefaultPriority, *args, **kwargs)
+
+    def submit_batch(self, calls, priority=DefaultPriority):
+        """
+        queue many (call, args, kwargs) jobs at once, done in given order.
+        returns list of futures
+        """
+        jobs = [job(call, *args, **kwargs) for call, args, kwargs in calls]
+        with self.mutex:
+            self._queue(priority, jobs)
+        return [_job.future for _job in jobs]
+
     def call(self, *args, **kwargs):
         """
         creates a job, execute it in worker thread, and deliver result.
@@ -157,20 +260,17 @@ class worker(object):
         if self._threadID == get_ident():
             # if caller is worker thread execute immediately
             _job.do()
+            self._observe(_job)
         else:
-            # otherwise notify and wait for completion
+            # otherwise queue and wait for completion
             self.mutex.acquire()
-            if not self.enabled:
+            try:
+                self._queue(DefaultPriority, [_job])
+                self.done.wait_for(
+                    lambda: _job.success is not None or _job.future.done()
+                )
+            finally:
                 self.mutex.release()
-                raise EOFError("Worker is disabled")
-
-            self.free.wait_for(lambda: self.job is None)
-
-            self.job = _job
-            self.todo.notify()
-            self.done.wait_for(lambda: _job.success is not None)
-            self.free.notify()
-            self.mutex.release()
 
         if _job.success is None:
             raise EOFError("Worker job was interrupted")
@@ -188,9 +288,8 @@ class worker(object):
         self._finish = True
         self.mutex.acquire()
         self.enabled = False
-        self.job = None
         self.todo.notify()
-        self.done.notify()
+        self.done.notify_all()
         self.mutex.release()
 
     def finish(self):
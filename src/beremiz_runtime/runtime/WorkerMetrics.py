@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of Beremiz runtime.
+#
+# See COPYING.Runtime file for copyrights details.
+
+from array import array
+from collections import Counter
+from threading import Lock
+
+# Histogram buckets are exact below 2 ** (SubBucketBits + 1) microseconds,
+# then each power of two is split in 2 ** SubBucketBits buckets, giving
+# about 6% precision whatever the magnitude.
+SubBucketBits = 4
+_SubBuckets = 1 << SubBucketBits
+# Largest recorded latency, bigger ones are counted in last bucket
+MaxLatencyBits = 37  # ~38 hours in microseconds
+_BucketCount = (MaxLatencyBits - SubBucketBits + 1) * _SubBuckets
+
+# Caller threads are counted individually up to this count per method
+MaxCallerThreads = 16
+
+
+def _bucket_index(value):
+    if value < 2 * _SubBuckets:
+        return value
+    shift = value.bit_length() - SubBucketBits - 1
+    return min(shift * _SubBuckets + (value >> shift), _BucketCount - 1)
+
+
+def _bucket_middle(index):
+    if index < 2 * _SubBuckets:
+        return index
+    shift = index // _SubBuckets - 1
+    return ((index % _SubBuckets + _SubBuckets) << shift) + (1 << shift) // 2
+
+
+class LatencyHistogram(object):
+    """
+    Fixed memory log-linear histogram of latencies in microseconds,
+    HdrHistogram style
+    """
+
+    def __init__(self):
+        self.counts = array("Q", [0]) * _BucketCount
+        self.reset()
+
+    def reset(self):
+        for i in range(_BucketCount):
+            self.counts[i] = 0
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    def record(self, seconds):
+        value = max(0, int(seconds * 1000000))
+        self.counts[_bucket_index(value)] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, percent):
+        """
+        Middle of bucket holding given percentile, in microseconds
+        """
+        if not self.count:
+            return 0
+        rank = max(1, int(self.count * percent / 100.0 + 0.5))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return max(self.min, min(_bucket_middle(index), self.max))
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "min_us": self.min or 0,
+            "max_us": self.max,
+            "mean_us": self.total / self.count if self.count else 0.0,
+            "p50_us": self.percentile(50),
+            "p90_us": self.percentile(90),
+            "p99_us": self.percentile(99),
+            "p999_us": self.percentile(99.9),
+        }
+
+
+class MethodMetrics(object):
+    """
+    Latencies of jobs of one method
+    """
+
+    def __init__(self):
+        self.wait = LatencyHistogram()
+        self.execution = LatencyHistogram()
+        self.contended = 0
+        self.failed = 0
+        self.callers = Counter()
+
+    def summary(self):
+        return {
+            "queue_wait": self.wait.summary(),
+            "execution": self.execution.summary(),
+            "contended": self.contended,
+            "failed": self.failed,
+            "callers": dict(self.callers),
+        }
+
+
+class WorkerMetrics(object):
+    """
+    Per method metrics of jobs done by a worker : time spent queued,
+    execution time, caller threads, and count of jobs that found worker
+    busy or other jobs queued (contention).
+    """
+
+    def __init__(self):
+        self.lock = Lock()
+        self.methods = {}
+
+    def observe(self, job):
+        """
+        Account a done job, see Worker.job
+        """
+        call = job.job[0]
+        name = getattr(call, "__name__", repr(call))
+        with self.lock:
+            metrics = self.methods.get(name)
+            if metrics is None:
+                metrics = self.methods[name] = MethodMetrics()
+            metrics.wait.record(job.started - job.queued)
+            metrics.execution.record(job.finished - job.started)
+            if job.contended:
+                metrics.contended += 1
+            if not job.success:
+                metrics.failed += 1
+            caller = job.caller
+            if (
+                caller not in metrics.callers
+                and len(metrics.callers) >= MaxCallerThreads
+            ):
+                caller = "other"
+            metrics.callers[caller] += 1
+
+    def reset(self):
+        with self.lock:
+            self.methods.clear()
+
+    def summary(self):
+        """
+        Metrics of all methods as a dict, JSON serializable
+        """
+        with self.lock:
+            return dict(
+                (name, metrics.summary()) for name, metrics in self.methods.items()
+            )
+
+    def dump(self):
+        """
+        Metrics of all methods as a text table
+        """
+        lines = [
+            "%-28s %8s %10s %10s %10s %10s %10s %6s"
+            % (
+                "method",
+                "count",
+                "wait p50",
+                "wait p99",
+                "exec p50",
+                "exec p99",
+                "exec max",
+                "cont.",
+            )
+        ]
+        for name, res in sorted(self.summary().items()):
+            wait, execution = res["queue_wait"], res["execution"]
+            lines.append(
+                "%-28s %8d %8dus %8dus %8dus %8dus %8dus %6d"
+                % (
+                    name,
+                    execution["count"],
+                    wait["p50_us"],
+                    wait["p99_us"],
+                    execution["p50_us"],
+                    execution["p99_us"],
+                    execution["max_us"],
+                    res["contended"],
+                )
+            )
+        return "\n".join(lines)
@@ -5,6 +5,7 @@
 # This file is part of Beremiz runtime
 # See COPYING.Runtime file for copyrights details.
 
+import json
 import sys
 import traceback
 from inspect import getmembers, isfunction
@@ -16,9 +17,13 @@ from beremiz_runtime.erpc_interface.erpc_PLCObject.common import (
     PSKID,
     PLCstatus,
     PLCstatus_enum,
+    TimedTraceVariables,
     TraceVariables,
+    blob_range,
     log_message,
+    trace_clock,
     trace_sample,
+    trace_update,
 )
 from beremiz_runtime.erpc_interface.erpc_PLCObject.interface import (
     IBeremizPLCObjectService,
@@ -47,39 +52,119 @@ def TranslatedReturnAsLastOutput(translator):
     return wrapper
 
 
+TraceVariablesTranslator = TranslatedReturnAsLastOutput(
+    lambda res: TraceVariables(
+        getattr(PLCstatus_enum, res[0]),
+        [trace_sample(*sample) for sample in res[1]],
+    )
+)
+
+
+def TraceOrdersTranslator(orders):
+    # force binaries are given as is, no need to copy them
+    return [(order.idx, order.force if len(order.force) else None) for order in orders]
+
+
 ReturnWrappers = {
     "AppendChunkToBlob": ReturnAsLastOutput,
+    "CloseTraceSession": ReturnAsLastOutput,
+    "FinishBlobUpload": ReturnAsLastOutput,
+    "ForceVariables": ReturnAsLastOutput,
+    "GetInstallReport": TranslatedReturnAsLastOutput(json.dumps),
     "GetLogMessage": TranslatedReturnAsLastOutput(lambda res: log_message(*res)),
+    "GetLogMessages": TranslatedReturnAsLastOutput(
+        lambda res: [log_message(*message) for message in res]
+    ),
     "GetPLCID": TranslatedReturnAsLastOutput(lambda res: PSKID(*res)),
     "GetPLCstatus": TranslatedReturnAsLastOutput(
         lambda res: PLCstatus(getattr(PLCstatus_enum, res[0]), res[1])
     ),
-    "GetTraceVariables": TranslatedReturnAsLastOutput(
-        lambda res: TraceVariables(
+    "GetRecordedTraces": TraceVariablesTranslator,
+    "GetTimedTraceVariables": TranslatedReturnAsLastOutput(
+        lambda res: TimedTraceVariables(
             getattr(PLCstatus_enum, res[0]),
-            [trace_sample(*sample) for sample in res[1]],
+            trace_clock(*res[1]),
+            [trace_sample(*sample) for sample in res[2]],
         )
     ),
+    "GetTraceClock": TranslatedReturnAsLastOutput(lambda res: trace_clock(*res)),
+    "GetTraceSessionVariables": TraceVariablesTranslator,
+    "GetTraceVariables": TraceVariablesTranslator,
+    "GetWorkerMetrics": TranslatedReturnAsLastOutput(json.dumps),
+    "HaveBlobs": ReturnAsLastOutput,
     "MatchMD5": ReturnAsLastOutput,
     "NewPLC": ReturnAsLastOutput,
+    "OpenBlobUpload": TranslatedReturnAsLastOutput(
+        lambda res: [blob_range(*missing) for missing in res]
+    ),
+    "OpenTraceSession": ReturnAsLastOutput,
+    "QueryMD5": ReturnAsLastOutput,
     "SeedBlob": ReturnAsLastOutput,
+    "SeedCompressedBlob": ReturnAsLastOutput,
+    "SeedDeltaBlob": ReturnAsLastOutput,
+    "SetTraceDecimation": ReturnAsLastOutput,
+    "SetTraceRecording": ReturnAsLastOutput,
+    "SetTraceSessionVariables": ReturnAsLastOutput,
     "SetTraceVariablesList": ReturnAsLastOutput,
+    "SetTypedTraceVariablesList": ReturnAsLastOutput,
     "StopPLC": ReturnAsLastOutput,
+    "StreamTraceVariables": TraceVariablesTranslator,
+    "UpdateTraceVariablesList": TranslatedReturnAsLastOutput(
+        lambda res: trace_update(*res)
+    ),
+    "WriteBlobChunk": ReturnAsLastOutput,
 }
 
 ArgsWrappers = {
     "AppendChunkToBlob": lambda data, blobID: (data, bytes(blobID)),
+    "CancelBlobUpload": lambda digest: (bytes(digest),),
+    "FinishBlobUpload": lambda digest: (bytes(digest),),
+    "ForceVariables": lambda debugToken, forces: (
+        debugToken,
+        TraceOrdersTranslator(forces),
+    ),
+    "HaveBlobs": lambda digests: ([bytes(digest) for digest in digests],),
     "NewPLC": lambda md5sum, plcObjectBlobID, extrafiles: (
         md5sum,
         bytes(plcObjectBlobID),
         [(f.fname, bytes(f.blobID)) for f in extrafiles],
     ),
-    "SetTraceVariablesList": lambda orders: (
-        [
-            (order.idx, None if len(order.force) == 0 else bytes(order.force))
-            for order in orders
-        ],
+    "OpenBlobUpload": lambda digest, size: (bytes(digest), size),
+    "SeedDeltaBlob": lambda seed, baseMD5, compression, digest: (
+        seed,
+        baseMD5,
+        compression,
+        bytes(digest),
+    ),
+    "SetTraceDecimation": lambda debugToken, iectypes, window, unit: (
+        debugToken,
+        window,
+        unit,
+        iectypes,
+    ),
+    "SetTraceSessionVariables": lambda session, orders, iectypes: (
+        session,
+        TraceOrdersTranslator(orders),
+        iectypes,
+    ),
+    "SetTraceVariablesList": lambda orders: (TraceOrdersTranslator(orders),),
+    "SetTypedTraceVariablesList": lambda orders, iectypes: (
+        TraceOrdersTranslator(orders),
+        iectypes or None,
+    ),
+    # server is single threaded, waiting would stall all other calls
+    "StreamTraceVariables": lambda debugToken, minSamples, maxDelayMs: (
+        debugToken,
+        minSamples,
+        0,
+    ),
+    "UpdateTraceVariablesList": lambda debugToken, adds, removes, iectypes: (
+        debugToken,
+        TraceOrdersTranslator(adds),
+        removes,
+        iectypes or None,
     ),
+    "WriteBlobChunk": lambda digest, offset, data: (bytes(digest), offset, data),
 }
 
 
@@ -4,11 +4,12 @@
 # See COPYING.Runtime file for copyrights details.
 #
 
+import sys
 from ctypes import (
-    POINTER,
+    BigEndianStructure,
+    LittleEndianStructure,
     Structure,
     c_char,
-    c_char_p,
     c_double,
     c_float,
     c_int8,
@@ -20,11 +21,11 @@ from ctypes import (
     c_uint16,
     c_uint32,
     c_uint64,
-    c_void_p,
-    cast,
     sizeof,
 )
 from datetime import timedelta as td
+from functools import lru_cache
+from struct import Struct, calcsize
 
 
 class IEC_STRING(Structure):
@@ -85,9 +86,40 @@ SameEndianessTypeTranslator = {
     "DT": _ttime(),
 }
 
-SwapedEndianessTypeTranslator = {
-    # TODO
-}
+# Byte order of targets whose endianess differs from host, as a struct
+# module prefix, and matching ctypes swapped types
+if sys.byteorder == "little":
+    SwapedByteOrder = ">"
+    _SwapedStructure = BigEndianStructure
+    _swaped_ctype = "__ctype_be__"
+else:
+    SwapedByteOrder = "<"
+    _SwapedStructure = LittleEndianStructure
+    _swaped_ctype = "__ctype_le__"
+
+
+class IEC_TIME_SWAPED(_SwapedStructure):
+    """
+    IEC_TIME of a target with swaped endianess
+    """
+
+    _fields_ = IEC_TIME._fields_
+
+
+def _swaped(translation):
+    t, u, p = translation
+    if t is IEC_STRING:
+        # only made of bytes
+        return translation
+    if t is IEC_TIME:
+        return (IEC_TIME_SWAPED, u, p)
+    return (getattr(t, _swaped_ctype), u, p)
+
+
+SwapedEndianessTypeTranslator = dict(
+    (iectype, _swaped(translation))
+    for iectype, translation in SameEndianessTypeTranslator.items()
+)
 
 TypeTranslator = SameEndianessTypeTranslator
 
@@ -101,41 +133,355 @@ DebugTypesSize = dict(
 )
 
 
-def UnpackDebugBuffer(buff, indexes):
-    res = []
-    buffoffset = 0
-    buffsize = len(buff)
-    buffptr = cast(cast(buff, c_char_p), c_void_p).value
-    for iectype in indexes:
-        c_type, unpack_func, _pack_func = TypeTranslator.get(
-            iectype, (None, None, None)
-        )
-
-        cursor = c_void_p(buffptr + buffoffset)
-        if iectype == "STRING":
-            # strlen is stored in c_uint8 and sizeof(c_uint8) is 1
-            # first check we can read size
-            if (buffoffset + 1) <= buffsize:
-                size = 1 + cast(cursor, POINTER(c_type)).contents.len
+def _struct_code(c_type):
+    """
+    struct module code, with standard size, for a ctypes scalar type
+    """
+    code = c_type._type_
+    if code in "fd":
+        return code
+    signed = c_type(-1).value < 0
+    code = {1: "b", 2: "h", 4: "i", 8: "q"}[sizeof(c_type)]
+    return code if signed else code.upper()
+
+
+def _struct_format(c_type):
+    if issubclass(c_type, Structure):
+        return "".join(_struct_code(f_type) for _name, f_type in c_type._fields_)
+    return _struct_code(c_type)
+
+
+def _time_from_values(s, ns):
+    return td(0, s, ns / 1000.0)
+
+
+# Conversion applied to raw values unpacked by struct for a given IEC type.
+# Types not listed here are unpacked as a single value, used as is.
+_ValueConverters = {
+    "BOOL": bool,
+    "TIME": _time_from_values,
+    "TOD": _time_from_values,
+    "DATE": _time_from_values,
+    "DT": _time_from_values,
+}
+
+
+class _FixedSegment(object):
+    """
+    Consecutive fixed size variables, unpacked with a single Struct
+    """
+
+    def __init__(self, byteorder):
+        self.byteorder = byteorder
+        self.formats = []
+        self.plan = []
+        self.convert = False
+
+    def add(self, iectype, c_type):
+        fmt = _struct_format(c_type)
+        converter = _ValueConverters.get(iectype)
+        self.formats.append(fmt)
+        self.plan.append((len(fmt), converter))
+        self.convert = self.convert or converter is not None
+
+    def compile(self):
+        self.struct = Struct(self.byteorder + "".join(self.formats))
+        self.size = self.struct.size
+
+    def values(self, raw):
+        if not self.convert:
+            return raw
+        res = []
+        i = 0
+        for n, converter in self.plan:
+            if converter is None:
+                res.append(raw[i])
+            elif n == 1:
+                res.append(converter(raw[i]))
             else:
-                return None
-        else:
-            size = sizeof(c_type)
+                res.append(converter(*raw[i : i + n]))
+            i += n
+        return res
+
+
+class TraceDecoder(object):
+    """
+    Decoder for debug buffers of a given list of IEC types, compiled once
+    for a variable list registration. Fixed size variables are grouped in
+    segments unpacked by a single struct.Struct each, only variable length
+    STRINGs split buffer in several segments.
+    """
 
-        if c_type is not None and (buffoffset + size) <= buffsize:
-            ptr = cast(cursor, POINTER(c_type))
-            value = unpack_func(ptr.contents)
-            buffoffset += size
-            res.append(value)
+    def __init__(self, iectypes, translator=None, byteorder="="):
+        if translator is None:
+            translator = TypeTranslator
+        self.iectypes = tuple(iectypes)
+        self.byteorder = byteorder
+        self.segments = []
+        # struct format and size of each variable in buffer,
+        # None if variable length
+        self.formats = []
+        self.sizes = []
+        segment = None
+        for iectype in self.iectypes:
+            if iectype == "STRING":
+                segment = None
+                self.segments.append(None)
+                self.formats.append(None)
+                self.sizes.append(None)
+                continue
+            # raises KeyError if type isn't supported by debugger
+            c_type, _unpack_func, _pack_func = translator[iectype]
+            if segment is None:
+                segment = _FixedSegment(byteorder)
+                self.segments.append(segment)
+            segment.add(iectype, c_type)
+            fmt = _struct_format(c_type)
+            self.formats.append(fmt)
+            self.sizes.append(calcsize(byteorder + fmt))
+        for segment in self.segments:
+            if segment is not None:
+                segment.compile()
+        if len(self.segments) == 1 and self.segments[0] is not None:
+            self.fixedsize = self.segments[0].size
+            self.fixedspans = []
+            offset = 0
+            for size in self.sizes:
+                self.fixedspans.append((offset, offset + size))
+                offset += size
         else:
-            return None
-    if buffoffset and buffoffset == buffsize:
-        return res
-    return None
+            self.fixedsize = None
+            self.fixedspans = None
+
+    def decode(self, buff):
+        """
+        Decode one debug buffer into a list of values.
+        Returns None if buffer doesn't match variable list.
+        """
+        buffsize = len(buff)
+        if self.fixedsize is not None:
+            if buffsize != self.fixedsize:
+                return None
+            segment = self.segments[0]
+            return list(segment.values(segment.struct.unpack_from(buff)))
+
+        res = []
+        offset = 0
+        for segment in self.segments:
+            if segment is None:
+                # strlen is stored in c_uint8
+                if offset + 1 > buffsize:
+                    return None
+                end = offset + 1 + buff[offset]
+                if end > buffsize:
+                    return None
+                res.append(bytes(buff[offset + 1 : end]).decode())
+                offset = end
+            else:
+                if offset + segment.size > buffsize:
+                    return None
+                res.extend(segment.values(segment.struct.unpack_from(buff, offset)))
+                offset += segment.size
+        if offset and offset == buffsize:
+            return res
+        return None
+
+    def spans(self, buff):
+        """
+        List of (start, end) offsets of each variable in given debug
+        buffer, or None if buffer doesn't match variable list
+        """
+        buffsize = len(buff)
+        if self.fixedsize is not None:
+            return self.fixedspans if buffsize == self.fixedsize else None
+        res = []
+        offset = 0
+        for size in self.sizes:
+            if size is None:
+                if offset + 1 > buffsize:
+                    return None
+                size = 1 + buff[offset]
+            end = offset + size
+            if end > buffsize:
+                return None
+            res.append((offset, end))
+            offset = end
+        if offset and offset == buffsize:
+            return res
+        return None
+
+    def decode_batch(self, buffers):
+        """
+        Decode a sequence of debug buffers, i.e. (tick, TraceBuffer) samples
+        second members. Returns a list with one list of values per buffer,
+        None for buffers not matching variable list.
+        """
+        if self.fixedsize is not None:
+            segment = self.segments[0]
+            size = self.fixedsize
+            if not segment.convert and all(len(b) == size for b in buffers):
+                # single pass over concatenated buffers
+                return list(map(list, segment.struct.iter_unpack(b"".join(buffers))))
+        return list(map(self.decode, buffers))
 
 
-def ValueToIECBytes(iectype, value):
+@lru_cache(maxsize=32)
+def GetTraceDecoder(iectypes, swaped=False):
+    """
+    Get compiled decoder for given tuple of IEC types, for debug buffers
+    of host endianess, or of swaped endianess if swaped is True.
+    Swaped values are swaped by struct while unpacking, at same cost.
+    """
+    if swaped:
+        return TraceDecoder(iectypes, SwapedEndianessTypeTranslator, SwapedByteOrder)
+    return TraceDecoder(iectypes)
+
+
+def UnpackDebugBuffer(buff, indexes, swaped=False):
+    try:
+        decoder = GetTraceDecoder(tuple(indexes), swaped)
+    except KeyError:
+        return None
+    return decoder.decode(buff)
+
+
+def _time_to_values(value):
+    return value.days * 24 * 3600 + value.seconds, value.microseconds * 1000
+
+
+def _string_to_values(value):
+    body = value.encode() if isinstance(value, str) else value
+    if len(body) > IEC_STRING.body.size:
+        # as ctypes, instead of silently truncating body
+        raise ValueError("String too long for IEC STRING")
+    return len(body), body
+
+
+# Conversion of a value to raw values packed by struct for a given IEC type,
+# reverse of _ValueConverters.
+# Types not listed here are packed as a single value, used as is.
+_RawConverters = {
+    "STRING": _string_to_values,
+    "TIME": _time_to_values,
+    "TOD": _time_to_values,
+    "DATE": _time_to_values,
+    "DT": _time_to_values,
+}
+
+
+def _raw_values(value):
+    return (value,)
+
+
+def _wrapped_integer(bits, signed):
+    # wraps out of range values as ctypes does
+    mask = (1 << bits) - 1
+    sign = 1 << (bits - 1)
+
+    def to_raw(value):
+        value &= mask
+        if signed and value & sign:
+            value -= mask + 1
+        return (value,)
+
+    return to_raw
+
+
+def _rounded_float(value):
+    # out of range values become infinite as with ctypes
+    return (c_float(value).value,)
+
+
+def _raw_converter(iectype, fmt):
+    converter = _RawConverters.get(iectype)
+    if converter is not None:
+        return converter
+    code = fmt[-1:]
+    if len(fmt) == 1 and code in "bBhHiIlLqQ":
+        return _wrapped_integer(calcsize(code) * 8, code.islower())
+    if fmt == "f":
+        return _rounded_float
+    return _raw_values
+
+
+def _packed_format(iectype, swaped):
+    if iectype == "STRING":
+        # whole IEC_STRING is forced, body padded with zeros
+        return "B%ds" % IEC_STRING.body.size
+    translator = SwapedEndianessTypeTranslator if swaped else TypeTranslator
+    c_type, _unpack_func, _pack_func = translator[iectype]
+    return _struct_format(c_type)
+
+
+@lru_cache(maxsize=None)
+def _ValuePacker(iectype, swaped=False):
+    byteorder = SwapedByteOrder if swaped else "="
+    fmt = _packed_format(iectype, swaped)
+    return Struct(byteorder + fmt), _raw_converter(iectype, fmt)
+
+
+def ValueToIECBytes(iectype, value, swaped=False):
     if value is None:
         return None
-    c_type, _unpack_func, pack_func = TypeTranslator[iectype]
-    return bytes(pack_func(c_type, value))
+    packer, to_raw = _ValuePacker(iectype, swaped)
+    return packer.pack(*to_raw(value))
+
+
+class ForcesPacker(object):
+    """
+    Packs values of a list of variables of given IEC types in a single
+    buffer with a single struct.Struct, compiled once per list of types.
+    """
+
+    def __init__(self, iectypes, swaped=False):
+        self.iectypes = tuple(iectypes)
+        byteorder = SwapedByteOrder if swaped else "="
+        formats = [_packed_format(iectype, swaped) for iectype in self.iectypes]
+        self.struct = Struct(byteorder + "".join(formats))
+        self.converters = [
+            _raw_converter(iectype, fmt) for iectype, fmt in zip(self.iectypes, formats)
+        ]
+        self.spans = []
+        offset = 0
+        for fmt in formats:
+            size = calcsize(byteorder + fmt)
+            self.spans.append((offset, offset + size))
+            offset += size
+
+    def pack(self, values):
+        """
+        Returns buffer holding all given values, and a memoryview on
+        buffer for each value
+        """
+        raw = []
+        for to_raw, value in zip(self.converters, values):
+            raw.extend(to_raw(value))
+        buff = bytearray(self.struct.size)
+        self.struct.pack_into(buff, 0, *raw)
+        view = memoryview(buff)
+        return buff, [view[start:end] for start, end in self.spans]
+
+
+@lru_cache(maxsize=32)
+def GetForcesPacker(iectypes, swaped=False):
+    """
+    Get compiled ForcesPacker for given tuple of IEC types
+    """
+    return ForcesPacker(iectypes, swaped)
+
+
+def PackForces(forces, swaped=False):
+    """
+    Pack list of (idx, iectype, value) forces in a single buffer.
+    Returns buffer, and list of (idx, force) where force is a memoryview
+    on buffer, or None for values that are None (unforce).
+    """
+    forced = [
+        (idx, iectype, value) for idx, iectype, value in forces if value is not None
+    ]
+    packer = GetForcesPacker(tuple(iectype for _idx, iectype, _value in forced), swaped)
+    buff, views = packer.pack([value for _idx, _iectype, value in forced])
+    views = iter(views)
+    return buff, [
+        (idx, None if value is None else next(views)) for idx, _iectype, value in forces
+    ]
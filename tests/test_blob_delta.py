@@ -0,0 +1,64 @@
+import os
+import random
+
+import pytest
+
+from beremiz_runtime.runtime.BlobDelta import DeltaDecoder, MakeDelta
+
+
+def _decode(basepath, delta, chunksize):
+    decoder = DeltaDecoder(basepath)
+    out = bytearray()
+    for pos in range(0, len(delta), chunksize):
+        for decoded in decoder.decode(delta[pos : pos + chunksize]):
+            out += decoded
+    for decoded in decoder.flush():
+        out += decoded
+    return bytes(out)
+
+
+@pytest.fixture
+def base(tmp_path):
+    data = random.Random(0).randbytes(64 * 1024)
+    path = tmp_path / "base"
+    path.write_bytes(data)
+    return str(path), data
+
+
+@pytest.mark.parametrize("chunksize", [1, 7, 4096, 1 << 20])
+def test_round_trip(base, chunksize):
+    basepath, data = base
+    target = (
+        data[:1000] + b"inserted" + data[1000:30000] + os.urandom(100) + data[40000:]
+    )
+    delta = MakeDelta(data, target)
+    assert len(delta) < len(target) // 10
+    assert _decode(basepath, delta, chunksize) == target
+
+
+def test_round_trip_unrelated(base):
+    basepath, data = base
+    target = b"nothing in common"
+    assert _decode(basepath, MakeDelta(data, target), 3) == target
+    assert _decode(basepath, MakeDelta(data, b""), 3) == b""
+
+
+def test_truncated_delta(base):
+    basepath, data = base
+    delta = MakeDelta(data, data[100:])
+    with pytest.raises(ValueError):
+        _decode(basepath, delta[:-1], 16)
+
+
+def test_data_after_end(base):
+    basepath, data = base
+    delta = MakeDelta(data, data[100:])
+    with pytest.raises(ValueError):
+        _decode(basepath, delta + b"\x00", 16)
+
+
+def test_copy_out_of_base(tmp_path):
+    path = tmp_path / "base"
+    path.write_bytes(b"short")
+    with pytest.raises(ValueError):
+        _decode(str(path), MakeDelta(b"longer base" * 10, b"longer base" * 10), 16)
@@ -0,0 +1,104 @@
+import time
+
+from beremiz_runtime.runtime.BlobManager import BlobManager
+from beremiz_runtime.runtime.BlobStream import BlobStream, GetBlobDecoder
+
+
+class FakeBlob(object):
+    def __init__(self, complete=True, resident=0, fd=None):
+        self.fd = fd
+        self.resident = resident
+        self._complete = complete
+        self.busy = False
+        self.discarded = False
+
+    def complete(self):
+        return self._complete
+
+    def suspend(self):
+        if self.busy:
+            return False
+        self.fd = None
+        return True
+
+    def spill(self):
+        self.fd = 3
+        self.resident = 0
+
+    def discard(self):
+        self.discarded = True
+
+
+def test_ttl_discards_only_incomplete_blobs():
+    manager = BlobManager(0.05, 16, 1024)
+    complete, incomplete = FakeBlob(), FakeBlob(complete=False)
+    manager.put("complete", complete)
+    manager.put("incomplete", incomplete)
+    time.sleep(0.1)
+    assert manager.pop("incomplete") is None
+    assert incomplete.discarded
+    assert manager.pop("complete") is complete
+    assert not complete.discarded
+    assert manager.evicted == 1
+
+
+def test_touched_blob_not_expired():
+    manager = BlobManager(0.2, 16, 1024)
+    blob = FakeBlob(complete=False)
+    manager.put("blob", blob)
+    for _i in range(3):
+        time.sleep(0.1)
+        assert manager.get("blob") is blob
+    manager.clear()
+    assert blob.discarded
+
+
+def test_limits_never_discard():
+    manager = BlobManager(60, 2, 100)
+    blobs = [FakeBlob(resident=40) for _i in range(5)]
+    for i, blob in enumerate(blobs):
+        manager.put(i, blob)
+    assert len(manager) == 5
+    assert not any(blob.discarded for blob in blobs)
+    # least recently touched ones were spilled, then closed
+    assert [blob.resident for blob in blobs] == [0, 0, 0, 40, 40]
+    assert [blob.fd for blob in blobs] == [None, 3, 3, None, None]
+    manager.clear()
+
+
+def test_busy_blob_kept_open():
+    manager = BlobManager(60, 1, 0)
+    busy = FakeBlob(fd=3)
+    busy.busy = True
+    manager.put("busy", busy)
+    manager.put("idle", FakeBlob(fd=4))
+    assert busy.fd == 3
+    manager.clear()
+
+
+def test_blob_streams_survive_limits(tmp_path):
+    manager = BlobManager(60, 2, 1000)
+    content = {}
+    for i in range(10):
+        blob = BlobStream(str(tmp_path), b"seed", memorysize=600)
+        data = bytes([i]) * 500
+        blob.append(data)
+        manager.put(i, blob)
+        content[i] = data
+    blob = manager.pop(0)
+    blob.append(b"more")
+    content[0] += b"more"
+    manager.put(0, blob)
+    for i, data in content.items():
+        blob = manager.pop(i)
+        blob.finish()
+        with open(blob.path, "rb") as f:
+            assert f.read() == data
+        blob.discard()
+
+
+def test_incomplete_compressed_stream(tmp_path):
+    blob = BlobStream(str(tmp_path), b"seed", decoder=GetBlobDecoder("zlib"))
+    assert not blob.complete()
+    blob.discard()
+    assert BlobStream(str(tmp_path), b"seed").complete()
@@ -0,0 +1,92 @@
+import hashlib
+import os
+import stat
+
+import pytest
+
+from beremiz_runtime.runtime.BlobStore import BlobStore, StoreMTime
+
+
+def _stage(store, content):
+    digest = hashlib.sha256(content).digest()
+    path = store.upload_path(digest)
+    with open(path, "wb") as f:
+        f.write(content)
+    return digest, path
+
+
+def test_add_read_only(tmp_path):
+    store = BlobStore(str(tmp_path / "blobs"))
+    digest, path = _stage(store, b"content")
+    dst = store.add(path, digest)
+    assert not os.path.exists(path)
+    assert dst == store.path(digest)
+    st = os.stat(dst)
+    assert int(st.st_mtime) == StoreMTime
+    assert not st.st_mode & stat.S_IWUSR
+    assert store.has(digest)
+    assert store.size(digest) == len(b"content")
+    # adding again drops the duplicate
+    digest, path = _stage(store, b"content")
+    assert store.add(path, digest) == dst
+    assert not os.path.exists(path)
+
+
+def test_has(tmp_path):
+    store = BlobStore(str(tmp_path / "blobs"))
+    assert not store.has(b"short")
+    assert not store.has(hashlib.sha256(b"none").digest())
+    digest, path = _stage(store, b"content")
+    store.add(path, digest)
+    # written through a hard link
+    os.utime(store.path(digest))
+    assert not store.has(digest)
+    assert not os.path.exists(store.path(digest))
+
+
+def test_install(tmp_path):
+    store = BlobStore(str(tmp_path / "blobs"))
+    digest, path = _stage(store, b"content")
+    store.add(path, digest)
+    linked = str(tmp_path / "linked")
+    assert store.install(digest, linked, link=True) == "link"
+    assert os.path.samefile(linked, store.path(digest))
+    copied = str(tmp_path / "copied")
+    assert store.install(digest, copied) in ("reflink", "copy")
+    assert not os.path.samefile(copied, store.path(digest))
+    assert os.stat(copied).st_mode & stat.S_IWUSR
+    with open(copied, "ab") as f:
+        f.write(b" changed")
+    assert store.has(digest)
+    # installing replaces former file
+    assert store.install(digest, copied) in ("reflink", "copy")
+    with open(copied, "rb") as f:
+        assert f.read() == b"content"
+    with pytest.raises(KeyError):
+        store.install(hashlib.sha256(b"none").digest(), copied)
+
+
+def test_missing_digests_collect(tmp_path):
+    store = BlobStore(str(tmp_path / "blobs"))
+    kept, path = _stage(store, b"kept")
+    store.add(path, kept)
+    dropped, path = _stage(store, b"dropped")
+    store.add(path, dropped)
+    absent = hashlib.sha256(b"absent").digest()
+    assert store.missing([kept, absent]) == [absent]
+    assert sorted(store.digests()) == sorted([kept, dropped])
+    # recently stored files are spared
+    store.collect({kept}, 60)
+    assert store.has(dropped)
+    store.collect({kept}, -1)
+    assert store.has(kept)
+    assert not store.has(dropped)
+    assert list(store.digests()) == [kept]
+
+
+def test_uploads_cleared(tmp_path):
+    directory = str(tmp_path / "blobs")
+    store = BlobStore(directory)
+    digest, path = _stage(store, b"partial")
+    BlobStore(directory)
+    assert not os.path.exists(path)
@@ -0,0 +1,102 @@
+import hashlib
+import os
+import zlib
+
+import pytest
+
+from beremiz_runtime.runtime.BlobStream import BlobStream, GetBlobDecoder
+
+CONTENT = bytes(range(256)) * 64
+
+
+def _read(stream):
+    with open(stream.path, "rb") as f:
+        return f.read()
+
+
+def _upload(tmp_path, chunks, compression=None):
+    stream = BlobStream(str(tmp_path), b"seed", GetBlobDecoder(compression))
+    for chunk in chunks:
+        blobID = stream.append(chunk)
+    return stream, blobID
+
+
+def test_plain(tmp_path):
+    stream, blobID = _upload(tmp_path, [CONTENT[:100], CONTENT[100:]])
+    assert blobID == hashlib.md5(b"seed" + CONTENT).digest()
+    assert stream.finish() == hashlib.sha256(CONTENT).digest()
+    assert _read(stream) == CONTENT
+
+
+def test_zlib_same_blob_id(tmp_path):
+    plain, plainID = _upload(tmp_path, [CONTENT])
+    compressed = zlib.compress(CONTENT)
+    stream, blobID = _upload(tmp_path, [compressed[:10], compressed[10:]], "zlib")
+    assert blobID == plainID
+    assert stream.finish() == plain.finish()
+    assert _read(stream) == CONTENT
+
+
+def test_zstd(tmp_path):
+    zstandard = pytest.importorskip("zstandard")
+    compressed = zstandard.ZstdCompressor().compress(CONTENT)
+    stream, blobID = _upload(tmp_path, [compressed], "zstd")
+    assert blobID == hashlib.md5(b"seed" + CONTENT).digest()
+    assert stream.finish() == hashlib.sha256(CONTENT).digest()
+    assert _read(stream) == CONTENT
+
+
+def test_truncated_zlib(tmp_path):
+    stream, blobID = _upload(tmp_path, [zlib.compress(CONTENT)[:-8]], "zlib")
+    with pytest.raises(ValueError, match="Invalid zlib stream"):
+        stream.finish()
+
+
+def test_unsupported_compression():
+    assert GetBlobDecoder(None) is None
+    assert GetBlobDecoder("") is None
+    with pytest.raises(ValueError):
+        GetBlobDecoder("lzma")
+
+
+def test_expected_digest_mismatch(tmp_path):
+    stream = BlobStream(
+        str(tmp_path), b"seed", expected=hashlib.sha256(b"other").digest()
+    )
+    stream.append(CONTENT)
+    with pytest.raises(ValueError):
+        stream.finish()
+
+
+def test_memory_then_spill(tmp_path):
+    stream = BlobStream(str(tmp_path), b"seed", memorysize=1000)
+    stream.append(CONTENT[:600])
+    assert stream.path is None and stream.resident == 600
+    stream.append(CONTENT[600:1200])
+    assert stream.path is not None and stream.resident == 0
+    stream.suspend()
+    assert stream.fd is None
+    stream.append(CONTENT[1200:])
+    assert stream.finish() == hashlib.sha256(CONTENT).digest()
+    assert _read(stream) == CONTENT
+    stream.discard()
+    assert os.listdir(str(tmp_path)) == []
+
+
+def test_small_blob_written_when_finished(tmp_path):
+    stream = BlobStream(str(tmp_path), b"seed", memorysize=1000)
+    stream.append(b"small")
+    assert os.listdir(str(tmp_path)) == []
+    stream.finish()
+    assert _read(stream) == b"small"
+
+
+def test_complete(tmp_path):
+    compressed = zlib.compress(CONTENT)
+    stream = BlobStream(str(tmp_path), b"seed", GetBlobDecoder("zlib"))
+    assert BlobStream(str(tmp_path), b"seed").complete()
+    stream.append(compressed[:-8])
+    assert not stream.complete()
+    stream.append(compressed[-8:])
+    assert stream.complete()
+    stream.discard()
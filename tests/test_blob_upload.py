@@ -0,0 +1,67 @@
+import hashlib
+
+import pytest
+
+from beremiz_runtime.runtime.BlobUpload import BlobUpload, RangeSet
+
+
+def test_rangeset_merges_overlapping_and_adjacent():
+    ranges = RangeSet()
+    ranges.add(10, 20)
+    ranges.add(30, 40)
+    assert ranges.bounds == [10, 20, 30, 40]
+    ranges.add(20, 25)
+    assert ranges.bounds == [10, 25, 30, 40]
+    ranges.add(15, 35)
+    assert ranges.bounds == [10, 40]
+    ranges.add(0, 50)
+    assert ranges.bounds == [0, 50]
+    ranges.add(5, 5)
+    assert ranges.covered() == 50
+
+
+def test_rangeset_missing():
+    ranges = RangeSet()
+    assert ranges.missing(10) == [(0, 10)]
+    ranges.add(2, 4)
+    ranges.add(6, 8)
+    assert ranges.missing(10) == [(0, 2), (4, 2), (8, 2)]
+    ranges.add(0, 10)
+    assert ranges.missing(10) == []
+
+
+def test_upload_out_of_order(tmp_path):
+    content = bytes(range(256)) * 4
+    upload = BlobUpload(
+        str(tmp_path / "upload"), len(content), hashlib.sha256(content).digest()
+    )
+    upload.write(512, content[512:])
+    assert upload.missing() == [(0, 512)]
+    upload.write(0, content[:512])
+    assert upload.complete()
+    assert upload.verify()
+    upload.close()
+    assert (tmp_path / "upload").read_bytes() == content
+
+
+def test_upload_digest_mismatch(tmp_path):
+    upload = BlobUpload(str(tmp_path / "upload"), 4, hashlib.sha256(b"good").digest())
+    upload.write(0, b"evil")
+    assert not upload.verify()
+    assert upload.missing() == [(0, 4)]
+    with pytest.raises(ValueError):
+        upload.write(2, b"abc")
+    upload.discard()
+    assert not (tmp_path / "upload").exists()
+    with pytest.raises(EOFError):
+        upload.write(0, b"good")
+
+
+def test_upload_suspended_reopens(tmp_path):
+    upload = BlobUpload(str(tmp_path / "upload"), 4, hashlib.sha256(b"good").digest())
+    upload.write(0, b"go")
+    assert upload.suspend()
+    assert upload.fd is None
+    upload.write(2, b"od")
+    assert upload.verify()
+    upload.close()
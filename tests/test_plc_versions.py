@@ -0,0 +1,94 @@
+import hashlib
+import os
+
+import pytest
+
+from beremiz_runtime.runtime.BlobStore import BlobStore
+from beremiz_runtime.runtime.PLCVersions import (
+    PLCVersionCache,
+    PLCVersionCached,
+    PLCVersionInstalled,
+    PLCVersionUnknown,
+)
+
+
+def _store(store, content):
+    digest = hashlib.sha256(content).digest()
+    path = store.upload_path(digest)
+    with open(path, "wb") as f:
+        f.write(content)
+    store.add(path, digest)
+    return digest
+
+
+def _cache(tmp_path, maxversions=8, maxbytes=1 << 20):
+    store = BlobStore(str(tmp_path / "blobs"))
+    cache = PLCVersionCache(
+        str(tmp_path / "versions"), store, maxversions, maxbytes, grace=-1
+    )
+    return store, cache
+
+
+def _add(cache, md5, *contents, used=None):
+    digests = [_store(cache.store, content) for content in contents]
+    cache.add(md5, digests[0], [("extra%d" % i, d) for i, d in enumerate(digests[1:])])
+    if used is not None:
+        os.utime(cache._path(md5), (used, used))
+    return digests
+
+
+def test_add_get_state(tmp_path):
+    store, cache = _cache(tmp_path)
+    library, extra = _add(cache, "aaaa", b"library", b"extra")
+    assert cache.get("aaaa") == (library, [("extra0", extra)])
+    assert cache.get("bbbb") is None
+    assert cache.state("aaaa", "aaaa") == PLCVersionInstalled
+    assert cache.state("aaaa", "bbbb") == PLCVersionCached
+    assert cache.state("bbbb", "aaaa") == PLCVersionUnknown
+
+
+def test_missing_file(tmp_path):
+    store, cache = _cache(tmp_path)
+    library, extra = _add(cache, "aaaa", b"library", b"extra")
+    os.remove(store.path(extra))
+    assert cache.get("aaaa") is None
+    assert cache.state("aaaa", "bbbb") == PLCVersionUnknown
+
+
+def test_evict_count(tmp_path):
+    store, cache = _cache(tmp_path, maxversions=2)
+    shared = _store(store, b"shared")
+    first = _add(cache, "v1", b"library1", used=1)[0]
+    cache.add("v2", _store(store, b"library2"), [("shared", shared)])
+    os.utime(cache._path("v2"), (2, 2))
+    _add(cache, "v3", b"library3", b"shared")
+    assert cache.versions() == ["v3", "v2"]
+    # files of forgotten versions leave the store, shared ones stay
+    assert not store.has(first)
+    assert store.has(shared)
+
+
+def test_evict_size_keeps_most_recent(tmp_path):
+    store, cache = _cache(tmp_path, maxbytes=100)
+    _add(cache, "small", b"x" * 50, used=1)
+    _add(cache, "big", b"y" * 200)
+    assert cache.versions() == ["big"]
+    assert cache.get("big") is not None
+
+
+def test_get_touches(tmp_path):
+    store, cache = _cache(tmp_path)
+    _add(cache, "v1", b"library1", used=1)
+    _add(cache, "v2", b"library2", used=2)
+    assert cache.versions() == ["v2", "v1"]
+    cache.get("v1")
+    assert cache.versions() == ["v1", "v2"]
+    cache.get("v2", touch=False)
+    assert cache.versions() == ["v1", "v2"]
+
+
+def test_invalid_md5(tmp_path):
+    store, cache = _cache(tmp_path)
+    with pytest.raises(ValueError):
+        cache.add("../evil", _store(store, b"library"), [])
+    assert cache.get("") is None
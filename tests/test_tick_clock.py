@@ -0,0 +1,74 @@
+import pytest
+
+from beremiz_runtime.runtime.TickClock import TickClock
+
+
+def _fill(clock, ticks, mono0=1000.0, period=0.001, real_offset=5e8):
+    for tick in ticks:
+        mono = mono0 + tick * period
+        clock.add(tick & 0xFFFFFFFF, mono, mono + real_offset)
+
+
+def test_estimate_needs_two_points():
+    clock = TickClock()
+    assert clock.estimate(0) is None
+    clock.add(0, 1.0, 2.0)
+    assert clock.estimate(0) is None
+    clock.add(10, 1.01, 2.01)
+    mono, real, slope = clock.estimate(20)
+    assert mono == pytest.approx(1.02)
+    assert real == pytest.approx(2.02)
+    assert slope == pytest.approx(0.001)
+
+
+def test_linear_fit():
+    clock = TickClock()
+    _fill(clock, range(0, 5000, 7))
+    mono, real, slope = clock.estimate(10000)
+    assert slope == pytest.approx(0.001, rel=1e-9)
+    assert mono == pytest.approx(1010.0, abs=1e-6)
+    assert real - mono == pytest.approx(5e8)
+
+
+def test_unwraps_ticks():
+    clock = TickClock()
+    start = 0xFFFFFFFF - 500
+    _fill(clock, range(start, start + 1000, 10))
+    assert clock.lasttick > 0xFFFFFFFF
+    # tick after wrap, given as 32 bits
+    mono, _real, _slope = clock.estimate((start + 2000) & 0xFFFFFFFF)
+    assert mono == pytest.approx(1000.0 + (start + 2000) * 0.001, abs=1e-6)
+
+
+def test_estimate_is_pure():
+    clock = TickClock()
+    _fill(clock, range(0, 100, 10))
+    lasttick = clock.lasttick
+    first = clock.estimate(1 << 20)
+    clock.estimate(5)
+    assert clock.lasttick == lasttick
+    assert clock.estimate(1 << 20) == first
+
+
+def test_precision_after_long_uptime():
+    clock = TickClock()
+    # a year of 1ms cycles
+    base = 365 * 24 * 3600 * 1000
+    _fill(clock, range(base, base + 200000, 100), mono0=0.0)
+    mono, _real, slope = clock.estimate((base + 200000) & 0xFFFFFFFF)
+    assert slope == pytest.approx(0.001, rel=1e-9)
+    assert mono == pytest.approx((base + 200000) * 0.001, abs=1e-4)
+
+
+def test_realtime_points():
+    clock = TickClock()
+    # ignored until offset is known from a monotonic point
+    clock.add_realtime(0, clock.started + 1)
+    assert clock.points == 0
+    clock.add(0, 10.0, clock.started + 10.0)
+    clock.add_realtime(100, clock.started + 10.1)
+    clock.add_realtime(200, clock.started - 1)
+    assert clock.points == 2
+    assert clock.estimate(100)[0] == pytest.approx(10.1)
+    clock.reset()
+    assert clock.estimate(100) is None
@@ -0,0 +1,63 @@
+from struct import pack
+
+import pytest
+
+from beremiz_runtime.runtime.TraceDecimator import (
+    TraceDecimator,
+    UnpackAggregatedBuffer,
+    WindowMilliseconds,
+)
+from beremiz_runtime.runtime.typemapping import GetTraceDecoder
+
+Decoder = GetTraceDecoder(("DINT", "BOOL"))
+
+
+def _sample(tick, value):
+    return tick, pack("=iB", value, value % 2)
+
+
+class FakeClock(object):
+    """Ticks of 1ms"""
+
+    def estimate(self, tick):
+        return tick / 1000.0, 0.0, 0.001
+
+
+def test_tick_windows():
+    decimator = TraceDecimator(Decoder, 10)
+    windows = [
+        window
+        for window in (decimator.feed(*_sample(tick, tick)) for tick in range(5, 25))
+        if window is not None
+    ]
+    windows.append(decimator.flush())
+    assert decimator.flush() is None
+    assert [tick for tick, _buff in windows] == [5, 10, 20]
+    count, aggregates = UnpackAggregatedBuffer(windows[1][1], 2)
+    assert count == 10
+    # min, max, mean, last
+    assert aggregates[0] == (10.0, 19.0, 14.5, 19.0)
+    assert aggregates[1] == (0.0, 1.0, 0.5, 1.0)
+
+
+def test_feed_batch_matches_feed():
+    samples = [_sample(tick, tick * 3) for tick in range(40)] + [(40, b"bad")]
+    one, batch = TraceDecimator(Decoder, 7), TraceDecimator(Decoder, 7)
+    expected = [w for w in (one.feed(*sample) for sample in samples) if w is not None]
+    assert batch.feed_batch(samples) == expected
+    assert batch.flush() == one.flush()
+
+
+def test_millisecond_windows_use_clock():
+    decimator = TraceDecimator(Decoder, 5, WindowMilliseconds, FakeClock())
+    res = decimator.feed_batch([_sample(tick, 1) for tick in range(12)])
+    assert [tick for tick, _buff in res] == [0, 5]
+    assert UnpackAggregatedBuffer(res[0][1], 2)[0] == 5
+
+
+def test_invalid_window():
+    with pytest.raises(ValueError):
+        TraceDecimator(Decoder, 0)
+    with pytest.raises(ValueError):
+        TraceDecimator(Decoder, 1, unit=42)
+    assert UnpackAggregatedBuffer(b"short", 2) is None
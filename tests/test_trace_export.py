@@ -0,0 +1,74 @@
+from datetime import timedelta
+
+import pytest
+
+from beremiz_runtime.runtime.TraceExport import (
+    ExportTraceColumns,
+    LoadTraceColumns,
+    TraceColumns,
+)
+from beremiz_runtime.runtime.typemapping import (
+    SwapedEndianessTypeTranslator,
+    TypeTranslator,
+)
+
+numpy = pytest.importorskip("numpy")
+
+IECTypes = ("DINT", "BOOL", "TIME", "LREAL")
+
+
+def _buffer(values, translator=TypeTranslator):
+    return b"".join(
+        bytes(pack_func(c_type, value))
+        for (c_type, _unpack_func, pack_func), value in (
+            (translator[iectype], value) for iectype, value in zip(IECTypes, values)
+        )
+    )
+
+
+def _samples(count, translator=TypeTranslator):
+    return [
+        (tick, _buffer([-tick, tick % 2, timedelta(0, tick, 1), tick / 2], translator))
+        for tick in range(count)
+    ]
+
+
+def _check(columns, count):
+    assert list(columns["tick"]) == list(range(count))
+    assert list(columns["var0"]) == [-tick for tick in range(count)]
+    assert columns["var1"].dtype == numpy.bool_
+    assert list(columns["var1"]) == [bool(tick % 2) for tick in range(count)]
+    assert columns["var2"][3] == numpy.timedelta64(3000001000, "ns")
+    assert list(columns["var3"]) == [tick / 2 for tick in range(count)]
+
+
+def test_trace_columns():
+    columns = TraceColumns(IECTypes, _samples(10) + [(99, b"bad")])
+    _check(columns, 10)
+
+
+def test_trace_columns_swaped():
+    columns = TraceColumns(
+        IECTypes, _samples(10, SwapedEndianessTypeTranslator), swaped=True
+    )
+    _check(columns, 10)
+
+
+def test_string_columns():
+    samples = [(1, b"\x02hi" + bytes(TypeTranslator["INT"][0](5)))]
+    columns = TraceColumns(["STRING", "INT"], samples, names=["s", "i"])
+    assert list(columns["s"]) == [b"hi"]
+    assert list(columns["i"]) == [5]
+    with pytest.raises(ValueError):
+        TraceColumns(["STRING"], samples, names=["tick"])
+
+
+def test_export_by_chunks(tmp_path):
+    directory = str(tmp_path / "columns")
+    assert (
+        ExportTraceColumns(directory, IECTypes, iter(_samples(25)), chunksize=7) == 25
+    )
+    columns = LoadTraceColumns(directory)
+    _check(columns, 25)
+    assert ExportTraceColumns(str(tmp_path / "empty"), IECTypes, []) == 0
+    assert len(LoadTraceColumns(str(tmp_path / "empty"))["tick"]) == 0
@@ -0,0 +1,57 @@
+import os
+
+from beremiz_runtime.runtime.TraceRecorder import TraceRecorder, TraceSegment
+
+
+def _samples(ticks, size=8):
+    return [(tick, bytes([tick % 256]) * size) for tick in ticks]
+
+
+def test_record_and_query(tmp_path):
+    recorder = TraceRecorder(str(tmp_path))
+    samples = _samples(range(1000))
+    assert recorder.extend(1, ["DINT", "DINT"], samples) == 1000
+    assert recorder.samples(0, 0xFFFFFFFF) == samples
+    assert recorder.samples(500, 510) == samples[500:511]
+    assert recorder.samples(100, 200, maxsamples=3) == samples[100:103]
+    assert recorder.samples(2000, 3000) == []
+
+
+def test_rotation_on_token_change_and_size(tmp_path):
+    recorder = TraceRecorder(str(tmp_path), segmentsize=4096, maxsegments=3)
+    recorder.extend(1, ["DINT"], _samples(range(10)))
+    recorder.extend(2, ["INT"], _samples(range(10, 20)))
+    info = recorder.segments_info()
+    assert [(token, iectypes, first) for _c, token, iectypes, first, _s in info] == [
+        (1, ["DINT"], 0),
+        (2, ["INT"], 10),
+    ]
+    # oldest segments removed beyond maxsegments
+    recorder.extend(2, ["INT"], _samples(range(20, 2000)))
+    assert len(recorder.segment_paths()) == 3
+    ticks = [tick for tick, _buff in recorder.samples(0, 0xFFFFFFFF)]
+    assert ticks == sorted(ticks) and ticks[-1] == 1999 and ticks[0] > 20
+
+
+def test_oversized_sample_dropped(tmp_path):
+    recorder = TraceRecorder(str(tmp_path), segmentsize=256)
+    assert recorder.extend(1, [], [(1, b"x" * 1000), (2, b"y")]) == 1
+    assert recorder.samples(0, 10) == [(2, b"y")]
+
+
+def test_recording_kept_across_runs(tmp_path):
+    recorder = TraceRecorder(str(tmp_path))
+    samples = _samples(range(300))
+    recorder.extend(7, ["DINT"], samples)
+    recorder.stop()
+    # segment was truncated to its content when closed
+    (path,) = recorder.segment_paths()
+    assert os.path.getsize(path) < 16 * 1024
+    reopened = TraceRecorder(str(tmp_path))
+    assert reopened.samples(0, 0xFFFFFFFF) == samples
+    # sparse index is rebuilt if missing
+    os.remove(os.path.splitext(path)[0] + ".idx")
+    segment = TraceSegment.open(path)
+    assert segment.token == 7 and segment.iectypes == ["DINT"]
+    assert list(segment.samples(150, 151)) == samples[150:152]
+    segment.close()
@@ -0,0 +1,55 @@
+from struct import pack
+
+from beremiz_runtime.runtime.TraceSessions import TraceSessionMux
+
+
+def _swap(session):
+    return [(tick, bytes(buff)) for tick, buff in session.Traces.swap()]
+
+
+def test_merge_shares_variables():
+    mux = TraceSessionMux()
+    first, second = mux.open(), mux.open()
+    assert mux.set(first, [(10, None), (11, b"\x01\x00")], ["DINT", "INT"]) == 1
+    assert mux.set(second, [(11, b"\x02\x00"), (12, None)], ["INT", "BOOL"]) == 1
+    orders, iectypes = mux.merge()
+    # in order of first request, force of session updated last
+    assert orders == [(10, None), (11, b"\x02\x00"), (12, None)]
+    assert iectypes == ["DINT", "INT", "BOOL"]
+    assert mux.refcounts == {10: 1, 11: 2, 12: 1}
+
+
+def test_distribute_fixed_layout():
+    mux = TraceSessionMux()
+    first, second = mux.open(), mux.open()
+    mux.set(first, [(10, None), (12, None)], ["DINT", "BOOL"])
+    mux.set(second, [(11, None)], ["INT"])
+    mux.merge()
+    assert mux.orders == [(10, None), (12, None), (11, None)]
+    mux.distribute([(1, pack("=iBh", -1, 1, 2)), (2, b"bad")])
+    assert _swap(mux.get(first)) == [(1, pack("=iB", -1, 1))]
+    assert _swap(mux.get(second)) == [(1, pack("=h", 2))]
+
+
+def test_distribute_strings():
+    mux = TraceSessionMux()
+    first, second = mux.open(), mux.open()
+    mux.set(first, [(10, None), (12, None)], ["STRING", "BOOL"])
+    mux.set(second, [(11, None)], ["INT"])
+    mux.merge()
+    mux.distribute([(5, b"\x02hi" + pack("=Bh", 0, 3))])
+    assert _swap(mux.get(first)) == [(5, b"\x02hi\x00")]
+    assert _swap(mux.get(second)) == [(5, pack("=h", 3))]
+
+
+def test_session_errors_and_expiry():
+    mux = TraceSessionMux()
+    sid = mux.open()
+    assert mux.set(sid + 1, [], []) == -1
+    assert mux.set(sid, [(1, None)], []) == -2
+    mux.get(sid).LastSwap -= 100
+    assert mux.expire(10)
+    assert mux.get(sid) is None
+    assert not mux.expire(10)
+    other = mux.open()
+    assert mux.close(other) and not mux.close(other)
@@ -0,0 +1,66 @@
+import ctypes
+
+from beremiz_runtime.runtime.TraceStore import TraceRingBuffer
+
+
+def test_swap_hands_out_samples_in_order():
+    ring = TraceRingBuffer(budget=64)
+    ring.append(1, b"aaaa")
+    ring.append(2, b"bbbb")
+    assert len(ring) == 2
+    assert ring.swap() == [(1, b"aaaa"), (2, b"bbbb")]
+    assert len(ring) == 0
+    assert ring.swap() == []
+
+
+def test_swapped_samples_are_copies():
+    ring = TraceRingBuffer(budget=64)
+    ring.append(1, b"aaaa")
+    first = ring.swap()
+    # both rings are filled again, overwriting first sample location
+    for data in (b"bbbb", b"cccc"):
+        ring.append(2, data)
+        ring.swap()
+    assert first == [(1, b"aaaa")]
+    assert type(first[0][1]) is bytes
+
+
+def test_swap_views():
+    ring = TraceRingBuffer(budget=64)
+    ring.append(1, b"aaaa")
+    views = ring.swap_views()
+    # written in other ring, doesn't overwrite views until next swap
+    ring.append(2, b"bbbb")
+    assert [(tick, bytes(view)) for tick, view in views] == [(1, b"aaaa")]
+    assert isinstance(views[0][1], memoryview)
+
+
+def test_append_from_address():
+    ring = TraceRingBuffer(budget=64)
+    buff = ctypes.create_string_buffer(b"xyz", 3)
+    assert ring.append_from(7, ctypes.addressof(buff), 3)
+    assert ring.swap() == [(7, b"xyz")]
+
+
+def test_oldest_samples_evicted_when_full():
+    ring = TraceRingBuffer(budget=10, maxsamples=8)
+    for tick in range(5):
+        ring.append(tick, bytes([tick]) * 4)
+    assert ring.swap() == [(3, b"\x03" * 4), (4, b"\x04" * 4)]
+    assert ring.dropped == 3
+
+
+def test_sample_count_bounded():
+    ring = TraceRingBuffer(budget=64, maxsamples=2)
+    for tick, data in ((1, b"a"), (2, b"b"), (3, b"c")):
+        ring.append(tick, data)
+    assert ring.swap() == [(2, b"b"), (3, b"c")]
+    assert ring.dropped == 1
+
+
+def test_oversized_and_empty_samples_dropped():
+    ring = TraceRingBuffer(budget=4)
+    assert not ring.append(1, b"12345")
+    assert not ring.append(2, b"")
+    assert ring.dropped == 2
+    assert ring.swap() == []
@@ -0,0 +1,150 @@
+from datetime import timedelta
+
+import pytest
+
+from beremiz_runtime.runtime.typemapping import (
+    IEC_STRING,
+    GetTraceDecoder,
+    PackForces,
+    SwapedEndianessTypeTranslator,
+    TypeTranslator,
+    UnpackDebugBuffer,
+    ValueToIECBytes,
+)
+
+
+def _buffer(iectypes, values, translator=TypeTranslator):
+    """Debug buffer as PLC debugger builds it, STRING with its length only"""
+    parts = []
+    for iectype, value in zip(iectypes, values):
+        c_type, _unpack_func, pack_func = translator[iectype]
+        raw = bytes(pack_func(c_type, value))
+        if iectype == "STRING":
+            raw = raw[: 1 + raw[0]]
+        parts.append(raw)
+    return b"".join(parts)
+
+
+FixedTypes = ("BOOL", "SINT", "UINT", "DINT", "LREAL", "TIME", "ULINT")
+FixedValues = [True, -5, 65000, -100000, 2.5, timedelta(0, 3, 500), 1 << 40]
+MixedTypes = ("DINT", "STRING", "BOOL", "STRING", "TIME")
+MixedValues = [7, "hello", False, "", timedelta(0, 1, 2)]
+
+
+def test_decode_fixed_layout():
+    decoder = GetTraceDecoder(FixedTypes)
+    assert decoder.fixedsize is not None
+    assert decoder.decode(_buffer(FixedTypes, FixedValues)) == FixedValues
+
+
+def test_decode_strings():
+    decoder = GetTraceDecoder(MixedTypes)
+    assert decoder.fixedsize is None
+    assert decoder.decode(_buffer(MixedTypes, MixedValues)) == MixedValues
+
+
+def test_decode_mismatch():
+    buff = _buffer(MixedTypes, MixedValues)
+    decoder = GetTraceDecoder(MixedTypes)
+    assert decoder.decode(buff[:-1]) is None
+    assert decoder.decode(buff + b"\x00") is None
+    assert GetTraceDecoder(FixedTypes).decode(b"\x00") is None
+
+
+def test_decoder_compiled_once():
+    assert GetTraceDecoder(FixedTypes) is GetTraceDecoder(FixedTypes)
+
+
+def test_spans():
+    buff = _buffer(MixedTypes, MixedValues)
+    spans = GetTraceDecoder(MixedTypes).spans(buff)
+    assert [bytes(buff[start:end]) for start, end in spans] == [
+        _buffer((iectype,), (value,)) for iectype, value in zip(MixedTypes, MixedValues)
+    ]
+
+
+def test_decode_batch():
+    for iectypes, values in (
+        (("DINT", "UINT"), [1, 2]),
+        (FixedTypes, FixedValues),
+        (MixedTypes, MixedValues),
+    ):
+        decoder = GetTraceDecoder(iectypes)
+        buff = _buffer(iectypes, values)
+        assert decoder.decode_batch([buff, memoryview(buff)]) == [values, values]
+        assert decoder.decode_batch([buff, b"\x01"]) == [values, None]
+        assert decoder.decode_batch([]) == []
+
+
+def test_unpack_debug_buffer():
+    buff = _buffer(MixedTypes, MixedValues)
+    assert UnpackDebugBuffer(buff, MixedTypes) == MixedValues
+    assert UnpackDebugBuffer(buff, ["NOTATYPE"]) is None
+
+
+def test_decode_swaped():
+    for iectypes, values in ((FixedTypes, FixedValues), (MixedTypes, MixedValues)):
+        buff = _buffer(iectypes, values, SwapedEndianessTypeTranslator)
+        if iectypes is FixedTypes:
+            # really swaped
+            assert buff != _buffer(iectypes, values)
+        decoder = GetTraceDecoder(iectypes, swaped=True)
+        assert decoder.decode(buff) == values
+        assert decoder.decode_batch([buff]) == [values]
+        assert UnpackDebugBuffer(buff, iectypes, swaped=True) == values
+
+
+def _ctypes_bytes(iectype, value, translator=TypeTranslator):
+    c_type, _unpack_func, pack_func = translator[iectype]
+    return bytes(pack_func(c_type, value))
+
+
+@pytest.mark.parametrize(
+    "iectype, value",
+    [
+        ("BOOL", 1),
+        ("SINT", -128),
+        ("SINT", 200),
+        ("USINT", 300),
+        ("INT", -40000),
+        ("UDINT", -1),
+        ("LINT", 1 << 63),
+        ("REAL", 1.1),
+        ("REAL", 1e40),
+        ("LREAL", -0.5),
+        ("TIME", timedelta(0, 5, 250)),
+        ("STRING", "hi"),
+        ("STRING", b"x" * 126),
+    ],
+)
+def test_value_to_iec_bytes_as_ctypes(iectype, value):
+    assert ValueToIECBytes(iectype, value) == _ctypes_bytes(iectype, value)
+    assert ValueToIECBytes(iectype, value, swaped=True) == _ctypes_bytes(
+        iectype, value, SwapedEndianessTypeTranslator
+    )
+
+
+def test_value_to_iec_bytes_errors():
+    assert ValueToIECBytes("DINT", None) is None
+    with pytest.raises(ValueError):
+        ValueToIECBytes("STRING", "x" * (IEC_STRING.body.size + 1))
+    with pytest.raises(KeyError):
+        ValueToIECBytes("NOTATYPE", 1)
+
+
+def test_pack_forces():
+    forces = [
+        (3, "DINT", -2),
+        (5, "BOOL", None),
+        (1, "STRING", "on"),
+        (2, "LREAL", 1.5),
+    ]
+    buff, packed = PackForces(forces)
+    assert [idx for idx, _force in packed] == [3, 5, 1, 2]
+    assert packed[1][1] is None
+    for (idx, iectype, value), (_idx, force) in zip(forces, packed):
+        if value is not None:
+            assert bytes(force) == ValueToIECBytes(iectype, value)
+            # views on a single buffer
+            assert force.obj is buff
+    assert len(buff) == sum(len(force) for _idx, force in packed if force is not None)
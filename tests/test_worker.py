@@ -0,0 +1,79 @@
+import threading
+
+import pytest
+
+from beremiz_runtime.runtime.Worker import worker
+
+
+@pytest.fixture
+def running_worker():
+    """Worker looping in its own thread, quit at teardown"""
+    w = worker()
+    thread = threading.Thread(target=w.runloop)
+    thread.start()
+    while not w.enabled:
+        pass
+    yield w
+    w.quit()
+    thread.join()
+
+
+def test_call_returns_result(running_worker):
+    assert running_worker.call(lambda a, b: a + b, 1, b=2) == 3
+
+
+def test_order_by_priority_then_submission(running_worker):
+    done = []
+    release = threading.Event()
+    blocker = running_worker.submit(release.wait)
+    futures = [
+        running_worker.submit_prioritized(1, done.append, "low"),
+        running_worker.submit_prioritized(0, done.append, "first"),
+        running_worker.submit_prioritized(-1, done.append, "urgent"),
+        running_worker.submit_prioritized(0, done.append, "second"),
+    ]
+    futures += running_worker.submit_batch(
+        [(done.append, ("batch1",), {}), (done.append, ("batch2",), {})]
+    )
+    release.set()
+    blocker.result()
+    for future in futures:
+        future.result()
+    assert done == ["urgent", "first", "second", "batch1", "batch2", "low"]
+
+
+def test_exception_propagation(running_worker):
+    def fail():
+        raise KeyError("fail")
+
+    with pytest.raises(KeyError):
+        running_worker.call(fail)
+    assert isinstance(running_worker.submit(fail).exception(), KeyError)
+    # worker survives failed jobs
+    assert running_worker.call(int, "3") == 3
+
+
+def test_quit_interrupts_queued_jobs():
+    w = worker()
+    thread = threading.Thread(target=w.runloop)
+    thread.start()
+    while not w.enabled:
+        pass
+    started = threading.Event()
+    release = threading.Event()
+
+    def block():
+        started.set()
+        release.wait()
+
+    blocker = w.submit(block)
+    started.wait()
+    queued = w.submit(int, "1")
+    w.quit()
+    release.set()
+    thread.join()
+    assert blocker.result() is None
+    with pytest.raises(EOFError):
+        queued.result()
+    with pytest.raises(EOFError):
+        w.call(int, "1")
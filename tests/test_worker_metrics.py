@@ -0,0 +1,93 @@
+import json
+import threading
+
+import pytest
+
+from beremiz_runtime.runtime.Worker import job, worker
+from beremiz_runtime.runtime.WorkerMetrics import (
+    LatencyHistogram,
+    MaxCallerThreads,
+    WorkerMetrics,
+)
+
+
+def test_histogram_percentiles():
+    histogram = LatencyHistogram()
+    assert histogram.percentile(50) == 0
+    for us in range(1, 1001):
+        histogram.record(us / 1000000.0)
+    summary = histogram.summary()
+    assert summary["count"] == 1000
+    assert summary["min_us"] == 1 and summary["max_us"] == 1000
+    assert summary["mean_us"] == pytest.approx(500.5, rel=1e-3)
+    # log-linear buckets are within about 6%
+    assert summary["p50_us"] == pytest.approx(500, rel=0.07)
+    assert summary["p99_us"] == pytest.approx(990, rel=0.07)
+    assert summary["p999_us"] <= 1000
+
+
+def test_histogram_exact_small_values_and_overflow():
+    histogram = LatencyHistogram()
+    for us in (3, 3, 7):
+        histogram.record(us / 1000000.0)
+    assert histogram.percentile(50) == 3
+    assert histogram.percentile(100) == 7
+    # overflowing latencies land in the last bucket
+    histogram.record(1e9)
+    assert 7 < histogram.percentile(100) <= histogram.max
+    histogram.reset()
+    assert histogram.count == 0 and histogram.percentile(99) == 0
+
+
+def _done(call, *args):
+    _job = job(call, *args)
+    _job.do()
+    return _job
+
+
+def test_observe_jobs():
+    metrics = WorkerMetrics()
+
+    def fail():
+        raise ValueError("fail")
+
+    for _job in (_done(int, "1"), _done(int, "2"), _done(fail)):
+        metrics.observe(_job)
+    contended = _done(int, "3")
+    contended.contended = True
+    metrics.observe(contended)
+    summary = metrics.summary()
+    assert summary["int"]["execution"]["count"] == 3
+    assert summary["int"]["contended"] == 1
+    assert summary["fail"]["failed"] == 1
+    assert summary["int"]["callers"] == {threading.current_thread().name: 3}
+    json.dumps(summary)
+    assert "int" in metrics.dump()
+    metrics.reset()
+    assert metrics.summary() == {}
+
+
+def test_callers_bounded():
+    metrics = WorkerMetrics()
+    for n in range(MaxCallerThreads + 5):
+        _job = _done(int, "1")
+        _job.caller = "thread%d" % n
+        metrics.observe(_job)
+    callers = metrics.summary()["int"]["callers"]
+    assert len(callers) == MaxCallerThreads + 1
+    assert callers["other"] == 5
+
+
+def test_worker_observer():
+    metrics = WorkerMetrics()
+    w = worker()
+    w.observer = metrics.observe
+    thread = threading.Thread(target=w.runloop)
+    thread.start()
+    while not w.enabled:
+        pass
+    w.call(int, "1")
+    w.submit(int, "2").result()
+    w.quit()
+    thread.join()
+    assert metrics.summary()["int"]["execution"]["count"] == 2